@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import logging
+import os
+import ssl
+from typing import Any, Dict, Optional
+
+from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
+from flux_mcp_server.clusters.rpc import (
+    DEFAULT_PORT,
+    MAX_MESSAGE,
+    RPC_METHODS,
+    LineBatcher,
+    read_messages,
+)
+from flux_mcp_server.utils.auth import token_matches
+
+# Without a token, an agent only listens where nobody else can reach it
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+logger = logging.getLogger(__name__)
+
+
+class Agent:
+    """
+    The other end of a RemoteFluxHandle: a small process next to a Flux instance
+    that serves its ClusterHandle (usually a LocalFluxHandle) to MCP servers
+    elsewhere, so the server doesn't need to run on every cluster.
+
+    Each request runs as its own task, so a slow one doesn't hold up the rest of
+    the connection, and answers are batched like requests are. Any handle works,
+    which is how we test the remote handle without Flux (a stand-in agent).
+
+    Anyone who can connect can submit and cancel as any user, so an agent that
+    listens beyond localhost needs a token. The token (and everything else) is
+    sent in the clear unless the agent has a TLS context (server_context).
+    """
+
+    def __init__(
+        self,
+        handle: ClusterHandle,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        token: Optional[str] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        if not token and host not in LOCAL_HOSTS:
+            raise ValueError(
+                f"An agent listening on {host} needs a token (FLUX_MCP_AGENT_TOKEN), "
+                "or listen on 127.0.0.1"
+            )
+        self.handle = handle
+        self.host = host
+        self.port = port
+        self.token = token
+        self.ssl_context = ssl_context
+        self.server = None
+        self.connections = self.requests = 0
+        self._connections = {}
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self._serve, self.host, self.port, limit=MAX_MESSAGE, ssl=self.ssl_context
+        )
+        # With port 0 the OS picks one (e.g., for tests)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        await self.server.serve_forever()
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+
+            # Hang up on clients, and let their connections wind down
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._connections[asyncio.current_task()] = writer
+        batcher = LineBatcher(writer)
+        authorized = not self.token
+        tasks = set()
+        try:
+            async for message in read_messages(reader):
+                self.requests += 1
+                if message.get("method") == "hello":
+                    token = (message.get("params") or {}).get("token")
+                    authorized = authorized or token_matches(self.token, token)
+                    if authorized:
+                        batcher.send({"id": message.get("id"), "result": True})
+                    else:
+                        batcher.send({"id": message.get("id"), "error": "Invalid token"})
+                elif not authorized:
+                    batcher.send({"id": message.get("id"), "error": "Send a valid token first"})
+                else:
+                    task = asyncio.ensure_future(self._dispatch(message, batcher))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Dropping agent connection: {e}")
+        finally:
+            # Nobody is left to answer
+            for task in tasks:
+                task.cancel()
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _dispatch(self, message: Dict[str, Any], batcher: LineBatcher):
+        request_id, method = message.get("id"), message.get("method")
+        params = dict(message.get("params") or {})
+        try:
+            if method not in RPC_METHODS:
+                raise ValueError(f"Unknown method {method}")
+            if params.get("auth") is not None:
+                params["auth"] = AuthContext(**params["auth"])
+            result = await self.handle.call(method, **params)
+            batcher.send({"id": request_id, "result": result})
+        except Exception as e:
+            batcher.send({"id": request_id, "error": str(e) or type(e).__name__})
+
+
+def server_context(cert: str, key: Optional[str] = None) -> ssl.SSLContext:
+    """
+    A TLS context for the agent, from its certificate (and key, if not in the same file).
+    """
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="Flux MCP Agent: serve a Flux instance to remote Flux MCP servers"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--flux-uri", default=os.environ.get("FLUX_URI"), help="Flux URI")
+    parser.add_argument("--workers", type=int, default=8, help="Flux handles (threads) to use")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("FLUX_MCP_AGENT_TOKEN"),
+        help="Token servers must send to connect (defaults to FLUX_MCP_AGENT_TOKEN)",
+    )
+    parser.add_argument(
+        "--tls-cert",
+        default=os.environ.get("FLUX_MCP_AGENT_TLS_CERT"),
+        help="Certificate to serve TLS with (defaults to FLUX_MCP_AGENT_TLS_CERT)",
+    )
+    parser.add_argument(
+        "--tls-key",
+        default=os.environ.get("FLUX_MCP_AGENT_TLS_KEY"),
+        help="Key for the certificate, if it isn't in the same file",
+    )
+    return parser
+
+
+def main():
+    parser = get_parser()
+    args = parser.parse_args()
+    if not args.token and args.host not in LOCAL_HOSTS:
+        parser.error(f"listening on {args.host} needs a --token (or FLUX_MCP_AGENT_TOKEN)")
+    if args.tls_key and not args.tls_cert:
+        parser.error("--tls-key needs a --tls-cert")
+    context = server_context(args.tls_cert, args.tls_key) if args.tls_cert else None
+
+    # Only the real agent needs Flux
+    from flux_mcp_server.clusters.local import LocalFluxHandle
+
+    handle = LocalFluxHandle("local", {"uri": args.flux_uri, "workers": args.workers})
+    agent = Agent(handle, args.host, args.port, args.token, context)
+    scheme = "tls" if context else "tcp"
+    print(f"🛰️  Flux MCP agent listening on {scheme}://{args.host}:{args.port}")
+    try:
+        asyncio.run(agent.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        handle.close()
+
+
+if __name__ == "__main__":
+    main()
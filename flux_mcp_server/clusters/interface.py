@@ -1,6 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol
 
 
 @dataclass
@@ -54,17 +55,83 @@ class ClusterHandle(ABC):
         """Submits a job as the authenticated user."""
         pass
 
+    def submit_many(self, jobspecs: List[Any], auth: AuthContext) -> List[Dict[str, Any]]:
+        """
+        Submit many jobs, returning one result per jobspec (in order), either
+        {"id": <jobid>} or {"error": <message>}. Handles that can pipeline
+        submissions should override this.
+        """
+        results = []
+        for jobspec in jobspecs:
+            try:
+                results.append({"id": self.submit(jobspec, auth)})
+            except Exception as e:
+                results.append({"error": str(e)})
+        return results
+
     @abstractmethod
     def cancel(self, job_id: int, auth: AuthContext) -> bool:
         """Cancels a job."""
         pass
 
+    def cancel_many(
+        self, job_ids: List[int], auth: AuthContext, reason: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cancel many jobs, returning one result per job (in order), either
+        {"id": <jobid>, "canceled": True} or {"id": <jobid>, "error": <message>}.
+        Handles that can pipeline requests should override this.
+        """
+        results = []
+        for job_id in job_ids:
+            if self.cancel(job_id, auth):
+                results.append({"id": job_id, "canceled": True})
+            else:
+                results.append({"id": job_id, "error": "Could not cancel job"})
+        return results
+
     @abstractmethod
     def get_job_info(self, job_id: int, auth: AuthContext) -> Dict[str, Any]:
         """Gets job info."""
         pass
 
+    @abstractmethod
+    def list_jobs(
+        self,
+        auth: AuthContext,
+        attrs: Optional[List[str]] = None,
+        states: Optional[List[str]] = None,
+        user: Optional[int] = None,
+        since: float = 0.0,
+        name: Optional[str] = None,
+        queue: Optional[str] = None,
+        max_entries: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        List jobs (newest first) with only the attributes asked for, filtered by the
+        cluster: states (e.g., pending, running, inactive), user (all if None), jobs
+        inactive since a time, job name, and queue.
+        """
+        pass
+
+    @abstractmethod
+    def resource_status(self) -> List[Dict[str, Any]]:
+        """
+        Resources per partition ("all" is the whole cluster): one dict each with
+        the partition name, and nodes, cores, and gpus in total, free, and allocated
+        (free_nodes, allocated_cores, etc.), plus down_nodes.
+        """
+        pass
+
     @abstractmethod
     def close(self):
         """Cleanup resources."""
         pass
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Call one of the (blocking) methods above without blocking the event loop,
+        e.g., await handle.call("submit", jobspec, auth). Handles with their own
+        workers should override this to use them.
+        """
+        return await asyncio.to_thread(getattr(self, method), *args, **kwargs)
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import yaml
+
+# A placeholder in a template string, e.g., "{{ size }}"
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+
+@dataclass(frozen=True)
+class Jobspec:
+    """
+    A parsed and validated jobspec, and its JSON encoding (what we submit).
+    Entries are shared through the cache, so don't change spec.
+    """
+
+    spec: Dict[str, Any]
+    encoded: str
+
+
+def parse_jobspec(content: str) -> Any:
+    """
+    Parse a jobspec string, JSON first (what agents send) and then YAML.
+    """
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Jobspec is neither JSON nor YAML: {e}")
+
+
+def validate_jobspec(spec: Any):
+    """
+    Check the shape of a jobspec (RFC 14/25) enough to fail here and not in Flux.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Invalid jobspec: must be a mapping")
+    if not isinstance(spec.get("version"), int):
+        raise ValueError("Invalid jobspec: version must be an integer")
+    for key in ["resources", "tasks"]:
+        if not isinstance(spec.get(key), list) or not spec[key]:
+            raise ValueError(f"Invalid jobspec: {key} must be a non-empty list")
+    for task in spec["tasks"]:
+        if not isinstance(task, dict) or not isinstance(task.get("command"), list):
+            raise ValueError("Invalid jobspec: each task needs a command list")
+        if not task["command"]:
+            raise ValueError("Invalid jobspec: task command is empty")
+    if not isinstance(spec.get("attributes", {}), dict):
+        raise ValueError("Invalid jobspec: attributes must be a mapping")
+
+
+def content_key(jobspec: Union[str, Dict[str, Any]]) -> str:
+    """
+    The content hash we cache under (a mapping is hashed as canonical JSON).
+    """
+    if not isinstance(jobspec, str):
+        jobspec = json.dumps(jobspec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(jobspec.encode()).hexdigest()
+
+
+class JobspecTemplate:
+    """
+    A jobspec with "{{ name }}" placeholders in its strings, parsed once.
+
+    A string that is only a placeholder takes the parameter's value as is (so
+    counts can be numbers), and otherwise placeholders are substituted as text.
+    Parts of the template without placeholders are shared by every render.
+    """
+
+    def __init__(self, template: Any):
+        if isinstance(template, str):
+            template = parse_jobspec(template)
+        self.template = template
+        self.parameters = sorted(self._find(template))
+
+    def _find(self, node) -> set:
+        if isinstance(node, str):
+            return set(PLACEHOLDER.findall(node))
+        if isinstance(node, dict):
+            return set().union(*map(self._find, node.values()))
+        if isinstance(node, list):
+            return set().union(*map(self._find, node))
+        return set()
+
+    def render(self, params: Dict[str, Any]) -> Jobspec:
+        missing = [name for name in self.parameters if name not in params]
+        if missing:
+            raise ValueError(f"Missing template parameters: {', '.join(missing)}")
+        spec = self._render(self.template, params)
+        validate_jobspec(spec)
+        return Jobspec(spec, json.dumps(spec, separators=(",", ":")))
+
+    def _render(self, node, params):
+        if isinstance(node, str):
+            match = PLACEHOLDER.fullmatch(node)
+            if match:
+                return params[match.group(1)]
+            if "{{" not in node:
+                return node
+            return PLACEHOLDER.sub(lambda m: str(params[m.group(1)]), node)
+        if isinstance(node, dict):
+            rendered = {key: self._render(value, params) for key, value in node.items()}
+            same = all(rendered[key] is value for key, value in node.items())
+        elif isinstance(node, list):
+            rendered = [self._render(value, params) for value in node]
+            same = all(new is old for new, old in zip(rendered, node))
+        else:
+            return node
+        return node if same else rendered
+
+
+class JobspecCache:
+    """
+    Parsed and validated jobspecs (and templates) by content hash, in an LRU.
+
+    Agents tend to submit the same few jobspecs over and over, so most submits
+    skip parsing, validating, and encoding. Handles call this from their worker
+    threads, so it is locked.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _lookup(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def _store(self, key: str, entry):
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def load(self, jobspec: Union[str, Dict[str, Any], Jobspec]) -> Jobspec:
+        """
+        Parse and validate a jobspec (string or mapping), or get it from the cache.
+        """
+        if isinstance(jobspec, Jobspec):
+            return jobspec
+        key = content_key(jobspec)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+        spec = parse_jobspec(jobspec) if isinstance(jobspec, str) else jobspec
+        validate_jobspec(spec)
+        return self._store(key, Jobspec(spec, json.dumps(spec, separators=(",", ":"))))
+
+    def template(self, template: Union[str, Dict[str, Any]]) -> JobspecTemplate:
+        key = "template:" + content_key(template)
+        entry = self._lookup(key)
+        if entry is None:
+            entry = self._store(key, JobspecTemplate(template))
+        return entry
+
+    def render(
+        self, template: Union[str, Dict[str, Any]], params: List[Dict[str, Any]]
+    ) -> List[Union[Jobspec, ValueError]]:
+        """
+        Render a template once per parameter set. A set that doesn't render
+        (e.g., a missing parameter) gives its error in place of a jobspec.
+        """
+        template = self.template(template)
+        rendered = []
+        for values in params:
+            try:
+                rendered.append(template.render(values))
+            except (ValueError, KeyError) as e:
+                rendered.append(ValueError(str(e)))
+        return rendered
+
+
+_JOBSPECS: Optional[JobspecCache] = None
+
+
+def get_jobspec_cache() -> JobspecCache:
+    """
+    The jobspec cache shared by every cluster handle.
+    """
+    global _JOBSPECS
+    if _JOBSPECS is None:
+        _JOBSPECS = JobspecCache()
+    return _JOBSPECS
@@ -1,9 +1,34 @@
-import json
+import logging
+from typing import Any, Dict, List, Optional
 
 import flux
+import flux.constants
 import flux.job
+import flux.resource
 
 from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
+from flux_mcp_server.clusters.jobspec import get_jobspec_cache
+from flux_mcp_server.clusters.pool import HandlePool, pipeline
+from flux_mcp_server.clusters.snapshots import resource_partitions
+
+# What list_jobs asks job-list for by default (it sends only what we ask for)
+LIST_ATTRS = ["id", "userid", "state", "name", "queue", "t_submit", "t_run", "t_inactive"]
+LIST_ATTRS += ["result", "nnodes", "ntasks"]
+
+logger = logging.getLogger(__name__)
+
+
+def state_mask(states: Optional[List[str]]) -> int:
+    """
+    A job-list states mask from names (e.g., ["pending", "run"]), 0 meaning all.
+    """
+    mask = 0
+    for state in states or []:
+        name = f"FLUX_JOB_STATE_{state.upper()}"
+        if not hasattr(flux.constants, name):
+            raise ValueError(f"Unknown job state {state}")
+        mask |= getattr(flux.constants, name)
+    return mask
 
 
 class LocalFluxHandle(ClusterHandle):
@@ -12,58 +37,134 @@ class LocalFluxHandle(ClusterHandle):
 
     This is (likely) primarily for testing, and assumes the MCP server
     is running directly on the cluster of interest.
+
+    Flux handles aren't thread-safe, so we keep a pool with one handle per
+    worker thread. The methods here are blocking and use the calling thread's
+    handle, and call() runs them on the pool's workers (at most "workers" at once).
     """
 
     def __init__(self, cluster_id: str, config: dict):
         super().__init__(cluster_id, config)
         # If unset (None) uses default local
         self.uri = config.get("uri")
-        self._handle = None
+
+        # How many requests submit_many and cancel_many keep in flight at once
+        self.max_in_flight = int(config.get("max_in_flight", 256))
+
+        # Parsed and validated jobspecs by content hash (shared by all handles)
+        self.jobspecs = get_jobspec_cache()
+        self.pool = HandlePool(
+            self.uri,
+            workers=int(config.get("workers", 8)),
+            health_interval=float(config.get("health_interval", 30.0)),
+        )
 
     def connect(self) -> bool:
-        try:
-            if self.uri:
-                self._handle = flux.Flux(self.uri)
-            else:
-                self._handle = flux.Flux()
-            return True
-        except Exception as e:
-            print(f"Failed to connect to local flux: {e}")
-            return False
+        return self.pool.check()
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        return await self.pool.run(getattr(self, method), *args, **kwargs)
 
-    def _get_h(self):
-        # Lazy reconnect if needed
-        if self._handle is None:
-            self.connect()
-        return self._handle
+    def _parse(self, jobspec: Any) -> str:
+        """
+        The encoded jobspec to submit. A failed template render is passed through
+        as its error, which we raise here so it becomes that item's error.
+        """
+        if isinstance(jobspec, Exception):
+            raise jobspec
+        return self.jobspecs.load(jobspec).encoded
 
     def submit(self, jobspec: str, auth: AuthContext) -> int:
         # 1. Auth Check (Simple single-user ownership check)
         # In a real system, you might check: if auth.user_id != os.getuid()...
-        print(f"DEBUG: Submitting to {self.cluster_id} as user {auth.user_id}")
+        logger.debug(f"Submitting to {self.cluster_id} as user {auth.user_id}")
 
         # 2. Parse
-        if isinstance(jobspec, str):
-            spec = json.loads(jobspec)
-        else:
-            spec = jobspec
+        spec = self._parse(jobspec)
 
         # 3. Submit
-        jobid = flux.job.submit(self._get_h(), spec)
+        jobid = self.pool.call(flux.job.submit, spec)
         return int(jobid)
 
+    def submit_many(self, jobspecs: List[Any], auth: AuthContext) -> List[Dict[str, Any]]:
+        logger.debug(f"Submitting {len(jobspecs)} jobs to {self.cluster_id} as user {auth.user_id}")
+
+        def submit_all(handle):
+            return pipeline(
+                jobspecs,
+                lambda jobspec: flux.job.submit_async(handle, self._parse(jobspec)),
+                lambda jobspec, future: {"id": int(future.get_id())},
+                self.max_in_flight,
+            )
+
+        return self.pool.call(submit_all)
+
     def cancel(self, job_id: int, auth: AuthContext) -> bool:
-        print(f"DEBUG: Canceling job {job_id} on {self.cluster_id}")
+        logger.debug(f"Canceling job {job_id} on {self.cluster_id}")
         try:
-            flux.job.cancel(self._get_h(), int(job_id))
+            self.pool.call(flux.job.cancel, int(job_id))
             return True
         except Exception:
             return False
 
+    def cancel_many(
+        self, job_ids: List[int], auth: AuthContext, reason: str = None
+    ) -> List[Dict[str, Any]]:
+        logger.debug(f"Canceling {len(job_ids)} jobs on {self.cluster_id}")
+
+        def canceled(job_id, future):
+            future.get()
+            return {"id": job_id, "canceled": True}
+
+        def cancel_all(handle):
+            return pipeline(
+                job_ids,
+                lambda job_id: flux.job.cancel_async(handle, int(job_id), reason),
+                canceled,
+                self.max_in_flight,
+            )
+
+        results = self.pool.call(cancel_all)
+        for job_id, result in zip(job_ids, results):
+            result.setdefault("id", job_id)
+        return results
+
+    def list_jobs(
+        self,
+        auth: AuthContext,
+        attrs: Optional[List[str]] = None,
+        states: Optional[List[str]] = None,
+        user: Optional[int] = None,
+        since: float = 0.0,
+        name: Optional[str] = None,
+        queue: Optional[str] = None,
+        max_entries: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        One job-list RPC, with the filters applied by the job-list module and only
+        the attributes we need sent back.
+        """
+        attrs = list(attrs or LIST_ATTRS)
+        userid = flux.constants.FLUX_USERID_UNKNOWN if user is None else int(user)
+        query = {
+            "max_entries": max_entries,
+            "attrs": attrs,
+            "userid": userid,
+            "states": state_mask(states),
+            "since": since,
+            "name": name,
+            "queue": queue,
+        }
+        return self.pool.call(lambda handle: flux.job.job_list(handle, **query).get_jobs())
+
+    def resource_status(self) -> List[Dict[str, Any]]:
+        rlist = self.pool.call(lambda handle: flux.resource.resource_list(handle).get())
+        return resource_partitions(rlist)
+
     def get_job_info(self, job_id: int, auth: AuthContext) -> dict:
-        info = flux.job.get_job_info(self._get_h(), int(job_id))
+        info = self.pool.call(flux.job.get_job_info, int(job_id))
         # Serialize essential fields
         return {"id": int(info.id), "state": info.state_name, "user": info.userid, "cwd": info.cwd}
 
     def close(self):
-        self._handle = None
+        self.pool.close()
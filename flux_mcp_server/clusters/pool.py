@@ -0,0 +1,152 @@
+import asyncio
+import errno
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the broker connection itself is gone (not that the request failed)
+DISCONNECTED = {errno.ECONNRESET, errno.EPIPE, errno.ENOTCONN, errno.ECONNREFUSED, errno.EBADF}
+
+
+class HandlePool:
+    """
+    Flux handles for one cluster, one per worker thread.
+
+    A flux.Flux handle isn't safe to share between threads, so each thread gets
+    its own, opened the first time that thread needs it. Blocking Flux calls run
+    on a bounded executor (never on the event loop), so concurrent tool calls
+    each get a worker and a handle instead of queueing on one. A handle that has
+    been idle longer than health_interval is pinged before use, and a handle that
+    lost its connection is dropped, so the next call on that thread reconnects.
+    """
+
+    def __init__(self, uri: Optional[str] = None, workers: int = 8, health_interval: float = 30.0):
+        self.uri = uri
+        self.workers = workers
+        self.health_interval = health_interval
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="flux-handle")
+
+        # Every open handle by thread, so close can let go of them all
+        self._handles = {}
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Flux is imported here, so the pool imports (and is tested) without it
+        import flux
+
+        return flux.Flux(self.uri) if self.uri else flux.Flux()
+
+    def _open(self):
+        handle = self._connect()
+        self._local.handle = handle
+        self._local.used = time.monotonic()
+        with self._lock:
+            self._handles[threading.get_ident()] = handle
+        return handle
+
+    def _drop(self):
+        self._local.handle = None
+        with self._lock:
+            self._handles.pop(threading.get_ident(), None)
+
+    def ping(self, handle) -> bool:
+        try:
+            handle.rpc("broker.ping", {"seq": 0, "pad": ""}).get()
+            return True
+        except OSError:
+            return False
+
+    def get(self):
+        """
+        The handle for the calling thread (opened, or reopened, as needed).
+        """
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            return self._open()
+        if time.monotonic() - self._local.used > self.health_interval and not self.ping(handle):
+            logger.warning(f"Flux handle to {self.uri or 'local'} is not healthy, reconnecting")
+            self._drop()
+            return self._open()
+        return handle
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func(handle, *args, **kwargs) on this thread's handle.
+
+        We don't retry on a lost connection (a submit might have gone through),
+        we only make sure the next call gets a new handle.
+        """
+        handle = self.get()
+        try:
+            return func(handle, *args, **kwargs)
+        except OSError as e:
+            if e.errno in DISCONNECTED:
+                self._drop()
+            raise
+        finally:
+            self._local.used = time.monotonic()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call (any function, it doesn't need the handle) on the executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def check(self) -> bool:
+        """
+        Open (or reuse) a handle on this thread and ping the broker. If it doesn't
+        answer we drop the handle, so the next call on this thread reconnects.
+        """
+        try:
+            if self.ping(self.get()):
+                return True
+            logger.error(f"Flux at {self.uri or 'local'} is not answering")
+        except Exception as e:
+            logger.error(f"Failed to connect to flux at {self.uri or 'local'}: {e}")
+        self._drop()
+        return False
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._handles.clear()
+        self._local = threading.local()
+
+
+def pipeline(
+    items: List[Any], send: Callable, receive: Callable, max_in_flight: int = 256
+) -> List[Dict[str, Any]]:
+    """
+    Pipeline requests on one handle: keep up to max_in_flight outstanding, and
+    collect results from the oldest as we go. send(item) starts a request and
+    returns its future, and receive(item, future) turns the response into a
+    result. Either one raising makes {"error": ...} that item's result.
+    """
+    results = [None] * len(items)
+    pending = deque()
+    queue = enumerate(items)
+    while True:
+        for i, item in queue:
+            try:
+                pending.append((i, send(item)))
+            except Exception as e:
+                results[i] = {"error": str(e)}
+                continue
+            if len(pending) >= max_in_flight:
+                break
+        if not pending:
+            break
+        i, future = pending.popleft()
+        try:
+            results[i] = receive(items[i], future)
+        except Exception as e:
+            results[i] = {"error": str(e)}
+    return results
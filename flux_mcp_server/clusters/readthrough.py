@@ -0,0 +1,72 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
+from flux_mcp_server.db.interface import DatabaseBackend
+from flux_mcp_server.db.models import JobRecord
+
+
+def record_info(job: JobRecord) -> Dict[str, Any]:
+    """
+    A job snapshot from the database, with the same fields as get_job_info.
+    """
+    user = job.user
+    if isinstance(user, str) and user.isdigit():
+        user = int(user)
+    return {"id": job.job_id, "state": job.state, "user": user, "cwd": job.workdir}
+
+
+class ReadThroughJobInfo:
+    """
+    Answer job info from what we already know before asking Flux.
+
+    The events database has a snapshot of every job it has seen. A finished
+    (INACTIVE) job never changes, so we always answer it from there. An active
+    job's snapshot is only as current as its last event, so we use it while that
+    event is at most max_age seconds old. After that we ask Flux (the job might
+    be running quietly, or its events might be behind) and keep the answer in
+    memory for max_age, so a polling agent costs at most one RPC per max_age per
+    job. Every answer says where it came from ("database", "cache", or "flux")
+    and how old it is.
+    """
+
+    def __init__(self, db: DatabaseBackend, max_age: float = None, max_entries: int = 10000):
+        if max_age is None:
+            max_age = float(os.environ.get("FLUX_MCP_JOB_INFO_MAX_AGE", 10.0))
+        self.db = db
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+
+    async def get(
+        self,
+        handle: ClusterHandle,
+        job_id: int,
+        auth: AuthContext,
+        max_age: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        max_age = self.max_age if max_age is None else max_age
+        key = (handle.cluster_id, int(job_id))
+
+        job = await self.db.get_job(handle.cluster_id, int(job_id))
+        if job is not None:
+            age = max(0.0, time.time() - job.last_updated)
+            if job.state == "INACTIVE" or age <= max_age:
+                return dict(record_info(job), source="database", age=age)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            fetched, info = cached
+            age = time.monotonic() - fetched
+            if age <= max_age:
+                self._cache.move_to_end(key)
+                return dict(info, source="cache", age=age)
+
+        info = await handle.call("get_job_info", job_id, auth)
+        self._cache[key] = (time.monotonic(), info)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return dict(info, source="flux", age=0.0)
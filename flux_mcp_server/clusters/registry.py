@@ -1,7 +1,54 @@
-from typing import Dict, Optional, Type
+import asyncio
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
 
 from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
-from flux_mcp_server.clusters.local import LocalFluxHandle
+from flux_mcp_server.clusters.remote import RemoteFluxHandle
+
+logger = logging.getLogger(__name__)
+
+
+def local_handle(name: str, config: dict) -> ClusterHandle:
+    # Only local clusters need the Flux bindings (a server can use just agents)
+    from flux_mcp_server.clusters.local import LocalFluxHandle
+
+    return LocalFluxHandle(name, config)
+
+
+def retrieve(future: asyncio.Future):
+    """
+    Take the error of a connect nobody waits for anymore, so asyncio doesn't warn about it.
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+@dataclass
+class ClusterHealth:
+    """
+    How a cluster answered its last connection probe. A degraded cluster stays
+    registered, and is probed again with exponential backoff until it answers.
+    """
+
+    state: str = "unknown"
+    latency: Optional[float] = None
+    last_checked: Optional[float] = None
+    failures: int = 0
+    error: Optional[str] = None
+    next_probe: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 3),
+            "last_checked": self.last_checked,
+            "failures": self.failures,
+            "error": self.error,
+        }
 
 
 class ClusterRegistry:
@@ -10,16 +57,43 @@ class ClusterRegistry:
 
     We need to hold state because we are listening for events OR receiving
     callbacks from clusters.
+
+    Clusters are connected concurrently (register_many), each with a timeout, so
+    startup takes as long as the slowest probe and not the sum of them. One that
+    doesn't answer is registered as degraded instead of failing the rest, and a
+    background task keeps probing every cluster: healthy ones every
+    probe_interval, and degraded ones with backoff (up to max_backoff).
     """
 
     _instance = None
 
-    def __init__(self):
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        probe_interval: Optional[float] = None,
+        max_backoff: float = 300.0,
+    ):
         self._clusters: Dict[str, ClusterHandle] = {}
+        self._health: Dict[str, ClusterHealth] = {}
+        self._probe_task = None
+
+        # Connects that didn't answer in time. The thread can't be stopped, so we
+        # wait on it again at the next probe instead of starting another one
+        self._pending: Dict[str, asyncio.Future] = {}
 
-        # Map of 'type_name' -> Class
-        self._handle_types: Dict[str, Type[ClusterHandle]] = {
-            "local": LocalFluxHandle,
+        if timeout is None:
+            timeout = float(os.environ.get("FLUX_MCP_CLUSTER_TIMEOUT", 10.0))
+        if probe_interval is None:
+            probe_interval = float(os.environ.get("FLUX_MCP_CLUSTER_PROBE_INTERVAL", 30.0))
+        self.timeout = timeout
+        self.probe_interval = probe_interval
+        self.max_backoff = max_backoff
+
+        # Map of 'type_name' -> Class (or a function that makes the handle)
+        self._handle_types: Dict[str, Callable[[str, dict], ClusterHandle]] = {
+            "local": local_handle,
+            # Through an agent next to the Flux instance (flux-mcp-agent)
+            "remote": RemoteFluxHandle,
             # "ssh": SshFluxHandle (Future)
         }
 
@@ -29,10 +103,7 @@ class ClusterRegistry:
             cls._instance = ClusterRegistry()
         return cls._instance
 
-    def register(self, name: str, type_str: str, config: dict) -> bool:
-        """
-        Creates and stores a new cluster handle.
-        """
+    def _create(self, name: str, type_str: str, config: dict) -> ClusterHandle:
         if name in self._clusters:
             raise ValueError(f"Cluster '{name}' already exists.")
 
@@ -41,29 +112,143 @@ class ClusterRegistry:
             raise ValueError(f"Unknown handle type: {type_str}")
 
         # Instantiate
-        handle = handle_cls(name, config)
-
-        # Verify connection
-        if not handle.connect():
-            raise ConnectionError(f"Could not connect to {name} during registration.")
+        return handle_cls(name, config)
 
+    def register(self, name: str, type_str: str, config: dict) -> bool:
+        """
+        Creates and stores a new cluster handle, connecting here (blocking).
+        Returns False if it didn't connect (the cluster is registered as degraded).
+        """
+        handle = self._create(name, type_str, config)
+        start = time.perf_counter()
+        try:
+            connected, error = handle.connect(), None
+        except Exception as e:
+            connected, error = False, str(e)
         self._clusters[name] = handle
-        return True
+        self._record(name, connected, time.perf_counter() - start, error)
+        return connected
+
+    async def register_many(self, clusters: Dict[str, dict]) -> Dict[str, bool]:
+        """
+        Register clusters (name -> config, with a "type" that defaults to local)
+        and connect them all at once. Returns whether each one connected.
+        """
+        handles = {}
+        for name, config in clusters.items():
+            config = dict(config or {})
+            try:
+                handles[name] = self._create(name, config.pop("type", "local"), config)
+            except ValueError as e:
+                logger.error(f"Could not register cluster {name}: {e}")
+        self._clusters.update(handles)
+        results = await asyncio.gather(*(self.probe(name) for name in handles))
+        return dict(zip(handles, results))
+
+    async def register_async(self, name: str, type_str: str, config: dict) -> bool:
+        self._clusters[name] = self._create(name, type_str, config)
+        return await self.probe(name)
+
+    async def probe(self, name: str) -> bool:
+        """
+        Check a cluster is reachable (its connect, on the handle's own workers),
+        within the timeout, and record its health and latency. A hung cluster
+        holds one worker thread, however many times we probe it.
+        """
+        handle = self._clusters[name]
+        pending = self._pending.pop(name, None)
+        if pending is None or pending.done():
+            pending = asyncio.ensure_future(handle.call("connect"))
+            pending.add_done_callback(retrieve)
+        start = time.perf_counter()
+        try:
+            connected = await asyncio.wait_for(asyncio.shield(pending), self.timeout)
+            error = None if connected else "Could not connect"
+        except asyncio.TimeoutError:
+            self._pending[name] = pending
+            connected, error = False, f"No answer in {self.timeout}s"
+        except Exception as e:
+            connected, error = False, str(e)
+        self._record(name, connected, time.perf_counter() - start, error)
+        return connected
+
+    def _record(self, name: str, connected: bool, latency: float, error: Optional[str] = None):
+        health = self._health.setdefault(name, ClusterHealth())
+        health.last_checked = time.time()
+        if connected:
+            health.state, health.latency = "healthy", latency
+            health.failures, health.error = 0, None
+            delay = self.probe_interval
+        else:
+            if health.state != "degraded":
+                logger.warning(f"Cluster {name} is degraded: {error}")
+            health.state, health.error = "degraded", error
+            health.failures += 1
+
+            # 1s, 2s, 4s... (with jitter, so clusters that failed together spread out)
+            delay = min(self.max_backoff, 2.0 ** (health.failures - 1))
+            delay *= random.uniform(0.8, 1.2)
+        health.next_probe = time.monotonic() + delay
+
+    def start_probes(self):
+        """
+        Keep probing clusters in the background (call from the event loop).
+        """
+        if self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def stop_probes(self):
+        if self._probe_task:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
+
+    async def _probe_loop(self):
+        while True:
+            now = time.monotonic()
+            due = [
+                name
+                for name in list(self._clusters)
+                if name not in self._health or self._health[name].next_probe <= now
+            ]
+            await asyncio.gather(*(self.probe(name) for name in due))
+            await asyncio.sleep(1.0)
 
     def remove(self, name: str) -> bool:
         if name in self._clusters:
             self._clusters[name].close()
             del self._clusters[name]
+            self._health.pop(name, None)
+            self._pending.pop(name, None)
             return True
         return False
 
     def get_handle(self, name: str) -> Optional[ClusterHandle]:
         return self._clusters.get(name)
 
+    def is_healthy(self, name: str) -> bool:
+        health = self._health.get(name)
+        return health is None or health.state != "degraded"
+
+    def handles(self, healthy: bool = False) -> Dict[str, ClusterHandle]:
+        """
+        The registered handles by name (a copy, so callers can iterate while we change).
+        With healthy=True, leave out degraded clusters.
+        """
+        return {
+            name: handle
+            for name, handle in self._clusters.items()
+            if not healthy or self.is_healthy(name)
+        }
+
     def list_clusters(self) -> dict:
-        """Returns metadata about registered clusters."""
+        """Returns metadata about registered clusters, with their health and latency."""
         return {
-            name: {"type": type(h).__name__, "config": h.config}
+            name: {
+                "type": type(h).__name__,
+                "config": h.config,
+                "health": self._health.get(name, ClusterHealth()).to_dict(),
+            }
             for name, h in self._clusters.items()
         }
 
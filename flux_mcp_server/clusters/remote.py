@@ -0,0 +1,253 @@
+import asyncio
+import inspect
+import itertools
+import os
+import ssl
+import threading
+import urllib.parse
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
+from flux_mcp_server.clusters.jobspec import get_jobspec_cache
+from flux_mcp_server.clusters.rpc import (
+    DEFAULT_PORT,
+    MAX_MESSAGE,
+    RPC_METHODS,
+    LineBatcher,
+    read_messages,
+)
+
+# Requests that change the cluster. If one timed out, we would report a failure
+# that the agent may still turn into a success (and a retry into duplicate jobs),
+# so these wait for their answer, or for the connection to drop.
+UNTIMED_METHODS = {"submit", "submit_many", "cancel", "cancel_many"}
+
+
+def agent_address(config: dict) -> Tuple[str, int]:
+    """
+    Where the agent is, from a uri (tcp://host:port, or host:port) or host and port.
+    """
+    uri = config.get("uri")
+    if uri:
+        parsed = urllib.parse.urlsplit(uri if "://" in uri else f"tcp://{uri}")
+        return parsed.hostname, parsed.port or DEFAULT_PORT
+    return config.get("host", "127.0.0.1"), int(config.get("port", DEFAULT_PORT))
+
+
+def client_context(config: dict) -> Optional[ssl.SSLContext]:
+    """
+    A TLS context if the agent serves TLS (a tls:// uri, tls: true, or a cafile to
+    trust its certificate with), otherwise None for a plain connection.
+    """
+    uri = config.get("uri") or ""
+    cafile = config.get("cafile")
+    if not (uri.startswith("tls://") or config.get("tls") or cafile):
+        return None
+    return ssl.create_default_context(cafile=cafile)
+
+
+class RemoteFluxHandle(ClusterHandle):
+    """
+    A handle to a Flux instance somewhere else, through an agent running next to
+    it (flux-mcp-agent, see agent.py).
+
+    Every call is a request on one persistent connection to the agent, with an
+    id, and answers come back as they finish (in any order). Requests made at
+    the same time are written together, so a burst of concurrent submits,
+    cancels, and info lookups costs one round trip instead of one each, and we
+    never open a connection per operation. If the connection drops, whatever is
+    waiting fails, and the next call reconnects. Reads time out after timeout
+    seconds, but submits and cancels don't (see UNTIMED_METHODS). With a tls://
+    uri (or tls or cafile in the config) the connection is TLS, see client_context.
+
+    The connection lives on its own event loop (in a thread), so the blocking
+    methods can be used from any thread, and call() from any event loop.
+    """
+
+    def __init__(self, cluster_id: str, config: dict):
+        super().__init__(cluster_id, config)
+        self.host, self.port = agent_address(config)
+        self.ssl_context = client_context(config)
+        self.token = config.get("token") or os.environ.get("FLUX_MCP_AGENT_TOKEN")
+        self.timeout = float(config.get("timeout", 30.0))
+
+        # We parse and validate jobspecs here, so a bad one doesn't cost a round trip
+        self.jobspecs = get_jobspec_cache()
+
+        self.connections = 0
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._batcher: Optional[LineBatcher] = None
+        self._reader_task = None
+        self._connecting = None
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"flux-remote-{cluster_id}", daemon=True
+        )
+        self._thread.start()
+
+    def _parse(self, jobspec: Any) -> str:
+        if isinstance(jobspec, Exception):
+            raise jobspec
+        return self.jobspecs.load(jobspec).encoded
+
+    async def _connect(self):
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host, self.port, limit=MAX_MESSAGE, ssl=self.ssl_context
+                ),
+                self.timeout,
+            )
+            self._batcher = LineBatcher(writer)
+            self._reader_task = asyncio.ensure_future(self._read_loop(reader, self._batcher))
+            self.connections += 1
+            if self.token:
+                try:
+                    await self._request("hello", {"token": self.token})
+                except Exception as e:
+                    error = ConnectionError(f"Agent at {self.host}:{self.port} refused us: {e}")
+                    self._disconnect(error)
+                    raise error from e
+        finally:
+            self._connecting = None
+
+    async def _read_loop(self, reader: asyncio.StreamReader, batcher: LineBatcher):
+        try:
+            async for message in read_messages(reader):
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(RuntimeError(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+            error = ConnectionError(f"Agent at {self.host}:{self.port} closed the connection")
+        except Exception as e:
+            error = ConnectionError(f"Lost connection to agent at {self.host}:{self.port}: {e}")
+
+        # Unless we already dropped this connection (and maybe made a new one)
+        if self._batcher is batcher:
+            self._disconnect(error)
+
+    def _disconnect(self, error: Exception):
+        """
+        Drop the connection, and fail everything still waiting on it.
+        """
+        if self._batcher is not None:
+            self._batcher.writer.close()
+        self._batcher = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _request(self, method: str, params: Dict[str, Any]) -> Any:
+        # The connection can drop between connecting and sending
+        if self._batcher is None:
+            raise ConnectionError(f"Not connected to agent at {self.host}:{self.port}")
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        self._batcher.send({"id": request_id, "method": method, "params": params})
+        timeout = None if method in UNTIMED_METHODS else self.timeout
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No answer from agent to {method} in {timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _send(self, method: str, params: Dict[str, Any]) -> Any:
+        if self._batcher is None:
+            # Everyone waiting for the connection shares one attempt (and they all go
+            # together once it's up, so their requests still go out in one write)
+            if self._connecting is None:
+                self._connecting = asyncio.ensure_future(self._connect())
+            await asyncio.shield(self._connecting)
+        return await self._request(method, params)
+
+    async def rpc(self, method: str, *args, **kwargs) -> Any:
+        """
+        Call a ClusterHandle method on the agent, with the same arguments
+        (sent by name). This runs on the handle's own loop.
+        """
+        params = inspect.signature(getattr(ClusterHandle, method)).bind(self, *args, **kwargs)
+        params = dict(params.arguments)
+        del params["self"]
+        if isinstance(params.get("auth"), AuthContext):
+            params["auth"] = asdict(params["auth"])
+
+        if method == "submit":
+            params["jobspec"] = self._parse(params["jobspec"])
+        elif method == "submit_many":
+            return await self._submit_many(params)
+        return await self._send(method, params)
+
+    async def _submit_many(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Jobspecs that don't parse fail here, and the rest go in one request
+        jobspecs = params["jobspecs"]
+        results, encoded = {}, {}
+        for i, jobspec in enumerate(jobspecs):
+            try:
+                encoded[i] = self._parse(jobspec)
+            except Exception as e:
+                results[i] = {"error": str(e)}
+        if encoded:
+            answers = await self._send("submit_many", dict(params, jobspecs=list(encoded.values())))
+            results.update(zip(encoded, answers))
+        return [results[i] for i in range(len(jobspecs))]
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        if method not in RPC_METHODS:
+            return await super().call(method, *args, **kwargs)
+        future = asyncio.run_coroutine_threadsafe(self.rpc(method, *args, **kwargs), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def _run(self, method: str, *args, **kwargs) -> Any:
+        future = asyncio.run_coroutine_threadsafe(self.rpc(method, *args, **kwargs), self._loop)
+        return future.result()
+
+    def connect(self) -> bool:
+        return bool(self._run("connect"))
+
+    def submit(self, jobspec: str, auth: AuthContext) -> int:
+        return int(self._run("submit", jobspec, auth))
+
+    def submit_many(self, jobspecs: List[Any], auth: AuthContext) -> List[Dict[str, Any]]:
+        return self._run("submit_many", jobspecs, auth)
+
+    def cancel(self, job_id: int, auth: AuthContext) -> bool:
+        try:
+            return bool(self._run("cancel", job_id, auth))
+        except Exception:
+            return False
+
+    def cancel_many(
+        self, job_ids: List[int], auth: AuthContext, reason: str = None
+    ) -> List[Dict[str, Any]]:
+        return self._run("cancel_many", job_ids, auth, reason)
+
+    def get_job_info(self, job_id: int, auth: AuthContext) -> Dict[str, Any]:
+        return self._run("get_job_info", job_id, auth)
+
+    def list_jobs(self, auth: AuthContext, *args, **kwargs) -> List[Dict[str, Any]]:
+        return self._run("list_jobs", auth, *args, **kwargs)
+
+    def resource_status(self) -> List[Dict[str, Any]]:
+        return self._run("resource_status")
+
+    def close(self):
+        async def disconnect():
+            if self._reader_task is not None:
+                self._reader_task.cancel()
+            self._disconnect(ConnectionError("The handle was closed"))
+
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(disconnect(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
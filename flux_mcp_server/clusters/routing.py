@@ -0,0 +1,198 @@
+import asyncio
+import os
+import random
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from flux_mcp_server.clusters.registry import ClusterRegistry, get_registry
+from flux_mcp_server.clusters.snapshots import get_poller
+from flux_mcp_server.db.interface import DatabaseBackend
+from flux_mcp_server.utils.cache import TTLCache
+
+# Pass this as the cluster to have the router pick one
+AUTO = "auto"
+
+# Job states that have left the queue (everything else active is waiting)
+STARTED_STATES = {"RUN", "CLEANUP"}
+
+
+@dataclass
+class ClusterLoad:
+    """
+    What we know about how busy a cluster is, from signals we already have:
+    the jobs table (queued and running), the resource poller (free cores),
+    and our own recent submissions (latency, seconds per job).
+    """
+
+    cluster: str
+    queued: int = 0
+    running: int = 0
+    free_cores: Optional[int] = None
+    cores: Optional[int] = None
+    latency: Optional[float] = None
+    weight: float = 1.0
+
+    @property
+    def load(self) -> float:
+        """
+        Queued jobs per free core (plus one, so an idle cluster still compares).
+        Without a resource snapshot we assume no free cores, so a cluster we can
+        say something about wins over one we can't, on the same scale.
+        """
+        return (self.queued + 1) / ((self.free_cores or 0) + 1)
+
+    def to_dict(self) -> dict:
+        return dict(asdict(self), load=self.load)
+
+
+@dataclass
+class RoutingDecision:
+    cluster: str
+    policy: str
+    reason: str
+    candidates: List[ClusterLoad] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "cluster": self.cluster,
+            "policy": self.policy,
+            "reason": self.reason,
+            "candidates": [load.to_dict() for load in self.candidates],
+        }
+
+
+def least_loaded(loads: List[ClusterLoad]) -> ClusterLoad:
+    # Ties (e.g., everything idle) go to the cluster that has been answering fastest
+    return min(loads, key=lambda c: (c.load, c.latency or 0.0, c.cluster))
+
+
+class LeastLoadedPolicy:
+    name = "least-loaded"
+
+    def choose(self, loads: List[ClusterLoad], user: str = None):
+        choice = least_loaded(loads)
+        return choice, f"lowest load ({choice.load:.3g} queued per free core)"
+
+
+class WeightedPolicy:
+    """
+    Pick at random, in proportion to a cluster's weight (its "weight" config)
+    divided by its load. Spreads a burst of submissions instead of sending all
+    of it to whichever cluster looked least loaded a moment ago.
+    """
+
+    name = "weighted"
+
+    def __init__(self, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+
+    def choose(self, loads: List[ClusterLoad], user: str = None):
+        weights = [c.weight / (c.load + 1.0) for c in loads]
+        choice = self.random.choices(loads, weights=weights)[0]
+        share = weights[loads.index(choice)] / sum(weights)
+        return choice, f"weighted choice ({share:.0%} of the weight)"
+
+
+class StickyPolicy:
+    """
+    Send a user back to the cluster they were routed to before (their data and
+    environment are likely there), and new users to the least loaded cluster.
+    We remember the max_users most recently routed users, so a long running
+    server with many users doesn't grow without bound.
+    """
+
+    name = "sticky"
+
+    def __init__(self, max_users: Optional[int] = None):
+        if max_users is None:
+            max_users = int(os.environ.get("FLUX_MCP_STICKY_USERS", 10000))
+        self.max_users = max_users
+        self.assigned: "OrderedDict[str, str]" = OrderedDict()
+
+    def choose(self, loads: List[ClusterLoad], user: str = None):
+        names = {c.cluster: c for c in loads}
+        if user in self.assigned and self.assigned[user] in names:
+            self.assigned.move_to_end(user)
+            return names[self.assigned[user]], f"sticky for user {user}"
+        choice = least_loaded(loads)
+        if user is not None:
+            self.assigned[user] = choice.cluster
+            self.assigned.move_to_end(user)
+            while len(self.assigned) > self.max_users:
+                self.assigned.popitem(last=False)
+        return choice, "new user, lowest load"
+
+
+POLICIES = {"least-loaded": LeastLoadedPolicy, "weighted": WeightedPolicy, "sticky": StickyPolicy}
+
+
+class ClusterRouter:
+    """
+    Pick a cluster to submit to from the load signals we have.
+
+    Queue depths come from the jobs table (cached for a couple of seconds, so a
+    burst of routing costs one query per cluster), free cores from the resource
+    poller, and latency from submissions we routed (an exponential moving average).
+    """
+
+    def __init__(
+        self,
+        db: DatabaseBackend,
+        registry: Optional[ClusterRegistry] = None,
+        policy: Optional[str] = None,
+        ttl: float = 2.0,
+    ):
+        self.db = db
+        self.registry = registry or get_registry()
+        self.default_policy = policy or os.environ.get("FLUX_MCP_ROUTING_POLICY", "least-loaded")
+        self.policies = {name: cls() for name, cls in POLICIES.items()}
+        self.latency: Dict[str, float] = {}
+        self._queues = TTLCache(ttl=ttl)
+
+    def observe(self, cluster: str, seconds: float, alpha: float = 0.2):
+        """
+        Record how long a submission (per job) took on a cluster.
+        """
+        previous = self.latency.get(cluster)
+        self.latency[cluster] = (
+            seconds if previous is None else previous + alpha * (seconds - previous)
+        )
+
+    async def _queue(self, cluster: str) -> tuple:
+        async def count():
+            counts = await self.db.count_active_jobs(cluster)
+            running = sum(counts.get(state, 0) for state in STARTED_STATES)
+            return sum(counts.values()) - running, running
+
+        return await self._queues.get(cluster, count)
+
+    async def loads(self) -> List[ClusterLoad]:
+        # Degraded clusters (not answering probes) aren't candidates
+        handles = self.registry.handles(healthy=True)
+        queues = await asyncio.gather(*(self._queue(name) for name in handles))
+        poller = get_poller()
+        loads = []
+        for (name, handle), (queued, running) in zip(handles.items(), queues):
+            load = ClusterLoad(
+                cluster=name,
+                queued=queued,
+                running=running,
+                latency=self.latency.get(name),
+                weight=float(handle.config.get("weight", 1.0)),
+            )
+            for record in poller.latest.get(name, []) if poller else []:
+                if record.partition == "all":
+                    load.free_cores, load.cores = record.free_cores, record.cores
+            loads.append(load)
+        return loads
+
+    async def route(self, user: str = None, policy: Optional[str] = None) -> RoutingDecision:
+        policy = policy or self.default_policy
+        if policy not in self.policies:
+            raise ValueError(f"Unknown routing policy {policy}, choose from {', '.join(POLICIES)}")
+        loads = await self.loads()
+        if not loads:
+            raise ValueError("There are no healthy clusters to route to.")
+        choice, reason = self.policies[policy].choose(loads, user)
+        return RoutingDecision(choice.cluster, policy, reason, loads)
@@ -0,0 +1,72 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict
+
+# The wire protocol between a RemoteFluxHandle and its agent: newline delimited
+# JSON over one persistent stream. Requests are {"id", "method", "params"} and
+# responses {"id", "result"} or {"id", "error"}, in whatever order they finish,
+# so many requests can be in flight on the one connection at once.
+
+# What a remote handle can ask an agent to do (ClusterHandle methods)
+RPC_METHODS = {
+    "connect",
+    "submit",
+    "submit_many",
+    "cancel",
+    "cancel_many",
+    "get_job_info",
+    "list_jobs",
+    "resource_status",
+}
+
+# Where an agent listens by default
+DEFAULT_PORT = 8090
+
+# Largest message (line) we read, big enough for a large submit_many
+MAX_MESSAGE = 64 * 1024 * 1024
+
+
+class LineBatcher:
+    """
+    Write messages to a stream, batched. Everything sent in the same pass of the
+    event loop goes out in one write (and one drain), so a burst of concurrent
+    requests (or responses) costs one packet instead of one each.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self._buffer = []
+        self._flushing = None
+        self.writes = 0
+
+    def send(self, message: Dict[str, Any]):
+        self._buffer.append(json.dumps(message).encode() + b"\n")
+        if self._flushing is None:
+            self._flushing = asyncio.ensure_future(self._flush())
+
+    async def _flush(self):
+        try:
+            # Let everyone else running now add their messages first
+            await asyncio.sleep(0)
+            while self._buffer:
+                data, self._buffer = b"".join(self._buffer), []
+                self.writer.write(data)
+                self.writes += 1
+                await self.writer.drain()
+        except ConnectionError:
+            # The reading side finds out too, and fails what is waiting
+            self._buffer = []
+        finally:
+            self._flushing = None
+
+
+async def read_messages(reader: asyncio.StreamReader) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield messages from a stream until it closes.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        if line.strip():
+            yield json.loads(line)
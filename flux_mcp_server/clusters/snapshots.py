@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from flux_mcp_server.clusters.interface import ClusterHandle
+from flux_mcp_server.clusters.registry import ClusterRegistry, get_registry
+from flux_mcp_server.db.interface import DatabaseBackend
+from flux_mcp_server.db.models import ResourceRecord
+
+logger = logging.getLogger(__name__)
+
+POLLER = None
+
+
+def get_poller() -> Optional["ResourcePoller"]:
+    return POLLER
+
+
+def resource_partitions(rlist) -> List[Dict[str, Any]]:
+    """
+    Summarize a resource list for the whole cluster ("all"), and for each node
+    property (how queues and partitions are defined in Flux).
+    """
+    properties = getattr(rlist.all, "properties", None) or []
+    if isinstance(properties, str):
+        properties = properties.split(",")
+    partitions = {"all": None}
+    for name in sorted(set(properties)):
+        if name and not name.startswith("^"):
+            partitions[name] = {"properties": [name]}
+
+    summaries = []
+    for partition, constraint in partitions.items():
+        sets = {"": rlist.all, "free_": rlist.free, "allocated_": rlist.allocated}
+        sets["down_"] = rlist.down
+        summary = {"partition": partition}
+        for prefix, rset in sets.items():
+            if constraint is not None:
+                rset = rset.copy_constraint(constraint)
+            summary[f"{prefix}nodes"] = rset.nnodes
+            if prefix != "down_":
+                summary[f"{prefix}cores"] = rset.ncores
+                summary[f"{prefix}gpus"] = rset.ngpus
+        summaries.append(summary)
+    return summaries
+
+
+class ResourcePoller:
+    """
+    Poll resource status for every registered cluster on an interval.
+
+    Each poll is one resource list RPC per cluster, summarized per partition.
+    The latest snapshot is kept in memory (so tools answer with no Flux RPC at
+    all) and appended to the database, so we also have a history of it.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseBackend,
+        registry: Optional[ClusterRegistry] = None,
+        interval: Optional[float] = None,
+    ):
+        if interval is None:
+            interval = float(os.environ.get("FLUX_MCP_RESOURCE_INTERVAL", 30.0))
+        self.db = db
+        self.registry = registry or get_registry()
+        self.interval = interval
+        self.latest: Dict[str, List[ResourceRecord]] = {}
+        self._task = None
+
+    def start(self):
+        global POLLER
+        POLLER = self
+        self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _poll_loop(self):
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.interval)
+
+    async def poll(self):
+        """
+        Poll every healthy cluster concurrently (a slow one doesn't hold up the rest).
+        """
+        handles = self.registry.handles(healthy=True)
+        await asyncio.gather(*(self._poll_cluster(name, h) for name, h in handles.items()))
+
+    async def _poll_cluster(self, name: str, handle: ClusterHandle):
+        try:
+            partitions = await handle.call("resource_status")
+        except Exception as e:
+            logger.warning(f"Failed to get resource status for {name}: {e}")
+            return
+
+        now = time.time()
+        records = [ResourceRecord(cluster=name, timestamp=now, **p) for p in partitions]
+        self.latest[name] = records
+        try:
+            await self.db.record_resources(records)
+        except Exception as e:
+            logger.error(f"Failed to record resource snapshot for {name}: {e}")
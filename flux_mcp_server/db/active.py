@@ -0,0 +1,252 @@
+import heapq
+import logging
+from collections import OrderedDict, defaultdict
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from flux_mcp_server.db.interface import DatabaseBackend
+from flux_mcp_server.db.lifecycle import apply_event, event_resources, parse_event
+from flux_mcp_server.db.memory import filter_jobs
+from flux_mcp_server.db.models import (
+    EventRecord,
+    JobRecord,
+    ResourceRecord,
+    UsageRecord,
+    job_order_key,
+    job_tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, int]
+
+
+class ActiveJobIndex:
+    """
+    An in-memory index of every job that is not INACTIVE, plus a bounded LRU
+    of recently finished jobs. Jobs are keyed by (cluster, job_id), and active
+    jobs are also indexed by state and by user.
+    """
+
+    def __init__(self, max_finished: int = 10000):
+        self.max_finished = max_finished
+        self.active: Dict[Key, JobRecord] = {}
+        self.finished: OrderedDict = OrderedDict()
+        self.by_state: Dict[str, Set[Key]] = defaultdict(set)
+        self.by_user: Dict[str, Set[Key]] = defaultdict(set)
+
+    def __len__(self):
+        return len(self.active) + len(self.finished)
+
+    def get(self, cluster: str, job_id: int) -> Optional[JobRecord]:
+        key = (cluster, job_id)
+        job = self.active.get(key)
+        if job is None:
+            job = self.finished.get(key)
+            if job is not None:
+                self.finished.move_to_end(key)
+        return job
+
+    def put(self, job: JobRecord):
+        """
+        Add or replace a job. Don't mutate a record after putting it (put a new one).
+        """
+        key = (job.cluster, job.job_id)
+        self._remove(key)
+        if job.state == "INACTIVE":
+            self.finished[key] = job
+            while len(self.finished) > self.max_finished:
+                self.finished.popitem(last=False)
+            return
+        self.active[key] = job
+        self.by_state[job.state].add(key)
+        if job.user is not None:
+            self.by_user[job.user].add(key)
+
+    def _remove(self, key: Key):
+        job = self.active.pop(key, None)
+        if job is None:
+            self.finished.pop(key, None)
+            return
+        self._discard(self.by_state, job.state, key)
+        self._discard(self.by_user, job.user, key)
+
+    def _discard(self, index: dict, value: Any, key: Key):
+        keys = index.get(value)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del index[value]
+
+    def search(
+        self,
+        cluster: str = None,
+        state: str = None,
+        user: str = None,
+        limit: Optional[int] = 10,
+    ) -> List[JobRecord]:
+        """
+        Search active jobs, starting from the smallest secondary index we can use.
+        """
+        candidates = None
+        for index, value in [(self.by_state, state), (self.by_user, user)]:
+            if value is None:
+                continue
+            keys = index.get(value, ())
+            if candidates is None or len(keys) < len(candidates):
+                candidates = keys
+        if candidates is None:
+            jobs = self.active.values()
+        else:
+            jobs = (self.active[key] for key in candidates)
+
+        jobs = filter_jobs(jobs, cluster, state, user)
+        if limit is None:
+            return sorted(jobs, key=job_order_key(), reverse=True)
+        return heapq.nlargest(limit, jobs, key=job_order_key())
+
+
+class CachedBackend(DatabaseBackend):
+    """
+    Wrap a backend with a live ActiveJobIndex held in server memory.
+
+    The index is rebuilt from the database on initialize, and ingest through
+    this backend keeps it current (with the same rules the database applies).
+    Status reads for active or recently finished jobs, and searches over active
+    jobs, are then answered from memory without a database session. Writes from
+    another process (e.g., a standalone events service writing to the same
+    database) are not seen until the next rebuild.
+    """
+
+    def __init__(self, backend: DatabaseBackend, max_finished: int = 10000):
+        self.backend = backend
+        self.index = ActiveJobIndex(max_finished)
+
+    def __getattr__(self, name):
+        # Anything we don't wrap (e.g., the engine) belongs to the backend
+        return getattr(self.backend, name)
+
+    async def initialize(self):
+        await self.backend.initialize()
+        await self.rebuild()
+
+    async def rebuild(self):
+        """
+        Rebuild the index: every active job, and the most recently finished ones.
+        """
+        index = ActiveJobIndex(self.index.max_finished)
+        finished = await self.backend.search_jobs(active=False, limit=index.max_finished)
+
+        # Oldest first, so the newest end up most recently used
+        for job in reversed(finished):
+            index.put(job)
+        for job in await self.backend.search_jobs(active=True, limit=None):
+            index.put(job)
+        self.index = index
+        logger.info(f"Active job index rebuilt with {len(index)} jobs")
+
+    async def close(self):
+        await self.backend.close()
+
+    async def record_event(self, cluster: str, event: Dict[str, Any]):
+        await self.record_events(cluster, [event])
+
+    async def record_events(self, cluster: str, events: List[Dict[str, Any]]):
+        await self.backend.record_events(cluster, events)
+
+        # Only update the index once the database has the events
+        created = set()
+        for event in events:
+            job_id, event_type, data, timestamp, _ = parse_event(event)
+            job = self.index.get(cluster, job_id)
+            if job is None:
+                if event_type != "submit":
+                    continue
+                created.add(job_id)
+            else:
+                job = replace(job)
+            resources = event_resources(event_type, event)
+            job = apply_event(job, cluster, job_id, event_type, data, timestamp, resources)
+            self.index.put(job)
+
+        # A submit for a job we didn't know is usually a new job, but could be a replay
+        # the database ignored. A job the batch finished is right either way, otherwise
+        # we take what the database has, unless it is older (e.g., a stale replica).
+        for job_id in created:
+            job = self.index.get(cluster, job_id)
+            if job is None or job.state == "INACTIVE":
+                continue
+            stored = await self.backend.get_job(cluster, job_id)
+            if stored is not None and stored.last_updated >= job.last_updated:
+                self.index.put(stored)
+
+    async def get_job(self, cluster: str, job_id: int) -> Optional[JobRecord]:
+        job = self.index.get(cluster, job_id)
+        if job is not None:
+            return replace(job)
+
+        # Every active job is indexed, so this is an older finished job (or unknown)
+        job = await self.backend.get_job(cluster, job_id)
+        if job is not None:
+            self.index.put(replace(job))
+        return job
+
+    async def get_event_history(
+        self, cluster: str, job_id: int, since_seq: Optional[int] = None, raw: bool = False
+    ) -> List[EventRecord]:
+        return await self.backend.get_event_history(cluster, job_id, since_seq=since_seq, raw=raw)
+
+    async def search_jobs(
+        self,
+        cluster: str = None,
+        state: str = None,
+        limit: int = 10,
+        raw: bool = False,
+        user: str = None,
+        active: Optional[bool] = None,
+    ) -> List[JobRecord]:
+        """
+        Searches limited to active jobs are served from the index.
+        """
+        if active or (state and state != "INACTIVE" and active is None):
+            jobs = self.index.search(cluster=cluster, state=state, user=user, limit=limit)
+            if raw:
+                return [job_tuple(job) for job in jobs]
+            return [replace(job) for job in jobs]
+
+        return await self.backend.search_jobs(
+            cluster=cluster, state=state, limit=limit, raw=raw, user=user, active=active
+        )
+
+    async def count_active_jobs(self, cluster: str = None) -> Dict[str, int]:
+        """
+        Counted from the index, which has every active job.
+        """
+        counts = {}
+        for state, keys in self.index.by_state.items():
+            count = len(keys) if not cluster else sum(1 for key in keys if key[0] == cluster)
+            if count:
+                counts[state] = count
+        return counts
+
+    async def get_job_states(self, cluster: str, job_ids: List[int]) -> Dict[int, str]:
+        return await self.backend.get_job_states(cluster, job_ids)
+
+    def export_rows(self, table: str, *args, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self.backend.export_rows(table, *args, **kwargs)
+
+    async def get_usage(self, cluster: str = None, user: str = None) -> List[UsageRecord]:
+        return await self.backend.get_usage(cluster, user)
+
+    async def get_cluster_usage(self, cluster: str = None) -> List[UsageRecord]:
+        return await self.backend.get_cluster_usage(cluster)
+
+    async def record_resources(self, records: List[ResourceRecord]):
+        await self.backend.record_resources(records)
+
+    async def get_resource_history(self, *args, **kwargs) -> List[ResourceRecord]:
+        return await self.backend.get_resource_history(*args, **kwargs)
+
+    def get_query_stats(self, limit: int = 10, order: str = "total") -> List[Dict[str, Any]]:
+        return self.backend.get_query_stats(limit, order)
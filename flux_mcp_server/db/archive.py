@@ -0,0 +1,295 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+from flux_mcp_server.db.interface import DatabaseBackend
+
+# numpy is only needed for the archive (pip install flux-mcp-server[analytics])
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Numeric columns are float64 (NaN when missing), strings are dictionary-encoded
+NUMERIC_FIELDS = [
+    "submit_time",
+    "alloc_time",
+    "start_time",
+    "finish_time",
+    "wait_seconds",
+    "run_seconds",
+    "exit_code",
+]
+STRING_FIELDS = ["cluster", "user"]
+AGGREGATES = ["count", "sum", "mean", "min", "max", "failure_rate"]
+
+ARCHIVE = None
+
+
+def get_archive() -> Optional["JobArchive"]:
+    """
+    The job archive at FLUX_MCP_ARCHIVE_PATH, or None if we don't keep one.
+    """
+    global ARCHIVE
+    path = os.environ.get("FLUX_MCP_ARCHIVE_PATH")
+    if ARCHIVE is None and path:
+        ARCHIVE = JobArchive(path)
+    return ARCHIVE
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("The job archive needs numpy: pip install flux-mcp-server[analytics]")
+
+
+class JobArchive:
+    """
+    A columnar archive of finished jobs for analytics, memory-mapped at query time.
+
+    Every finished job is one row across a set of .npy files: job ids, float64
+    times and durations, and int32 codes into a vocabulary for strings (cluster,
+    user). Exports write a new generation directory and then swap the CURRENT
+    pointer, so a reader never sees a partial archive. Queries map the columns
+    (the OS pages in what we touch) and answer with vectorized numpy, so they
+    never touch the live database.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._generation = None
+        self._columns: Dict[str, Any] = {}
+        self._vocab: Dict[str, List[str]] = {}
+        self._task = None
+
+    # Exports
+
+    def start(self, db: DatabaseBackend, interval: float = 3600.0):
+        """
+        Export from the database now, and then every interval seconds.
+        """
+        self._task = asyncio.create_task(self._export_loop(db, interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _export_loop(self, db: DatabaseBackend, interval: float):
+        while True:
+            try:
+                await self.export(db)
+            except Exception as e:
+                logger.error(f"Failed to export job archive: {e}")
+            await asyncio.sleep(interval)
+
+    async def export(self, db: DatabaseBackend) -> int:
+        """
+        Rebuild the archive from every finished (INACTIVE) job in the database.
+        """
+        require_numpy()
+        start = time.perf_counter()
+        ids, numeric = [], {field: [] for field in NUMERIC_FIELDS}
+        vocab = {field: {} for field in STRING_FIELDS}
+        codes = {field: [] for field in STRING_FIELDS}
+
+        async for rows in db.export_rows("jobs", state="INACTIVE"):
+            ids.append(np.array([row["job_id"] for row in rows], dtype=np.int64))
+            for field in NUMERIC_FIELDS:
+                numeric[field].append(np.array([row[field] for row in rows], dtype=np.float64))
+            for field in STRING_FIELDS:
+                lookup = vocab[field]
+                values = [lookup.setdefault(row[field] or "", len(lookup)) for row in rows]
+                codes[field].append(np.array(values, dtype=np.int32))
+
+        columns = {"job_id": concat(ids, np.int64)}
+        columns.update({field: concat(numeric[field], np.float64) for field in NUMERIC_FIELDS})
+        columns.update({field: concat(codes[field], np.int32) for field in STRING_FIELDS})
+        vocab = {field: list(lookup) for field, lookup in vocab.items()}
+        await asyncio.to_thread(self._write, columns, vocab)
+
+        count = len(columns["job_id"])
+        logger.info(f"Exported {count} jobs to archive in {time.perf_counter() - start:.1f}s")
+        return count
+
+    def _write(self, columns: dict, vocab: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"gen-{time.time_ns()}"
+        tmp = os.path.join(self.directory, f"{name}.tmp")
+        os.makedirs(tmp)
+        for field, values in columns.items():
+            np.save(os.path.join(tmp, f"{field}.npy"), values)
+        with open(os.path.join(tmp, "vocab.json"), "w") as fd:
+            json.dump(vocab, fd)
+        os.replace(tmp, os.path.join(self.directory, name))
+
+        current = os.path.join(self.directory, "CURRENT")
+        try:
+            with open(current) as fd:
+                previous = fd.read().strip()
+        except FileNotFoundError:
+            previous = None
+        with open(f"{current}.tmp", "w") as fd:
+            fd.write(name)
+        os.replace(f"{current}.tmp", current)
+
+        # Anyone with an old generation mapped keeps it until they let go, and we
+        # keep the previous one until the next export, since a reader that just
+        # read the old pointer may still be opening its files
+        for path in glob.glob(os.path.join(self.directory, "gen-*")):
+            if os.path.basename(path) not in (name, previous):
+                shutil.rmtree(path, ignore_errors=True)
+
+    # Queries
+
+    def load(self) -> bool:
+        """
+        Map the current generation (if it changed), returning False if there is none yet.
+        """
+        require_numpy()
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as fd:
+                generation = fd.read().strip()
+        except FileNotFoundError:
+            return False
+        if generation == self._generation:
+            return True
+
+        path = os.path.join(self.directory, generation)
+        fields = ["job_id"] + NUMERIC_FIELDS + STRING_FIELDS
+        columns = {
+            field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode="r") for field in fields
+        }
+        with open(os.path.join(path, "vocab.json")) as fd:
+            vocab = json.load(fd)
+        self._columns, self._vocab, self._generation = columns, vocab, generation
+        return True
+
+    def __len__(self):
+        return len(self._columns["job_id"]) if self._columns else 0
+
+    def mask(
+        self,
+        cluster: str = None,
+        user: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ):
+        """
+        Select jobs by cluster, user, and finish time (inclusive). With no filters
+        we select everything with a slice, so columns are views and not copies.
+        """
+        conditions = []
+        for field, value in [("cluster", cluster), ("user", user)]:
+            if value is None:
+                continue
+            if value not in self._vocab[field]:
+                return np.zeros(len(self), dtype=bool)
+            conditions.append(self._columns[field] == self._vocab[field].index(value))
+        if since is not None:
+            conditions.append(self._columns["finish_time"] >= since)
+        if until is not None:
+            conditions.append(self._columns["finish_time"] <= until)
+        if not conditions:
+            return slice(None)
+        return np.logical_and.reduce(conditions)
+
+    def values(self, field: str, **filters):
+        """
+        The (non-missing) values of a numeric field for the selected jobs.
+        """
+        check_choice("field", field, NUMERIC_FIELDS)
+        values = self._columns[field][self.mask(**filters)]
+        return values[~np.isnan(values)]
+
+    def histogram(self, field: str, bins: int = 20, **filters) -> Dict[str, Any]:
+        values = self.values(field, **filters)
+        counts, edges = np.histogram(values, bins=bins)
+        return {
+            "field": field,
+            "count": int(values.size),
+            "counts": counts.tolist(),
+            "edges": edges.tolist(),
+        }
+
+    def percentiles(self, field: str, q: List[float] = None, **filters) -> Dict[str, Any]:
+        q = q or [50, 90, 99]
+        values = self.values(field, **filters)
+        result = {"field": field, "count": int(values.size), "percentiles": {}}
+        if values.size:
+            result["mean"] = float(values.mean())
+            points = np.percentile(values, q)
+            result["percentiles"] = {str(p): float(v) for p, v in zip(q, points)}
+        return result
+
+    def group_by(
+        self,
+        key: str = "user",
+        field: str = "run_seconds",
+        agg: str = "mean",
+        limit: int = 20,
+        **filters,
+    ) -> Dict[str, Any]:
+        """
+        Aggregate a numeric field per user or cluster, largest first. failure_rate is
+        the fraction of jobs with a nonzero exit code, and count ignores the field.
+        """
+        check_choice("key", key, STRING_FIELDS)
+        check_choice("agg", agg, AGGREGATES)
+        mask = self.mask(**filters)
+        codes = np.asarray(self._columns[key][mask])
+        size = len(self._vocab[key])
+        counts = np.bincount(codes, minlength=size)
+
+        if agg == "count":
+            values = counts.astype(np.float64)
+        elif agg == "failure_rate":
+            exit_code = self._columns["exit_code"][mask]
+            failed = np.bincount(codes, weights=np.nan_to_num(exit_code) != 0, minlength=size)
+            values = failed / np.maximum(counts, 1)
+        else:
+            check_choice("field", field, NUMERIC_FIELDS)
+            column = self._columns[field][mask]
+            valid = ~np.isnan(column)
+            codes, column = codes[valid], column[valid]
+            if agg in ["sum", "mean"]:
+                values = np.bincount(codes, weights=column, minlength=size)
+                if agg == "mean":
+                    # A group with no values has no mean (not 0)
+                    valid = np.bincount(codes, minlength=size)
+                    values = np.where(valid > 0, values / np.maximum(valid, 1), np.nan)
+            else:
+                values = np.full(size, np.nan)
+                (np.fmax if agg == "max" else np.fmin).at(values, codes, column)
+
+        groups = np.flatnonzero(counts)
+        groups = groups[np.argsort(-np.nan_to_num(values[groups], nan=-np.inf), kind="stable")]
+        return {
+            "key": key,
+            "field": field,
+            "agg": agg,
+            "groups": [
+                {key: self._vocab[key][i], "jobs": int(counts[i]), agg: nan_to_none(values[i])}
+                for i in groups[:limit]
+            ],
+        }
+
+
+def concat(chunks: list, dtype):
+    return np.concatenate(chunks) if chunks else np.array([], dtype=dtype)
+
+
+def nan_to_none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def check_choice(name: str, value: str, choices: List[str]):
+    if value not in choices:
+        raise ValueError(f"Unknown {name} {value}, choose from {', '.join(choices)}")
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from .models import EventRecord, JobRecord
+from .models import EventRecord, JobRecord, ResourceRecord, UsageRecord
 
 
 class DatabaseBackend(ABC):
@@ -30,6 +30,14 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    async def record_events(self, cluster: str, events: List[Dict[str, Any]]):
+        """
+        Ingest a batch of raw events, in order. Backends with a faster
+        bulk path should override this.
+        """
+        for event in events:
+            await self.record_event(cluster, event)
+
     # Read Operations (Used by MCP Tools / Agents)
 
     @abstractmethod
@@ -38,11 +46,111 @@ class DatabaseBackend(ABC):
         pass
 
     @abstractmethod
-    async def get_event_history(self, cluster: str, job_id: int) -> List[EventRecord]:
-        """Retrieve the full event stream for a job."""
+    async def get_event_history(
+        self, cluster: str, job_id: int, since_seq: Optional[int] = None, raw: bool = False
+    ) -> List[EventRecord]:
+        """
+        Retrieve the event stream for a job, in eventlog (seq) order.
+        With since_seq, only events with a greater seq are returned.
+        With raw=True, return tuples in EventRecord field order instead.
+        """
+        pass
+
+    @abstractmethod
+    async def search_jobs(
+        self,
+        cluster: str = None,
+        state: str = None,
+        limit: int = 10,
+        raw: bool = False,
+        user: str = None,
+        active: Optional[bool] = None,
+    ) -> List[JobRecord]:
+        """
+        Find jobs based on criteria (e.g. state="INACTIVE"), newest submit first.
+        active=True means not INACTIVE, and limit=None means no limit.
+        With raw=True, return tuples in JobRecord field order instead.
+        """
+        pass
+
+    @abstractmethod
+    async def count_active_jobs(self, cluster: str = None) -> Dict[str, int]:
+        """
+        How many jobs are in each active (not INACTIVE) state, without reading them.
+        """
+        pass
+
+    @abstractmethod
+    async def get_job_states(self, cluster: str, job_ids: List[int]) -> Dict[int, str]:
+        """
+        The state of each of job_ids we have on a cluster (jobs we don't have are left out).
+        """
         pass
 
     @abstractmethod
-    async def search_jobs(self, query: str, limit: int = 10) -> List[JobRecord]:
-        """Find jobs based on criteria (e.g. 'state=FAILED')."""
+    def export_rows(
+        self,
+        table: str,
+        cluster: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: Optional[tuple] = None,
+        chunk_size: int = 1000,
+        state: str = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterate over every row of "jobs" or "events" (as dicts), in chunks, in
+        EXPORT_KEYS order. since and until bound the submit time (jobs) or timestamp
+        (events), inclusive. To resume an export, after is the key (export_key) of
+        the last row received, and we start with the row after it. state limits
+        a jobs export to jobs in that state.
+        """
         pass
+
+    @abstractmethod
+    async def get_usage(self, cluster: str = None, user: str = None) -> List[UsageRecord]:
+        """
+        Usage of finished jobs per user (jobs, and run, node, core, and gpu seconds),
+        accumulated at ingest. Heaviest (by core seconds) first.
+        """
+        pass
+
+    @abstractmethod
+    async def get_cluster_usage(self, cluster: str = None) -> List[UsageRecord]:
+        """
+        Usage of finished jobs per cluster (user is ALL_USERS), accumulated at
+        ingest with the per-user rows, so reading it never sums them.
+        """
+        pass
+
+    # Resource snapshots (Used by the resource poller and tools)
+
+    @abstractmethod
+    async def record_resources(self, records: List[ResourceRecord]):
+        """
+        Add resource snapshots (one per partition of a cluster) to the history.
+        """
+        pass
+
+    @abstractmethod
+    async def get_resource_history(
+        self,
+        cluster: str = None,
+        partition: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 100,
+    ) -> List[ResourceRecord]:
+        """
+        Resource snapshots, newest first, optionally for one cluster or partition
+        and a time range (inclusive). A limit of None returns everything.
+        """
+        pass
+
+    # Diagnostics (Used by admin tools)
+
+    def get_query_stats(self, limit: int = 10, order: str = "total") -> List[Dict[str, Any]]:
+        """
+        The most expensive query shapes seen so far, if the backend profiles queries.
+        """
+        return []
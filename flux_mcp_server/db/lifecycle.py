@@ -0,0 +1,180 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import case, func
+
+from flux_mcp_server.db.models import JobModel, JobRecord, UsageRecord
+from flux_mcp_server.db.resources import RESOURCE_FIELDS, decode_resources
+
+# Eventlog events that stamp a lifecycle time onto the job snapshot.
+# alloc: resources were assigned (the job is done waiting in the queue)
+# start: job shells were launched
+# finish: job shells exited (the context carries the wait status)
+TIMING_EVENTS = {"alloc": "alloc_time", "start": "start_time", "finish": "finish_time"}
+
+# The Flux job state a submit puts a job in
+SUBMIT_STATE = "NEW"
+
+# States older servers stored, and what Flux calls them (renamed on upgrade)
+LEGACY_STATES = {"submitted": SUBMIT_STATE}
+
+# The Flux job state an eventlog event moves a job into. The journal does not
+# send "state" events, so this is how the snapshot follows the job.
+STATE_TRANSITIONS = {
+    "validate": "DEPEND",
+    "depend": "PRIORITY",
+    "priority": "SCHED",
+    "alloc": "RUN",
+    "finish": "CLEANUP",
+    "clean": "INACTIVE",
+}
+
+
+def event_state(event_type: str, data: Dict[str, Any]) -> Optional[str]:
+    """
+    The state a (non-submit) event moves a job into, or None if it doesn't.
+    """
+    if event_type == "state":
+        return data.get("state_name")
+
+    # A fatal exception sends the job to cleanup from wherever it is
+    if event_type == "exception" and data.get("severity") == 0:
+        return "CLEANUP"
+    return STATE_TRANSITIONS.get(event_type)
+
+
+def parse_event(event: Dict[str, Any]) -> Tuple[int, str, Dict[str, Any], float, int]:
+    """
+    Parse a normalized event into (job_id, event_type, data, timestamp, seq).
+
+    Events from the JournalConsumer are eventlog entries, so they carry
+    "timestamp" and "context". Older producers send "t" and "data", so we
+    accept both. We only fall back to the current time if neither is there.
+    The seq is part of the event's natural key, and defaults to 0.
+    """
+    job_id = event.get("id")
+    event_type = event.get("type") or event.get("name")
+    data = event.get("context") or event.get("data") or {}
+    timestamp = event.get("timestamp", event.get("t"))
+    if timestamp is None:
+        timestamp = time.time()
+    return job_id, event_type, data, float(timestamp), int(event.get("seq") or 0)
+
+
+def event_resources(event_type: str, event: Dict[str, Any]) -> Optional[Tuple[int, int, int]]:
+    """
+    The (nnodes, ncores, ngpus) of an alloc event's R, if it came with one.
+    """
+    if event_type != "alloc":
+        return None
+    return decode_resources(event.get("R"))
+
+
+def timing_values(
+    event_type: str, timestamp: Any, status: Any = None, resources: Optional[tuple] = None
+) -> Dict[str, Any]:
+    """
+    Column values for a timing event, for use in an UPDATE of the jobs table.
+
+    The derived durations are computed in SQL from the columns already on the
+    row, so we never need to read the job back to maintain them. The timestamp,
+    status, and resources (nnodes, ncores, ngpus) at alloc can be literal
+    values or bind parameters (for executemany).
+    """
+    values = {TIMING_EVENTS[event_type]: timestamp, "last_updated": timestamp}
+    if event_type in STATE_TRANSITIONS:
+        values["state"] = STATE_TRANSITIONS[event_type]
+
+    # Wait time is from submit until resources are allocated
+    if event_type == "alloc":
+        values["wait_seconds"] = case(
+            (JobModel.submit_time > 0, timestamp - JobModel.submit_time), else_=None
+        )
+        for field, value in zip(RESOURCE_FIELDS, resources or ()):
+            values[field] = func.coalesce(value, getattr(JobModel, field))
+
+    # Run time is from shell start until the shells exit
+    elif event_type == "finish":
+        values["run_seconds"] = case(
+            (JobModel.start_time.is_not(None), timestamp - JobModel.start_time), else_=None
+        )
+        if status is not None:
+            values["exit_code"] = func.coalesce(status, JobModel.exit_code)
+    return values
+
+
+def apply_event(
+    job: Optional[JobRecord],
+    cluster: str,
+    job_id: int,
+    event_type: str,
+    data: Dict[str, Any],
+    timestamp: float,
+    resources: Optional[Tuple[int, int, int]] = None,
+) -> Optional[JobRecord]:
+    """
+    Apply an event to an in-memory job snapshot, with the same rules as the SQL
+    write paths. Returns the (possibly new) record, or None if there is no job.
+    Like the SQL paths, an event older than the snapshot (a replay) is ignored.
+    """
+    if job is not None and timestamp < job.last_updated:
+        return job
+
+    if event_type == "submit":
+        if job is None:
+            user = data.get("userid")
+            return JobRecord(
+                job_id=job_id,
+                cluster=cluster,
+                state=SUBMIT_STATE,
+                # The SQL backends store this in a string column
+                user=str(user) if user is not None else None,
+                workdir=data.get("cwd", ""),
+                submit_time=timestamp,
+                last_updated=timestamp,
+            )
+        job.state = SUBMIT_STATE
+        job.last_updated = timestamp
+        return job
+
+    if job is None:
+        return None
+
+    if event_type in TIMING_EVENTS:
+        setattr(job, TIMING_EVENTS[event_type], timestamp)
+        job.last_updated = timestamp
+        job.state = STATE_TRANSITIONS.get(event_type, job.state)
+        if event_type == "alloc":
+            job.wait_seconds = timestamp - job.submit_time if job.submit_time > 0 else None
+            if resources is not None:
+                job.nnodes, job.ncores, job.ngpus = resources
+        elif event_type == "finish":
+            job.run_seconds = timestamp - job.start_time if job.start_time is not None else None
+            if data.get("status") is not None:
+                job.exit_code = data["status"]
+
+    elif event_state(event_type, data):
+        job.state = event_state(event_type, data)
+        job.last_updated = timestamp
+        if event_type == "state" and job.state == "INACTIVE" and data.get("status") is not None:
+            job.exit_code = data["status"]
+    return job
+
+
+def account_usage(usage: Optional[UsageRecord], job: JobRecord) -> Optional[UsageRecord]:
+    """
+    Add a finished job to its user's usage, with the same sums as the SQL paths.
+    A job without a run time (e.g., canceled before it started) adds nothing.
+    """
+    if job.run_seconds is None:
+        return usage
+    if usage is None:
+        usage = UsageRecord(cluster=job.cluster, user=job.user or "")
+    run = job.run_seconds
+    usage.jobs += 1
+    usage.run_seconds += run
+    usage.node_seconds += run * (job.nnodes or 0)
+    usage.core_seconds += run * (job.ncores or 0)
+    usage.gpu_seconds += run * (job.ngpus or 0)
+    usage.last_updated = max(usage.last_updated, job.finish_time or 0.0)
+    return usage
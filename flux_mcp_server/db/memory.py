@@ -0,0 +1,434 @@
+import asyncio
+import heapq
+import logging
+import os
+import pickle
+import sys
+from array import array
+from collections import Counter, deque
+from dataclasses import asdict, replace
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from flux_mcp_server.db.interface import DatabaseBackend
+from flux_mcp_server.db.lifecycle import account_usage, apply_event, event_resources, parse_event
+from flux_mcp_server.db.models import (
+    ALL_USERS,
+    EventRecord,
+    JobRecord,
+    ResourceRecord,
+    UsageRecord,
+    export_key,
+    job_order_key,
+    job_tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump this if the snapshot layout changes
+SNAPSHOT_VERSION = 7
+
+# Resource snapshots we keep per cluster (a day at the default 30s poll is 2880)
+RESOURCE_HISTORY = 10000
+
+
+class EventLog:
+    """
+    The events for one job, stored by column. Timestamps and sequence numbers
+    live in packed arrays and event names are interned, so a long history is
+    cheap to hold.
+    """
+
+    __slots__ = ("timestamps", "seqs", "types", "payloads", "keys")
+
+    def __init__(self, timestamps=None, seqs=None, types=None, payloads=None, keys=None):
+        self.timestamps = timestamps if timestamps is not None else array("d")
+        self.seqs = seqs if seqs is not None else array("q")
+        self.types = types if types is not None else []
+        self.payloads = payloads if payloads is not None else []
+
+        # Natural keys (event_type, timestamp, seq) we have, to ignore replays
+        self.keys = keys if keys is not None else set()
+
+    def append(self, timestamp: float, event_type: str, payload: Dict[str, Any], seq: int = 0):
+        """
+        Append an event, returning False if we already have it.
+        """
+        key = (event_type, timestamp, seq)
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        self.timestamps.append(timestamp)
+        self.seqs.append(seq)
+        self.types.append(sys.intern(event_type))
+        self.payloads.append(payload)
+        return True
+
+    def copy(self):
+        return EventLog(
+            array("d", self.timestamps),
+            array("q", self.seqs),
+            list(self.types),
+            list(self.payloads),
+            set(self.keys),
+        )
+
+    def rows(self, since_seq: Optional[int] = None) -> List[tuple]:
+        """
+        Rows in EventRecord field order and eventlog (seq, then timestamp) order.
+        """
+        rows = zip(self.timestamps, self.types, self.payloads, self.seqs)
+        if since_seq is not None:
+            rows = (row for row in rows if row[3] > since_seq)
+        return sorted(rows, key=lambda row: (row[3], row[0]))
+
+
+class MemoryBackend(DatabaseBackend):
+    """
+    A database backend that keeps everything in process memory.
+
+    This is intended for ephemeral deployments (a server per allocation, CI, tests)
+    where we don't want a SQL engine at all. Jobs are held in a dict keyed by
+    (cluster, job_id) and events in per-job column arrays. If a snapshot path is
+    given, we load it on initialize and write it back periodically (and on close)
+    so a restart comes back warm.
+
+    Snapshots are incremental: we note the keys that changed, and only those are
+    copied into the saved state on the event loop before it is pickled in a thread.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, snapshot_interval: float = 30.0):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._jobs: Dict[Tuple[str, int], JobRecord] = {}
+        self._events: Dict[Tuple[str, int], EventLog] = {}
+
+        # Usage per (cluster, user), and the jobs already counted in it
+        self._usage: Dict[Tuple[str, str], UsageRecord] = {}
+        self._accounted = set()
+
+        # Resource snapshots per cluster, oldest first
+        self._resources: Dict[str, deque] = {}
+        self._task = None
+
+        # The state as of the last snapshot (what we pickle), and what changed since
+        self._saved = empty_state()
+        self._changed_jobs = set()
+        self._changed_usage = set()
+        self._changed_resources = set()
+        self._unwritten = False
+        self._writing = None
+
+    async def initialize(self):
+        if not self.snapshot_path:
+            return
+        if os.path.exists(self.snapshot_path):
+            await asyncio.to_thread(self._load, self.snapshot_path)
+        self._task = asyncio.create_task(self._snapshot_loop())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self.snapshot_path and self.dirty:
+            await self.snapshot()
+
+    @property
+    def dirty(self) -> bool:
+        """
+        True if there are changes that aren't in the snapshot file yet.
+        """
+        return bool(
+            self._changed_jobs or self._changed_usage or self._changed_resources or self._unwritten
+        )
+
+    async def record_event(self, cluster: str, event: Dict[str, Any]):
+        """
+        Append the event and update the job snapshot, all in memory.
+        """
+        job_id, event_type, data, timestamp, seq = parse_event(event)
+        key = (cluster, job_id)
+
+        log = self._events.get(key)
+        if log is None:
+            log = self._events[key] = EventLog()
+        if not log.append(timestamp, event_type, data, seq):
+            return
+
+        resources = event_resources(event_type, event)
+        job = apply_event(
+            self._jobs.get(key), cluster, job_id, event_type, data, timestamp, resources
+        )
+        if job is not None:
+            self._jobs[key] = job
+            if event_type == "finish":
+                self._account(key, job)
+        self._changed_jobs.add(key)
+
+    def _account(self, key: Tuple[str, int], job: JobRecord):
+        if key in self._accounted or job.run_seconds is None:
+            return
+        for user in [job.user or "", ALL_USERS]:
+            usage = account_usage(self._usage.get((job.cluster, user)), job)
+            usage.user = user
+            self._usage[(job.cluster, user)] = usage
+            self._changed_usage.add((job.cluster, user))
+        self._accounted.add(key)
+
+    async def get_job(self, cluster: str, job_id: int) -> Optional[JobRecord]:
+        # Hand out copies, so callers can't change our snapshot under us
+        job = self._jobs.get((cluster, job_id))
+        return replace(job) if job is not None else None
+
+    async def get_event_history(
+        self, cluster: str, job_id: int, since_seq: Optional[int] = None, raw: bool = False
+    ) -> List[EventRecord]:
+        log = self._events.get((cluster, job_id))
+        if log is None:
+            return []
+        rows = log.rows(since_seq)
+        if raw:
+            return rows
+        return [EventRecord(*row) for row in rows]
+
+    async def search_jobs(
+        self,
+        cluster: str = None,
+        state: str = None,
+        limit: int = 10,
+        raw: bool = False,
+        user: str = None,
+        active: Optional[bool] = None,
+    ) -> List[JobRecord]:
+        jobs = filter_jobs(self._jobs.values(), cluster, state, user, active)
+
+        # Newest first, like the SQL backends
+        if limit is None:
+            found = sorted(jobs, key=job_order_key(), reverse=True)
+        else:
+            found = heapq.nlargest(limit, jobs, key=job_order_key())
+        if raw:
+            return [job_tuple(job) for job in found]
+        return [replace(job) for job in found]
+
+    async def count_active_jobs(self, cluster: str = None) -> Dict[str, int]:
+        return dict(
+            Counter(job.state for job in filter_jobs(self._jobs.values(), cluster, active=True))
+        )
+
+    async def get_job_states(self, cluster: str, job_ids: List[int]) -> Dict[int, str]:
+        jobs = ((job_id, self._jobs.get((cluster, job_id))) for job_id in job_ids)
+        return {job_id: job.state for job_id, job in jobs if job is not None}
+
+    async def get_usage(self, cluster: str = None, user: str = None) -> List[UsageRecord]:
+        found = [
+            replace(usage)
+            for (usage_cluster, usage_user), usage in self._usage.items()
+            if usage_user != ALL_USERS
+            and (not cluster or usage_cluster == cluster)
+            and (not user or usage_user == user)
+        ]
+        return sorted(found, key=lambda usage: (-usage.core_seconds, usage.user, usage.cluster))
+
+    async def get_cluster_usage(self, cluster: str = None) -> List[UsageRecord]:
+        if cluster:
+            usage = self._usage.get((cluster, ALL_USERS))
+            return [] if usage is None else [replace(usage)]
+        found = [
+            replace(usage)
+            for (_, usage_user), usage in self._usage.items()
+            if usage_user == ALL_USERS
+        ]
+        return sorted(found, key=lambda usage: (-usage.core_seconds, usage.cluster))
+
+    async def record_resources(self, records: List[ResourceRecord]):
+        for record in records:
+            history = self._resources.get(record.cluster)
+            if history is None:
+                history = self._resources[record.cluster] = deque(maxlen=RESOURCE_HISTORY)
+            history.append(replace(record))
+            self._changed_resources.add(record.cluster)
+
+    async def get_resource_history(
+        self,
+        cluster: str = None,
+        partition: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 100,
+    ) -> List[ResourceRecord]:
+        histories = [self._resources.get(cluster, ())] if cluster else self._resources.values()
+        found = [
+            replace(record)
+            for history in histories
+            for record in history
+            if (not partition or record.partition == partition)
+            and in_range(record.timestamp, since, until)
+        ]
+        found.sort(key=lambda record: (-record.timestamp, record.partition, record.cluster))
+        return found if limit is None else found[:limit]
+
+    async def export_rows(
+        self,
+        table: str,
+        cluster: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: Optional[tuple] = None,
+        chunk_size: int = 1000,
+        state: str = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Export in EXPORT_KEYS order (events in eventlog order within a job).
+        We take the keys up front, so ingest can carry on between chunks.
+        """
+        if state and table != "jobs":
+            raise ValueError("Only jobs can be exported by state")
+        if table == "jobs":
+            rows = self._export_jobs(sorted(self._jobs), cluster, since, until, state)
+        elif table == "events":
+            rows = self._export_events(sorted(self._events), cluster, since, until)
+        else:
+            raise ValueError(f"Unknown table {table}, choose from jobs or events")
+        if after is not None:
+            rows = (row for row in rows if export_key(table, row) > tuple(after))
+        for chunk in chunked(rows, chunk_size):
+            yield chunk
+
+    def _export_jobs(self, keys, cluster, since, until, state=None):
+        for key in keys:
+            job = self._jobs.get(key)
+            if job is None or (cluster and key[0] != cluster) or (state and job.state != state):
+                continue
+            if in_range(job.submit_time, since, until):
+                yield asdict(job)
+
+    def _export_events(self, keys, cluster, since, until):
+        for key in keys:
+            if cluster and key[0] != cluster:
+                continue
+            rows = sorted(self._events[key].rows(), key=lambda row: (row[3], row[0], row[1]))
+            for timestamp, event_type, payload, seq in rows:
+                if in_range(timestamp, since, until):
+                    yield {
+                        "cluster": key[0],
+                        "job_id": key[1],
+                        "seq": seq,
+                        "timestamp": timestamp,
+                        "event_type": event_type,
+                        "payload": payload,
+                    }
+
+    # Snapshots
+
+    async def snapshot(self):
+        """
+        Write a snapshot of everything to the snapshot path.
+
+        We bring the saved state up to date on the event loop (so nothing changes
+        under us), copying only what changed since the last snapshot, and do the
+        pickling and file I/O in a thread.
+        """
+        # Wait out a write still in flight (say its snapshot was canceled), so we
+        # never change the saved state while a thread is pickling it
+        while self._writing is not None and not self._writing.done():
+            await asyncio.wait([self._writing])
+
+        saved = self._saved
+        for key in self._changed_jobs:
+            job = self._jobs.get(key)
+            if job is not None:
+                saved["jobs"][key] = job_tuple(job)
+            saved["events"][key] = self._events[key].copy()
+            if key in self._accounted:
+                saved["accounted"].add(key)
+        for key in self._changed_usage:
+            saved["usage"][key] = replace(self._usage[key])
+        for cluster in self._changed_resources:
+            saved["resources"][cluster] = list(self._resources[cluster])
+        self._changed_jobs.clear()
+        self._changed_usage.clear()
+        self._changed_resources.clear()
+
+        # Shielded, so a canceled snapshot still finishes its write
+        self._unwritten = True
+        self._writing = asyncio.ensure_future(
+            asyncio.to_thread(
+                self._write, self.snapshot_path, {"version": SNAPSHOT_VERSION, **saved}
+            )
+        )
+        await asyncio.shield(self._writing)
+        self._unwritten = False
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if not self.dirty:
+                continue
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logger.error(f"Failed to write memory snapshot: {e}")
+
+    def _write(self, path: str, state: dict):
+        # Write to a temporary file and rename, so a crash never leaves a partial snapshot
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fd:
+            pickle.dump(state, fd, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def _load(self, path: str):
+        with open(path, "rb") as fd:
+            state = pickle.load(fd)
+        if state.get("version") != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring memory snapshot {path} with unknown version.")
+            return
+        # The loaded state is what we've saved, and our live state starts as a copy
+        self._saved = {name: state[name] for name in empty_state()}
+        self._jobs = {key: JobRecord(*row) for key, row in state["jobs"].items()}
+        self._events = {key: log.copy() for key, log in state["events"].items()}
+        self._usage = {key: replace(usage) for key, usage in state["usage"].items()}
+        self._accounted = set(state["accounted"])
+        self._resources = {
+            cluster: deque(history, maxlen=RESOURCE_HISTORY)
+            for cluster, history in state["resources"].items()
+        }
+        logger.info(f"Loaded {len(self._jobs)} jobs from memory snapshot {path}")
+
+
+def empty_state() -> Dict[str, Any]:
+    """
+    The saved state of an empty memory backend, keyed like the live state.
+    """
+    return {"jobs": {}, "events": {}, "usage": {}, "accounted": set(), "resources": {}}
+
+
+def filter_jobs(jobs, cluster=None, state=None, user=None, active=None):
+    """
+    Filter job records the way search_jobs does in SQL.
+    """
+    if cluster:
+        jobs = (job for job in jobs if job.cluster == cluster)
+    if state:
+        jobs = (job for job in jobs if job.state == state)
+    if user:
+        jobs = (job for job in jobs if job.user == user)
+    if active is not None:
+        jobs = (job for job in jobs if (job.state != "INACTIVE") == active)
+    return jobs
+
+
+def in_range(value: float, since: Optional[float] = None, until: Optional[float] = None) -> bool:
+    return (since is None or value >= since) and (until is None or value <= until)
+
+
+def chunked(rows: Iterable, size: int) -> Iterable[list]:
+    """
+    Group rows into lists of (at most) size.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,15 +1,17 @@
-from dataclasses import dataclass
+import operator
+from dataclasses import dataclass, fields
 from typing import Any, Dict, Optional
 
-from sqlalchemy import JSON, Float, Integer, String
+from sqlalchemy import JSON, Float, Index, Integer, String
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 # DTOs are "Public Data Transfer Objects" and they are used by
-# our interfaces and tools
+# our interfaces and tools. They are slotted (no per-instance dict) since
+# listings can build a lot of them.
 
 
-@dataclass
+@dataclass(slots=True)
 class JobRecord:
     """
     Represents a snapshot of a job state.
@@ -25,8 +27,20 @@ class JobRecord:
     submit_time: float = 0.0
     last_updated: float = 0.0
 
+    # Lifecycle timings derived from eventlog timestamps at ingest
+    alloc_time: Optional[float] = None
+    start_time: Optional[float] = None
+    finish_time: Optional[float] = None
+    wait_seconds: Optional[float] = None
+    run_seconds: Optional[float] = None
 
-@dataclass
+    # Resources from R, recorded at alloc
+    nnodes: Optional[int] = None
+    ncores: Optional[int] = None
+    ngpus: Optional[int] = None
+
+
+@dataclass(slots=True)
 class EventRecord:
     """
     Represents a single historical event.
@@ -37,6 +51,52 @@ class EventRecord:
     event_type: str
     payload: Dict[str, Any]
 
+    # Position of the event in the job's eventlog
+    seq: int = 0
+
+
+@dataclass(slots=True)
+class UsageRecord:
+    """
+    Accumulated usage of finished jobs for a user on a cluster (or, with user
+    ALL_USERS, for everyone on it). Returned by get_usage() and get_cluster_usage().
+    """
+
+    cluster: str
+    user: str
+    jobs: int = 0
+    run_seconds: float = 0.0
+    node_seconds: float = 0.0
+    core_seconds: float = 0.0
+    gpu_seconds: float = 0.0
+    last_updated: float = 0.0
+
+
+# The user of a cluster's total usage row (user ids are numbers, so it can't clash)
+ALL_USERS = "*"
+
+
+@dataclass(slots=True)
+class ResourceRecord:
+    """
+    Resource state of one partition of a cluster at a point in time.
+    Returned by get_resource_history().
+    """
+
+    cluster: str
+    partition: str
+    timestamp: float
+    nodes: int = 0
+    cores: int = 0
+    gpus: int = 0
+    free_nodes: int = 0
+    free_cores: int = 0
+    free_gpus: int = 0
+    allocated_nodes: int = 0
+    allocated_cores: int = 0
+    allocated_gpus: int = 0
+    down_nodes: int = 0
+
 
 # Database models for SQLAlchemy ORM
 
@@ -56,9 +116,24 @@ class JobModel(Base):
     user: Mapped[str] = mapped_column(String(255), nullable=True)
     workdir: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     exit_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    submit_time: Mapped[float] = mapped_column(Float, default=0.0)
+    submit_time: Mapped[float] = mapped_column(Float, default=0.0, index=True)
     last_updated: Mapped[float] = mapped_column(Float, default=0.0)
 
+    # Derived lifecycle timings (see db/lifecycle.py)
+    alloc_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    start_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    finish_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True, index=True)
+    wait_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    run_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Resources from R (see db/resources.py)
+    nnodes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ncores: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ngpus: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Set once the finished job is added to the usage table, so it is only counted once
+    accounted: Mapped[int] = mapped_column(Integer, server_default="0")
+
     def to_record(self) -> JobRecord:
         """
         Helper to convert ORM model to public DTO
@@ -72,17 +147,42 @@ class JobModel(Base):
             exit_code=self.exit_code,
             submit_time=self.submit_time,
             last_updated=self.last_updated,
+            alloc_time=self.alloc_time,
+            start_time=self.start_time,
+            finish_time=self.finish_time,
+            wait_seconds=self.wait_seconds,
+            run_seconds=self.run_seconds,
+            nnodes=self.nnodes,
+            ncores=self.ncores,
+            ngpus=self.ngpus,
         )
 
 
 class EventModel(Base):
     __tablename__ = "events"
 
+    # The natural key identifies an event, so replays (restarts, remote retries)
+    # are ignored on insert instead of stored twice.
+    __table_args__ = (
+        Index(
+            "ix_events_natural_key",
+            "cluster",
+            "job_id",
+            "event_type",
+            "timestamp",
+            "seq",
+            unique=True,
+        ),
+        # History deltas for a job (since_seq)
+        Index("ix_events_job_seq", "cluster", "job_id", "seq"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     job_id: Mapped[int] = mapped_column(Integer, index=True)
     cluster: Mapped[str] = mapped_column(String(255), index=True)
     timestamp: Mapped[float] = mapped_column(Float)
     event_type: Mapped[str] = mapped_column(String(50))
+    seq: Mapped[int] = mapped_column(Integer, default=0)
     payload: Mapped[Dict[str, Any]] = mapped_column(JSON)
 
     def to_record(self) -> EventRecord:
@@ -90,5 +190,109 @@ class EventModel(Base):
         Helper to convert ORM model to public DTO
         """
         return EventRecord(
-            timestamp=self.timestamp, event_type=self.event_type, payload=self.payload
+            timestamp=self.timestamp, event_type=self.event_type, payload=self.payload, seq=self.seq
         )
+
+
+class UsageModel(Base):
+    __tablename__ = "usage"
+
+    # One row of running totals per user on a cluster, and one for all of them (ALL_USERS)
+    cluster: Mapped[str] = mapped_column(String(255), primary_key=True)
+    user: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    jobs: Mapped[int] = mapped_column(Integer, default=0)
+    run_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    node_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    core_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    gpu_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    last_updated: Mapped[float] = mapped_column(Float, default=0.0)
+
+    def to_record(self) -> UsageRecord:
+        return UsageRecord(*(getattr(self, f.name) for f in fields(UsageRecord)))
+
+
+class ResourceModel(Base):
+    __tablename__ = "resources"
+    __table_args__ = (Index("ix_resources_cluster_time", "cluster", "timestamp"),)
+
+    # One row per partition per poll (see clusters/snapshots.py)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    cluster: Mapped[str] = mapped_column(String(255))
+    partition: Mapped[str] = mapped_column(String(255))
+    timestamp: Mapped[float] = mapped_column(Float)
+
+    nodes: Mapped[int] = mapped_column(Integer, default=0)
+    cores: Mapped[int] = mapped_column(Integer, default=0)
+    gpus: Mapped[int] = mapped_column(Integer, default=0)
+    free_nodes: Mapped[int] = mapped_column(Integer, default=0)
+    free_cores: Mapped[int] = mapped_column(Integer, default=0)
+    free_gpus: Mapped[int] = mapped_column(Integer, default=0)
+    allocated_nodes: Mapped[int] = mapped_column(Integer, default=0)
+    allocated_cores: Mapped[int] = mapped_column(Integer, default=0)
+    allocated_gpus: Mapped[int] = mapped_column(Integer, default=0)
+    down_nodes: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# Columns to select for each DTO, in field order, so the read path can build
+# records (or return raw tuples) straight from rows: JobRecord(*row)
+JOB_COLUMNS = tuple(JobModel.__table__.c[f.name] for f in fields(JobRecord))
+EVENT_COLUMNS = tuple(EventModel.__table__.c[f.name] for f in fields(EventRecord))
+USAGE_COLUMNS = tuple(UsageModel.__table__.c[f.name] for f in fields(UsageRecord))
+RESOURCE_COLUMNS = tuple(ResourceModel.__table__.c[f.name] for f in fields(ResourceRecord))
+
+# Columns for exports (an exported event also needs to say which job it is for)
+EXPORT_COLUMNS = {
+    "jobs": JOB_COLUMNS,
+    "events": tuple(
+        EventModel.__table__.c[name]
+        for name in ["cluster", "job_id", "seq", "timestamp", "event_type", "payload"]
+    ),
+}
+
+# The order exports come in, and the columns (with their types) of the cursor
+# an export resumes after: the key of the last row received.
+EXPORT_KEYS = {
+    "jobs": (("cluster", str), ("job_id", int)),
+    "events": (
+        ("cluster", str),
+        ("job_id", int),
+        ("seq", int),
+        ("timestamp", float),
+        ("event_type", str),
+    ),
+}
+
+
+def export_key(table: str, row: Dict[str, Any]) -> tuple:
+    return tuple(row[name] for name, _ in EXPORT_KEYS[table])
+
+
+def parse_export_key(table: str, text: str) -> tuple:
+    """
+    An export key from its fields joined by commas, e.g. "<cluster>,<job_id>" for jobs.
+    We split from the right, so a cluster name can have commas. Raises ValueError.
+    """
+    fields = EXPORT_KEYS[table]
+    values = text.rsplit(",", len(fields) - 1)
+    if len(values) != len(fields):
+        raise ValueError(f"the key for {table} is {','.join(name for name, _ in fields)}")
+    return tuple(kind(value.strip()) for (_, kind), value in zip(fields, values))
+
+
+def job_order_key(raw: bool = False):
+    """
+    Key for the order search_jobs returns (newest submit first, with reverse=True),
+    for records or for raw tuples.
+    """
+    if raw:
+        names = [c.name for c in JOB_COLUMNS]
+        return operator.itemgetter(names.index("submit_time"), names.index("job_id"))
+    return operator.attrgetter("submit_time", "job_id")
+
+
+def job_tuple(job: JobRecord) -> tuple:
+    """
+    A job as a tuple in JobRecord field order (what raw=True returns).
+    """
+    return tuple(getattr(job, c.name) for c in JOB_COLUMNS)
@@ -0,0 +1,173 @@
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Placeholder lists (expanding IN, multi-row VALUES) collapse to one shape
+PLACEHOLDER_LIST = re.compile(r"\(\s*(\?|%s|\$\d+|:\w+)(\s*,\s*(\?|%s|\$\d+|:\w+))+\s*\)")
+
+# We only ask for plans of statements the database can explain
+EXPLAINABLE = {"select", "insert", "update", "delete", "with"}
+
+
+@dataclass(slots=True)
+class QueryStats:
+    shape: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    rows: int = 0
+    slow: int = 0
+    plan: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "shape": self.shape,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "rows": self.rows,
+            "slow": self.slow,
+            "plan": self.plan,
+        }
+
+
+def query_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in parameters group together.
+    """
+    return PLACEHOLDER_LIST.sub("(...)", " ".join(statement.split()))
+
+
+def explain_prefix(dialect: str) -> str:
+    return "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+
+
+def format_plan(rows: List[tuple], dialect: str) -> str:
+    # sqlite gives (id, parent, notused, detail), postgres one line per row
+    if dialect == "sqlite":
+        return "\n".join(str(row[-1]) for row in rows)
+    if dialect == "postgresql":
+        return "\n".join(str(row[0]) for row in rows)
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+class QueryProfiler:
+    """
+    Aggregate statement timings by shape, and capture a query plan for slow ones.
+
+    Statements are grouped by their text with whitespace and placeholder lists
+    collapsed, and for each shape we keep a count, total and max duration, and
+    rows affected (what the cursor reports, so writes). The first time a shape
+    runs over the threshold (and again when it sets a new max) we run EXPLAIN
+    on the same connection with the same parameters and keep the plan, and log
+    a warning. Shapes are bounded: past max_shapes, new shapes are dropped.
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, max_shapes: int = 1000):
+        self.threshold = threshold_ms / 1000
+        self.max_shapes = max_shapes
+        self.stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine):
+        """
+        Listen to cursor execute events on an engine (or an AsyncEngine's sync_engine).
+        """
+        engine = getattr(engine, "sync_engine", engine)
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _error(self, context):
+        # A failed statement never gets to _after
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        dialect = conn.dialect.name
+
+        # Don't run another statement on a connection that is streaming results
+        explain = None
+        if not context or not context.execution_options.get("stream_results"):
+
+            def explain():
+                params = parameters[0] if executemany and parameters else parameters
+                raw = conn.connection.cursor()
+                try:
+                    raw.execute(explain_prefix(dialect) + statement, params)
+                    return format_plan(raw.fetchall(), dialect)
+                finally:
+                    raw.close()
+
+        self.record(statement, duration, cursor.rowcount, explain)
+
+    def record(
+        self,
+        statement: str,
+        duration: float,
+        rows: int = -1,
+        explain: Optional[Callable[[], str]] = None,
+    ):
+        """
+        Record one execution. explain is called (at most) when the statement was slow.
+        """
+        shape = query_shape(statement)
+        with self._lock:
+            stats = self.stats.get(shape)
+            if stats is None:
+                if len(self.stats) >= self.max_shapes:
+                    return
+                stats = self.stats[shape] = QueryStats(shape)
+            new_max = duration > stats.max
+            stats.count += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            if rows > 0:
+                stats.rows += rows
+            if duration < self.threshold:
+                return
+            stats.slow += 1
+
+        if not new_max:
+            return
+        plan = None
+        if explain is not None and shape.split(" ", 1)[0].lower() in EXPLAINABLE:
+            try:
+                plan = explain()
+            except Exception as e:
+                logger.debug(f"Could not capture query plan: {e}")
+        if plan is not None:
+            stats.plan = plan
+        logger.warning(f"Slow query ({duration * 1000:.1f} ms): {shape}\n{plan or ''}".rstrip())
+
+    def top(self, limit: int = 10, order: str = "total") -> List[Dict[str, Any]]:
+        """
+        The most expensive shapes, by total (default), max, or mean time.
+        """
+        keys = {
+            "total": lambda s: s.total,
+            "max": lambda s: s.max,
+            "mean": lambda s: s.total / s.count,
+        }
+        if order not in keys:
+            raise ValueError(f"Unknown order {order}, choose from {', '.join(keys)}")
+        with self._lock:
+            stats = sorted(self.stats.values(), key=keys[order], reverse=True)[:limit]
+            return [s.to_dict() for s in stats]
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteReplica:
+    """
+    A read-only copy of a sqlite database, refreshed with the online backup API.
+
+    Long reads against the primary (even in WAL mode) hold snapshots that stall
+    checkpoints, so the WAL grows while ingest keeps writing. Here readers get
+    their own file instead: every interval (if the primary changed) we back it
+    up to a temporary file and rename that over the replica. The copy is never
+    modified in place, so readers open it immutable (no locks at all), and a
+    reader that started on the old file finishes on it. Reads are at most one
+    interval (plus the time to copy) stale.
+    """
+
+    def __init__(self, path: str, interval: float = 2.0):
+        self.path = path
+        self.interval = interval
+        self.replica_path = f"{path}.replica"
+        self._source = None
+        self._version = None
+        self._task = None
+
+    @property
+    def url(self) -> str:
+        return f"sqlite+aiosqlite:///file:{self.replica_path}?mode=ro&immutable=1&uri=true"
+
+    async def start(self):
+        # Readers need the file to exist before we serve anything
+        await asyncio.to_thread(self.refresh)
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def refresh(self) -> bool:
+        """
+        Copy the primary to the replica if it changed since the last copy.
+        """
+        if self._source is None:
+            self._source = sqlite3.connect(self.path, check_same_thread=False)
+
+        # data_version changes when any other connection commits to the primary
+        version = self._source.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._version and os.path.exists(self.replica_path):
+            return False
+
+        tmp = f"{self.replica_path}.tmp"
+        dest = sqlite3.connect(tmp)
+        try:
+            self._source.backup(dest)
+
+            # The copy carries the primary's WAL flag, which a read-only open can't use
+            dest.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dest.close()
+        os.replace(tmp, self.replica_path)
+        self._version = version
+        return True
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Failed to refresh sqlite replica {self.replica_path}: {e}")
@@ -0,0 +1,53 @@
+import json
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+# What we count in an R: nodes, cores, and gpus
+RESOURCE_FIELDS = ("nnodes", "ncores", "ngpus")
+
+
+def idset_count(idset: str) -> int:
+    """
+    Count the ids in an RFC 22 idset string, e.g. "0-3,7" is 5.
+    """
+    count = 0
+    for part in (idset or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            count += int(end) - int(start) + 1
+        else:
+            count += 1
+    return count
+
+
+@lru_cache(maxsize=4096)
+def _decode_r_lite(r_lite: str) -> Tuple[int, int, int]:
+    nodes = cores = gpus = 0
+    for entry in json.loads(r_lite):
+        ranks = idset_count(entry.get("rank", ""))
+        children = entry.get("children", {})
+        nodes += ranks
+        cores += ranks * idset_count(children.get("core", ""))
+        gpus += ranks * idset_count(children.get("gpu", ""))
+    return nodes, cores, gpus
+
+
+def decode_resources(R: Any) -> Optional[Tuple[int, int, int]]:
+    """
+    Decode an R (RFC 20, a dict or JSON string) into (nnodes, ncores, ngpus).
+
+    Only R_lite matters for the counts. Jobs with the same shape of allocation
+    share R_lite (unlike starttime and expiration), so we cache on its canonical
+    JSON and most jobs skip the idset parsing.
+    """
+    if not R:
+        return None
+    if isinstance(R, str):
+        R = json.loads(R)
+    r_lite = R.get("execution", {}).get("R_lite")
+    if not r_lite:
+        return None
+    return _decode_r_lite(json.dumps(r_lite, sort_keys=True, separators=(",", ":")))
@@ -0,0 +1,242 @@
+import asyncio
+import glob
+import heapq
+import os
+import re
+from collections import Counter
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from flux_mcp_server.db.interface import DatabaseBackend
+from flux_mcp_server.db.models import (
+    EventRecord,
+    JobRecord,
+    ResourceRecord,
+    UsageRecord,
+    job_order_key,
+)
+from flux_mcp_server.db.profiler import QueryProfiler
+from flux_mcp_server.db.views import SQLAlchemyBackend
+
+
+def shard_name(cluster: str) -> str:
+    """
+    The file stem for a cluster's shard (cluster names can have any characters).
+    """
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", cluster)
+
+
+class ShardedSqliteBackend(DatabaseBackend):
+    """
+    A sqlite backend with one database file (and one writer) per cluster.
+
+    With a single sqlite file, a busy cluster holds the write lock that every
+    other cluster needs. Here each cluster writes to <directory>/<cluster>.db
+    through its own SQLAlchemyBackend, so ingest scales with the number of
+    clusters. Reads that name a cluster go straight to its shard, and searches
+    across clusters fan out to every shard concurrently and merge the results.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sqlite_writer: bool = True,
+        read_replica: Optional[float] = None,
+        slow_query_ms: float = 100.0,
+    ):
+        self.directory = directory
+        self.sqlite_writer = sqlite_writer
+        self.read_replica = read_replica
+
+        # Shards share one profiler, since they run the same query shapes
+        self.profiler = QueryProfiler(slow_query_ms)
+        self._shards: Dict[str, SQLAlchemyBackend] = {}
+        self._lock = asyncio.Lock()
+
+    async def initialize(self):
+        # Open shards for clusters we already have data for, so searches see them
+        os.makedirs(self.directory, exist_ok=True)
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.db"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            await self._open(name)
+
+    async def close(self):
+        shards = list(self._shards.values())
+        self._shards = {}
+        await asyncio.gather(*(shard.close() for shard in shards))
+
+    async def _open(self, name: str) -> SQLAlchemyBackend:
+        async with self._lock:
+            shard = self._shards.get(name)
+            if shard is None:
+                path = os.path.join(self.directory, f"{name}.db")
+                shard = SQLAlchemyBackend(
+                    f"sqlite+aiosqlite:///{path}",
+                    sqlite_writer=self.sqlite_writer,
+                    read_replica=self.read_replica,
+                    profiler=self.profiler,
+                )
+                await shard.initialize()
+                self._shards[name] = shard
+            return shard
+
+    async def get_shard(self, cluster: str, create: bool = False) -> Optional[SQLAlchemyBackend]:
+        """
+        Get the shard for a cluster, creating it on first write.
+        """
+        name = shard_name(cluster)
+        shard = self._shards.get(name)
+        if shard is None and create:
+            shard = await self._open(name)
+        return shard
+
+    async def record_event(self, cluster: str, event: Dict[str, Any]):
+        shard = await self.get_shard(cluster, create=True)
+        await shard.record_event(cluster, event)
+
+    async def record_events(self, cluster: str, events: List[Dict[str, Any]]):
+        shard = await self.get_shard(cluster, create=True)
+        await shard.record_events(cluster, events)
+
+    async def get_job(self, cluster: str, job_id: int) -> Optional[JobRecord]:
+        shard = await self.get_shard(cluster)
+        if shard is None:
+            return None
+        return await shard.get_job(cluster, job_id)
+
+    async def get_event_history(
+        self, cluster: str, job_id: int, since_seq: Optional[int] = None, raw: bool = False
+    ) -> List[EventRecord]:
+        shard = await self.get_shard(cluster)
+        if shard is None:
+            return []
+        return await shard.get_event_history(cluster, job_id, since_seq=since_seq, raw=raw)
+
+    async def search_jobs(
+        self,
+        cluster: str = None,
+        state: str = None,
+        limit: int = 10,
+        raw: bool = False,
+        user: str = None,
+        active: Optional[bool] = None,
+    ) -> List[JobRecord]:
+        """
+        Search one shard, or all of them concurrently and merge (newest first).
+        """
+        filters = {"state": state, "limit": limit, "raw": raw, "user": user, "active": active}
+        if cluster:
+            shard = await self.get_shard(cluster)
+            if shard is None:
+                return []
+            return await shard.search_jobs(cluster=cluster, **filters)
+
+        results = await asyncio.gather(
+            *(shard.search_jobs(**filters) for shard in list(self._shards.values()))
+        )
+        merged = heapq.merge(*results, key=job_order_key(raw), reverse=True)
+        return list(merged if limit is None else islice(merged, limit))
+
+    async def count_active_jobs(self, cluster: str = None) -> Dict[str, int]:
+        if cluster:
+            shard = await self.get_shard(cluster)
+            return {} if shard is None else await shard.count_active_jobs(cluster)
+        results = await asyncio.gather(
+            *(shard.count_active_jobs() for shard in list(self._shards.values()))
+        )
+        return dict(sum((Counter(counts) for counts in results), Counter()))
+
+    async def get_job_states(self, cluster: str, job_ids: List[int]) -> Dict[int, str]:
+        shard = await self.get_shard(cluster)
+        if shard is None:
+            return {}
+        return await shard.get_job_states(cluster, job_ids)
+
+    async def export_rows(
+        self,
+        table: str,
+        cluster: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: Optional[tuple] = None,
+        chunk_size: int = 1000,
+        state: str = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Export one shard, or every shard one after the other (in shard name order).
+        """
+        filters = {"since": since, "until": until, "chunk_size": chunk_size, "state": state}
+        if cluster:
+            shard = await self.get_shard(cluster)
+            if shard is None:
+                return
+            async for chunk in shard.export_rows(table, cluster, after=after, **filters):
+                yield chunk
+            return
+
+        # Resuming, the shards before the last row's were already sent, and its own
+        # carries on after that row
+        resume = None if after is None else shard_name(after[0])
+        for name in sorted(self._shards):
+            if resume is not None and name < resume:
+                continue
+            shard_after = after if name == resume else None
+            async for chunk in self._shards[name].export_rows(table, after=shard_after, **filters):
+                yield chunk
+
+    async def get_usage(self, cluster: str = None, user: str = None) -> List[UsageRecord]:
+        """
+        Usage from one shard, or every shard (a user's usage is per cluster, so we concatenate).
+        """
+        if cluster:
+            shard = await self.get_shard(cluster)
+            return [] if shard is None else await shard.get_usage(cluster, user)
+        results = await asyncio.gather(
+            *(shard.get_usage(user=user) for shard in list(self._shards.values()))
+        )
+        usage = [record for result in results for record in result]
+        return sorted(usage, key=lambda record: (-record.core_seconds, record.user, record.cluster))
+
+    async def get_cluster_usage(self, cluster: str = None) -> List[UsageRecord]:
+        if cluster:
+            shard = await self.get_shard(cluster)
+            return [] if shard is None else await shard.get_cluster_usage(cluster)
+        results = await asyncio.gather(
+            *(shard.get_cluster_usage() for shard in list(self._shards.values()))
+        )
+        usage = [record for result in results for record in result]
+        return sorted(usage, key=lambda record: (-record.core_seconds, record.cluster))
+
+    async def record_resources(self, records: List[ResourceRecord]):
+        by_cluster = {}
+        for record in records:
+            by_cluster.setdefault(record.cluster, []).append(record)
+        for cluster, group in by_cluster.items():
+            shard = await self.get_shard(cluster, create=True)
+            await shard.record_resources(group)
+
+    async def get_resource_history(
+        self,
+        cluster: str = None,
+        partition: str = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 100,
+    ) -> List[ResourceRecord]:
+        """
+        History from one shard, or every shard merged (newest first).
+        """
+        filters = {"partition": partition, "since": since, "until": until, "limit": limit}
+        if cluster:
+            shard = await self.get_shard(cluster)
+            return [] if shard is None else await shard.get_resource_history(cluster, **filters)
+        results = await asyncio.gather(
+            *(shard.get_resource_history(**filters) for shard in list(self._shards.values()))
+        )
+        merged = heapq.merge(
+            *results, key=lambda record: (-record.timestamp, record.partition, record.cluster)
+        )
+        return list(merged if limit is None else islice(merged, limit))
+
+    def get_query_stats(self, limit: int = 10, order: str = "total") -> List[Dict[str, Any]]:
+        return self.profiler.top(limit, order)
@@ -0,0 +1,265 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, func, literal, literal_column, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from flux_mcp_server.db.lifecycle import (
+    SUBMIT_STATE,
+    TIMING_EVENTS,
+    event_resources,
+    event_state,
+    parse_event,
+    timing_values,
+)
+from flux_mcp_server.db.models import ALL_USERS, EventModel, JobModel, UsageModel
+from flux_mcp_server.db.resources import RESOURCE_FIELDS
+
+# These are the dialects where we have a native upsert for the submit event.
+# Anything else goes through the ORM path in the backend.
+UPSERT_DIALECTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+    "mysql": mysql.insert,
+    "mariadb": mysql.insert,
+}
+
+jobs = JobModel.__table__
+events = EventModel.__table__
+usage = UsageModel.__table__
+
+# Usage columns we add to (the rest of the row is the key and last_updated)
+USAGE_SUMS = ["jobs", "run_seconds", "node_seconds", "core_seconds", "gpu_seconds"]
+
+
+def _job_where():
+    """
+    Every UPDATE targets one job by primary key. Bind names cannot collide
+    with column names in an executemany, hence the prefix. We never apply
+    an event older than the snapshot, so a replayed event is a no-op.
+    """
+    return and_(
+        jobs.c.job_id == bindparam("b_job_id"),
+        jobs.c.cluster == bindparam("b_cluster"),
+        jobs.c.last_updated <= bindparam("b_t"),
+    )
+
+
+def _unaccounted():
+    """
+    A finished job (it has a run time) that isn't in the usage table yet.
+    """
+    return and_(
+        jobs.c.job_id == bindparam("b_job_id"),
+        jobs.c.cluster == bindparam("b_cluster"),
+        func.coalesce(jobs.c.accounted, 0) == 0,
+        jobs.c.run_seconds.is_not(None),
+    )
+
+
+class WriteStatements:
+    """
+    Core statements for the ingest write path, built once per dialect.
+
+    Statements are constructed a single time and only ever executed with new
+    parameters, so every execution after the first is a hit in the engine's
+    compiled cache. A batch of events is turned into a plan: an ordered list of
+    (statement, rows) that can each be sent with a single executemany.
+    """
+
+    def __init__(self, dialect: str):
+        self.dialect = dialect
+        self.insert_event = self._insert_event(UPSERT_DIALECTS[dialect])
+        self.upsert_submit = self._upsert_submit(UPSERT_DIALECTS[dialect])
+
+        # One UPDATE per timing event, with the same derived values as the ORM path
+        t = bindparam("b_t")
+        resources = tuple(bindparam(f"b_{field}") for field in RESOURCE_FIELDS)
+        self.update_timing = {
+            event_type: update(jobs)
+            .where(_job_where())
+            .values(**timing_values(event_type, t, bindparam("b_status"), resources))
+            for event_type in TIMING_EVENTS
+        }
+
+        # At finish, add the job to its user's usage and its cluster's, then mark it as counted
+        self.account_usage = self._account_usage(UPSERT_DIALECTS[dialect])
+        self.account_cluster_usage = self._account_usage(UPSERT_DIALECTS[dialect], ALL_USERS)
+        self.mark_accounted = update(jobs).where(_unaccounted()).values(accounted=1)
+
+        self.update_state = (
+            update(jobs)
+            .where(_job_where())
+            .values(
+                state=bindparam("b_state"),
+                last_updated=t,
+                exit_code=func.coalesce(bindparam("b_status"), jobs.c.exit_code),
+            )
+        )
+
+    def _insert_event(self, dialect_insert):
+        """
+        Insert-or-ignore on the natural key, so duplicate deliveries are dropped.
+        """
+        stmt = dialect_insert(events)
+        if self.dialect in ["mysql", "mariadb"]:
+            return stmt.prefix_with("IGNORE")
+        return stmt.on_conflict_do_nothing()
+
+    def _upsert_submit(self, dialect_insert):
+        """
+        A submit creates the job, or (if we have seen it) marks it submitted again,
+        unless the snapshot is already newer than the submit (a replay).
+        """
+        stmt = dialect_insert(jobs)
+        if self.dialect in ["mysql", "mariadb"]:
+            # MySQL has no WHERE here, and assigns in order (so state goes first)
+            newer = jobs.c.last_updated <= stmt.inserted.last_updated
+            return stmt.on_duplicate_key_update(
+                [
+                    ("state", case((newer, stmt.inserted.state), else_=jobs.c.state)),
+                    (
+                        "last_updated",
+                        case((newer, stmt.inserted.last_updated), else_=jobs.c.last_updated),
+                    ),
+                ]
+            )
+        return stmt.on_conflict_do_update(
+            index_elements=[jobs.c.job_id, jobs.c.cluster],
+            set_={"state": stmt.excluded.state, "last_updated": stmt.excluded.last_updated},
+            where=jobs.c.last_updated <= stmt.excluded.last_updated,
+        )
+
+    def _account_usage(self, dialect_insert, user: Optional[str] = None):
+        """
+        Add finished jobs to their user's running totals (or, given a user, to that
+        row, e.g., the cluster's ALL_USERS row). We select from the job row, so the
+        run time and resources are whatever the jobs table has, and only jobs not
+        yet accounted, so a replayed finish is never counted twice.
+        """
+        run = jobs.c.run_seconds
+        source = select(
+            jobs.c.cluster,
+            func.coalesce(jobs.c.user, "") if user is None else literal(user),
+            literal_column("1"),
+            run,
+            run * func.coalesce(jobs.c.nnodes, 0),
+            run * func.coalesce(jobs.c.ncores, 0),
+            run * func.coalesce(jobs.c.ngpus, 0),
+            jobs.c.finish_time,
+        ).where(_unaccounted())
+        names = ["cluster", "user"] + USAGE_SUMS + ["last_updated"]
+        stmt = dialect_insert(usage).from_select(names, source)
+
+        if self.dialect in ["mysql", "mariadb"]:
+            new = stmt.inserted
+        else:
+            new = stmt.excluded
+        values = [(name, usage.c[name] + new[name]) for name in USAGE_SUMS]
+        newer = usage.c.last_updated > new.last_updated
+        values.append(("last_updated", case((newer, usage.c.last_updated), else_=new.last_updated)))
+
+        if self.dialect in ["mysql", "mariadb"]:
+            return stmt.on_duplicate_key_update(values)
+        return stmt.on_conflict_do_update(
+            index_elements=[usage.c.cluster, usage.c.user], set_=dict(values)
+        )
+
+    def plan(self, cluster: str, batch: List[Dict[str, Any]]) -> List[Tuple[Any, List[dict]]]:
+        """
+        Group a batch of events into executemany calls.
+
+        Statements run in lifecycle order (submit before alloc before start...)
+        so within a batch a job row exists before it is updated, and the derived
+        durations see the columns they depend on.
+        """
+        event_rows = []
+        submits = {}
+        timing_rows = {event_type: [] for event_type in TIMING_EVENTS}
+        state_rows = []
+        finished = {}
+
+        for event in batch:
+            job_id, event_type, data, timestamp, seq = parse_event(event)
+            event_rows.append(
+                {
+                    "job_id": job_id,
+                    "cluster": cluster,
+                    "timestamp": timestamp,
+                    "event_type": event_type,
+                    "seq": seq,
+                    "payload": data,
+                }
+            )
+            if event_type == "submit":
+                # A repeated submit in one batch only moves last_updated forward.
+                # Folding them keeps a multi-row upsert from touching a row twice.
+                if job_id in submits:
+                    submits[job_id]["last_updated"] = timestamp
+                    continue
+                submits[job_id] = {
+                    "job_id": job_id,
+                    "cluster": cluster,
+                    "user": data.get("userid"),
+                    "state": SUBMIT_STATE,
+                    "workdir": data.get("cwd", ""),
+                    "submit_time": timestamp,
+                    "last_updated": timestamp,
+                }
+
+            elif event_type in TIMING_EVENTS:
+                row = {
+                    "b_job_id": job_id,
+                    "b_cluster": cluster,
+                    "b_t": timestamp,
+                    "b_status": data.get("status"),
+                }
+                if event_type == "alloc":
+                    resources = event_resources(event_type, event) or (None,) * 3
+                    row.update({f"b_{f}": v for f, v in zip(RESOURCE_FIELDS, resources)})
+                elif event_type == "finish":
+                    # Once per job, since the usage insert runs before any job is marked
+                    finished[job_id] = {"b_job_id": job_id, "b_cluster": cluster}
+                timing_rows[event_type].append(row)
+
+            elif event_state(event_type, data):
+                state_name = event_state(event_type, data)
+                status = None
+                if event_type == "state" and state_name == "INACTIVE":
+                    status = data.get("status")
+                state_rows.append(
+                    {
+                        "b_job_id": job_id,
+                        "b_cluster": cluster,
+                        "b_t": timestamp,
+                        "b_state": state_name,
+                        "b_status": status,
+                    }
+                )
+
+        plan = [(self.insert_event, event_rows)]
+        if submits:
+            plan.append((self.upsert_submit, list(submits.values())))
+        for event_type, rows in timing_rows.items():
+            if rows:
+                plan.append((self.update_timing[event_type], rows))
+        if state_rows:
+            plan.append((self.update_state, state_rows))
+        if finished:
+            rows = list(finished.values())
+            plan += [
+                (self.account_usage, rows),
+                (self.account_cluster_usage, rows),
+                (self.mark_accounted, rows),
+            ]
+        return plan
+
+
+@lru_cache(maxsize=None)
+def get_write_statements(dialect: str) -> Optional[WriteStatements]:
+    """
+    Get the (cached) write statements for a dialect, or None if unsupported.
+    """
+    if dialect not in UPSERT_DIALECTS:
+        return None
+    return WriteStatements(dialect)
@@ -0,0 +1,79 @@
+import logging
+
+from sqlalchemy import delete, func, inspect, select, text, update
+
+from flux_mcp_server.db.lifecycle import LEGACY_STATES
+from flux_mcp_server.db.models import Base, EventModel, JobModel
+
+logger = logging.getLogger(__name__)
+
+# create_all makes missing tables, but it never changes a table that exists.
+# A database from an older server has jobs and events tables without the newer
+# columns and indexes, so on initialize we add what is missing. Everything here
+# checks first, so it is safe (and cheap) to run on every start.
+
+
+def upgrade_schema(conn):
+    """
+    Bring existing tables up to the models: add missing columns (filling their
+    defaults into existing rows) and create missing indexes. A unique index can
+    fail on rows stored before it existed, so those tables are deduplicated first.
+    Jobs in states older servers named differently get Flux's names, so every
+    read (and the active index) sees one name for a state.
+    Run with AsyncConnection.run_sync, after create_all.
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        have = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in have:
+                add_column(conn, table, column)
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in indexes:
+                continue
+            if index.unique and table is EventModel.__table__:
+                drop_duplicate_events(conn, [column.name for column in index.columns])
+            logger.info(f"Upgrading database: creating index {index.name}")
+            index.create(conn)
+
+    jobs = JobModel.__table__
+    for old, new in LEGACY_STATES.items():
+        result = conn.execute(update(jobs).where(jobs.c.state == old).values(state=new))
+        if result.rowcount:
+            logger.info(f"Upgrading database: {result.rowcount} jobs in state {old} are now {new}")
+
+
+def add_column(conn, table, column):
+    """
+    Add a column to an existing table, and set its default on the rows we have.
+    """
+    logger.info(f"Upgrading database: adding column {table.name}.{column.name}")
+    preparer = conn.dialect.identifier_preparer
+    ddl = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)}"
+    ddl += f" {column.type.compile(dialect=conn.dialect)}"
+
+    # A server default fills existing rows as the column is added, a python one we set here
+    server_default = conn.dialect.ddl_compiler(conn.dialect, None).get_column_default_string(column)
+    if server_default is not None:
+        ddl += f" DEFAULT {server_default}"
+    conn.execute(text(ddl))
+    if server_default is None and column.default is not None and column.default.is_scalar:
+        conn.execute(
+            update(table).where(column.is_(None)).values({column.name: column.default.arg})
+        )
+
+
+def drop_duplicate_events(conn, key):
+    """
+    Keep the first copy of each event (by natural key) so the unique index can be built.
+    The ids to keep go through a derived table, since mysql can't delete from a table
+    it selects from directly.
+    """
+    events = EventModel.__table__
+    keep = select(func.min(events.c.id).label("id")).group_by(*(events.c[name] for name in key))
+    keep = keep.subquery()
+    result = conn.execute(delete(events).where(events.c.id.not_in(select(keep.c.id))))
+    if result.rowcount:
+        logger.info(f"Upgrading database: dropped {result.rowcount} duplicate events")
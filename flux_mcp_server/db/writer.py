@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List
+
+from sqlalchemy.dialects import sqlite
+
+from flux_mcp_server.db.profiler import explain_prefix, format_plan
+from flux_mcp_server.db.statements import get_write_statements
+
+logger = logging.getLogger(__name__)
+
+# Columns that SQLAlchemy would serialize for us as JSON
+JSON_COLUMNS = {"payload"}
+
+
+class SqliteWriter:
+    """
+    A dedicated ingest thread for a sqlite database.
+
+    The thread owns a single stdlib sqlite3 connection. Writers enqueue batches
+    of events and get back a future, and the thread drains whatever is waiting
+    into one explicit transaction, with an executemany per statement. The
+    statements are the same Core statements as the SQLAlchemy write path,
+    compiled once to SQL, so both paths write identical rows. Reads still go
+    through aiosqlite, and since sqlite only has one writer anyway we lose
+    nothing by serializing here, but we skip the per-statement hop through
+    aiosqlite's worker thread and back to the event loop.
+    """
+
+    def __init__(self, path: str, max_batch: int = 5000, timeout: float = 30.0, profiler=None):
+        self.path = path
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.profiler = profiler
+        self.statements = get_write_statements("sqlite")
+        self._dialect = sqlite.dialect(paramstyle="named")
+        self._compiled = {}
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+        # Guards accepting work, so nothing is queued after the thread is gone
+        self._lock = threading.Lock()
+        self._running = False
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the thread after it finishes everything already queued.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, cluster: str, events: List[Dict[str, Any]]) -> Future:
+        """
+        Queue a batch of events, returning a future that resolves once committed.
+        """
+        future = Future()
+        with self._lock:
+            if not self._running:
+                raise RuntimeError("The sqlite writer is not running (was it started?)")
+            self._queue.put((cluster, events, future))
+        return future
+
+    async def write(self, cluster: str, events: List[Dict[str, Any]]):
+        await asyncio.wrap_future(self.submit(cluster, events))
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+        )
+        # WAL lets the aiosqlite readers keep going while we write
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _compile(self, stmt, keys):
+        """
+        Compile a statement once per parameter shape. We also keep the default
+        values of any binds SQLAlchemy generated for constants in the statement.
+        """
+        key = (id(stmt), keys)
+        if key not in self._compiled:
+            compiled = stmt.compile(dialect=self._dialect, column_keys=list(keys))
+            defaults = {k: v for k, v in compiled.params.items() if k not in keys}
+            self._compiled[key] = (str(compiled), defaults)
+        return self._compiled[key]
+
+    def _execute(self, cursor, cluster, events):
+        for stmt, rows in self.statements.plan(cluster, events):
+            if not rows:
+                continue
+            keys = tuple(rows[0])
+            sql, defaults = self._compile(stmt, keys)
+            json_keys = JSON_COLUMNS.intersection(keys)
+            if defaults or json_keys:
+                rows = [self._prepare(row, defaults, json_keys) for row in rows]
+            start = time.perf_counter()
+            cursor.executemany(sql, rows)
+            if self.profiler is not None:
+                self._profile(cursor, sql, rows, time.perf_counter() - start)
+
+    def _profile(self, cursor, sql, rows, duration):
+        # Our statements don't go through the engine, so we report them ourselves
+        def explain():
+            plan = cursor.connection.execute(explain_prefix("sqlite") + sql, rows[0])
+            return format_plan(plan.fetchall(), "sqlite")
+
+        self.profiler.record(sql, duration, cursor.rowcount, explain)
+
+    def _prepare(self, row, defaults, json_keys):
+        params = dict(defaults, **row)
+        for key in json_keys:
+            params[key] = json.dumps(params[key])
+        return params
+
+    def _drain(self, first):
+        """
+        Collect the first item plus anything else already waiting, up to max_batch events.
+        """
+        items = [first]
+        count = len(first[1])
+        while count < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            if item is None:
+                break
+            count += len(item[1])
+        return items
+
+    def _commit(self, conn, items):
+        """
+        Write items in one transaction, merging consecutive items for a cluster.
+        """
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cluster, events = None, []
+            for item_cluster, item_events, _ in items:
+                if item_cluster != cluster and events:
+                    self._execute(cursor, cluster, events)
+                    events = []
+                cluster = item_cluster
+                events.extend(item_events)
+            if events:
+                self._execute(cursor, cluster, events)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def _run(self):
+        error = RuntimeError("The sqlite writer stopped")
+        conn = None
+        try:
+            conn = self._connect()
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    break
+                items = self._drain(first)
+                stopping = items[-1] is None
+                if stopping:
+                    items.pop()
+                self._write(conn, items)
+                if stopping:
+                    break
+        except Exception as e:
+            logger.error(f"sqlite writer stopped: {e}")
+            error = e
+        finally:
+            if conn is not None:
+                conn.close()
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception):
+        """
+        Stop taking work, and fail whatever is still queued, so no writer waits forever.
+        """
+        with self._lock:
+            self._running = False
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and not item[2].done():
+                item[2].set_exception(error)
+
+    def _write(self, conn, items):
+        try:
+            self._commit(conn, items)
+            for _, _, future in items:
+                future.set_result(None)
+        except Exception:
+            # Retry one at a time, so one bad batch only fails its own caller
+            for item in items:
+                try:
+                    self._commit(conn, [item])
+                    item[2].set_result(None)
+                except Exception as e:
+                    logger.error(f"sqlite writer failed to write events: {e}")
+                    item[2].set_exception(e)
@@ -3,16 +3,25 @@ import asyncio
 import logging
 import os
 
-from flux_mcp_server.db.sqlite import JobDatabase
-
-from .events.engine import EventsEngine
-from .events.sinks import LocalDbSink, RemoteApiSink
+from flux_mcp_server.db import get_db
+from flux_mcp_server.events.backfill import Backfill
+from flux_mcp_server.events.engine import EventsEngine
+from flux_mcp_server.events.receiver import LocalReceiver, RemoteReceiver
 
 
 def setup_logging():
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
 
+def get_local_db(db_path):
+    """
+    The sqlite database at db_path, via the same configuration as the server.
+    """
+    os.environ["FLUX_MCP_DATABASE_TYPE"] = "sqlite"
+    os.environ["FLUX_MCP_DATABASE_PATH"] = db_path
+    return get_db()
+
+
 async def run_local(args):
     """
     Mode 1: Run alongside the server (or with shared volume).
@@ -20,8 +29,9 @@ async def run_local(args):
     db_path = os.path.abspath(args.db_path)
     logging.info(f"Starting Local EventsEngine. Cluster: {args.cluster}, DB: {db_path}")
 
-    db = JobDatabase(db_path)
-    sink = LocalDbSink(args.cluster, db)
+    db = get_local_db(db_path)
+    await db.initialize()
+    sink = LocalReceiver(args.cluster, db)
     engine = EventsEngine(args.uri, sink)
 
     await engine.start()
@@ -37,7 +47,7 @@ async def run_remote(args):
     """
     logging.info(f"Starting Remote EventsEngine. Target: {args.server_url}")
 
-    sink = RemoteApiSink(args.cluster, args.server_url)
+    sink = RemoteReceiver(args.cluster, args.server_url)
     engine = EventsEngine(args.uri, sink)
 
     await engine.start()
@@ -46,6 +56,31 @@ async def run_remote(args):
     await stop_event.wait()
 
 
+async def run_backfill(args):
+    """
+    Mode 3: Import jobs that finished before we were listening.
+    """
+    db_path = os.path.abspath(args.db_path)
+    logging.info(f"Starting backfill. Cluster: {args.cluster}, DB: {db_path}")
+
+    db = get_local_db(db_path)
+    await db.initialize()
+    backfill = Backfill(
+        db,
+        args.cluster,
+        uri=args.uri,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        since=args.since,
+        include_active=args.include_active,
+        max_jobs=args.max_jobs,
+    )
+    try:
+        await backfill.run()
+    finally:
+        await db.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Flux MCP Events Service")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -62,6 +97,21 @@ def main():
     p_remote.add_argument("--server-url", required=True, help="http://host:port/sse")
     p_remote.add_argument("--uri", default=None)
 
+    # Command: backfill
+    p_backfill = subparsers.add_parser("backfill", help="Import past jobs from job-list")
+    p_backfill.add_argument("--cluster", required=True, help="Name of this cluster")
+    p_backfill.add_argument("--db-path", default="server.db", help="Path to SQLite DB")
+    p_backfill.add_argument("--uri", default=None, help="Optional FLUX_URI")
+    p_backfill.add_argument(
+        "--concurrency", type=int, default=256, help="Eventlog lookups in flight"
+    )
+    p_backfill.add_argument("--batch-size", type=int, default=5000, help="Events per write")
+    p_backfill.add_argument(
+        "--since", type=float, default=0.0, help="Only jobs inactive after this timestamp"
+    )
+    p_backfill.add_argument("--include-active", action="store_true", help="Import active jobs too")
+    p_backfill.add_argument("--max-jobs", type=int, default=0, help="Limit jobs (0 is all)")
+
     args = parser.parse_args()
     setup_logging()
 
@@ -70,6 +120,8 @@ def main():
             asyncio.run(run_local(args))
         elif args.command == "events-remote":
             asyncio.run(run_remote(args))
+        elif args.command == "backfill":
+            asyncio.run(run_backfill(args))
     except KeyboardInterrupt:
         pass
 
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+from flux_mcp_server.db.interface import DatabaseBackend
+
+logger = logging.getLogger(__name__)
+
+# Job ids we ask the database about at once, to skip jobs we already have
+CHECK_SIZE = 500
+
+
+def eventlog_events(job_id: int, eventlog: str, R: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Turn a job's eventlog (one JSON entry per line) into events shaped like the
+    ones the EventsEngine sends. The seq is the entry's position in the eventlog,
+    and R (if the job was allocated) goes on the alloc event, like the journal does.
+    """
+    events = []
+    for seq, line in enumerate(eventlog.splitlines()):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        entry.update({"id": job_id, "type": entry.get("name"), "seq": seq})
+        if R and entry["type"] == "alloc":
+            entry["R"] = R
+        events.append(entry)
+    return events
+
+
+class Backfill:
+    """
+    Import jobs that ran before the server started, from job-list and their eventlogs.
+
+    We list jobs with flux.job.job_list, then fetch each eventlog with a
+    job-info.lookup RPC. The RPCs are pipelined on one handle in a worker
+    thread, with up to `concurrency` in flight, and the events are handed back
+    to the event loop in batches for record_events. Ingest is idempotent, so
+    this is safe to run (or re-run) alongside the live EventsEngine. By default
+    we only import inactive jobs, since active ones are followed live, and we
+    skip jobs the database already has as INACTIVE (asking about the listed ids
+    a chunk at a time, so we never load every job the database has).
+    """
+
+    def __init__(
+        self,
+        db: DatabaseBackend,
+        cluster: str,
+        uri: Optional[str] = None,
+        concurrency: int = 256,
+        batch_size: int = 5000,
+        since: float = 0.0,
+        include_active: bool = False,
+        max_jobs: int = 0,
+    ):
+        self.db = db
+        self.cluster = cluster
+        self.uri = uri
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.since = since
+        self.include_active = include_active
+        self.max_jobs = max_jobs
+        self._cancelled = False
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the backfill, returning counts (and how long it took) when it is done.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        # A small queue, so a slow database pushes back on the RPC thread
+        batches = asyncio.Queue(maxsize=4)
+        fetch = asyncio.create_task(asyncio.to_thread(self._fetch_all, batches, loop))
+
+        events = 0
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                await self.db.record_events(self.cluster, batch)
+                events += len(batch)
+        except BaseException:
+            # Stop the thread (on an error or cancel), and drain so it isn't stuck on the queue
+            self._cancelled = True
+            while await batches.get() is not None:
+                pass
+            await fetch
+            raise
+
+        jobs, failed = await fetch
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Backfilled {jobs} jobs ({events} events, {failed} failed) for {self.cluster} "
+            f"in {elapsed:.1f}s"
+        )
+        return {"jobs": jobs, "events": events, "failed": failed, "seconds": elapsed}
+
+    def _connect(self):
+        # Flux is imported here, so the backfill imports (and is tested) without it
+        import flux
+
+        return flux.Flux(self.uri) if self.uri else flux.Flux()
+
+    def _list_jobs(self, handle) -> List[int]:
+        import flux.constants
+        import flux.job
+
+        states = flux.constants.FLUX_JOB_STATE_INACTIVE
+        if self.include_active:
+            states = 0
+        rpc = flux.job.job_list(
+            handle,
+            max_entries=self.max_jobs,
+            attrs=["t_submit"],
+            userid=flux.constants.FLUX_USERID_UNKNOWN,
+            states=states,
+            since=self.since,
+        )
+        return [job["id"] for job in rpc.get_jobs()]
+
+    def _new_jobs(self, jobids: List[int], loop) -> Iterator[int]:
+        """
+        The listed jobs the database doesn't already have as INACTIVE, checked a chunk at a time.
+        """
+        for i in range(0, len(jobids), CHECK_SIZE):
+            chunk = jobids[i : i + CHECK_SIZE]
+            states = asyncio.run_coroutine_threadsafe(
+                self.db.get_job_states(self.cluster, chunk), loop
+            ).result()
+            for jobid in chunk:
+                if states.get(jobid) != "INACTIVE":
+                    yield jobid
+
+    def _fetch_all(self, batches: asyncio.Queue, loop):
+        """
+        Fetch eventlogs with pipelined RPCs (in a thread) and queue batches of events.
+        """
+        handle = self._connect()
+        jobs = failed = 0
+        try:
+            jobids = self._list_jobs(handle)
+            logger.info(f"Backfill found {len(jobids)} jobs for {self.cluster}")
+
+            def put(item):
+                asyncio.run_coroutine_threadsafe(batches.put(item), loop).result()
+
+            batch = []
+            pending = deque()
+            jobids = self._new_jobs(jobids, loop)
+            while not self._cancelled:
+                # Keep the window full, then wait on the oldest request
+                for jobid in jobids:
+                    payload = {"id": jobid, "keys": ["eventlog", "R"], "flags": 0}
+                    pending.append((jobid, handle.rpc("job-info.lookup", payload)))
+                    if len(pending) >= self.concurrency:
+                        break
+                if not pending:
+                    break
+                jobid, future = pending.popleft()
+                try:
+                    try:
+                        result = future.get()
+                    except OSError:
+                        # A job that never got resources has no R (so the lookup fails)
+                        payload = {"id": jobid, "keys": ["eventlog"], "flags": 0}
+                        result = handle.rpc("job-info.lookup", payload).get()
+                    batch.extend(eventlog_events(jobid, result["eventlog"], result.get("R")))
+                    jobs += 1
+                except Exception as e:
+                    logger.warning(f"Could not fetch eventlog for job {jobid}: {e}")
+                    failed += 1
+                if len(batch) >= self.batch_size:
+                    put(batch)
+                    batch = []
+            if batch and not self._cancelled:
+                put(batch)
+        finally:
+            asyncio.run_coroutine_threadsafe(batches.put(None), loop).result()
+            del handle
+        return jobs, failed
@@ -7,6 +7,7 @@ import flux
 import flux.job
 
 from flux_mcp_server.events.receiver import EventReceiver
+from flux_mcp_server.events.sequence import EventSequencer
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,10 @@ class EventsEngine:
         self._running = False
         self._loop = None
         self._task = None
+        self._handle = None
+
+        # Numbers events by their place in the job's eventlog
+        self._sequencer = EventSequencer(self._lookup_eventlog)
 
     async def start(self):
         self._running = True
@@ -42,10 +47,20 @@ class EventsEngine:
         data = dict(event)
         data["type"] = event.name
         data["id"] = event.jobid
+        data["seq"] = self._sequencer.next(event)
         data["R"] = getattr(event, "R", None)
         data["jobspec"] = getattr(event, "jobspec", None)
         return data
 
+    def _lookup_eventlog(self, job_id: int, timeout: float) -> str:
+        """
+        Read a job's eventlog, waiting at most timeout seconds (we are on the journal thread).
+        """
+        payload = {"id": job_id, "keys": ["eventlog"], "flags": 0}
+        future = self._handle.rpc("job-info.lookup", payload)
+        future.wait_for(timeout)
+        return future.get()["eventlog"]
+
     def _handle_async_error(self, future):
         """Callback to log errors from the async side."""
         try:
@@ -60,6 +75,7 @@ class EventsEngine:
                 handle = flux.Flux(self.uri)
             else:
                 handle = flux.Flux()
+            self._handle = handle
 
             consumer = flux.job.JournalConsumer(handle)
             consumer.start()
@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventSequencer:
+    """
+    Numbers journal events by their position in the job's eventlog (submit is 0).
+
+    We use the journal's eventlog_seq if it gives us one, otherwise we count
+    events per job. For a job we first see partway through (e.g., it was
+    running when the server restarted) we find the event in the job's eventlog,
+    so we carry on with the numbers we (and the backfill) stored before. The
+    eventlog ends with clean, so we stop following the job there.
+
+    lookup(job_id, timeout) returns a job's eventlog text. It runs on the journal
+    thread, so it is bounded by timeout seconds and a job we can't look up is
+    numbered from 0, like before we joined.
+    """
+
+    def __init__(self, lookup: Callable[[int, float], str], timeout: Optional[float] = None):
+        self.lookup = lookup
+        if timeout is None:
+            timeout = float(os.environ.get("FLUX_MCP_EVENTLOG_TIMEOUT", 1.0))
+        self.timeout = timeout
+
+        # Next eventlog position for each job we are following
+        self._seqs: Dict[int, int] = {}
+
+    def next(self, event) -> int:
+        seq = getattr(event, "eventlog_seq", None)
+        if seq is None:
+            if event.name == "submit":
+                seq = 0
+            elif event.jobid in self._seqs:
+                seq = self._seqs[event.jobid]
+            else:
+                seq = self._eventlog_seq(event)
+        if event.name == "clean":
+            self._seqs.pop(event.jobid, None)
+        else:
+            self._seqs[event.jobid] = seq + 1
+        return seq
+
+    def _eventlog_seq(self, event) -> int:
+        """
+        Where an event is in its job's eventlog, for a job we joined partway through.
+        """
+        try:
+            eventlog = self.lookup(event.jobid, self.timeout)
+            entries = [json.loads(line) for line in eventlog.splitlines() if line.strip()]
+        except Exception as e:
+            logger.warning(f"Could not read eventlog to number events of job {event.jobid}: {e}")
+            return 0
+        timestamp = getattr(event, "timestamp", None)
+        for seq, entry in enumerate(entries):
+            if entry.get("name") == event.name and entry.get("timestamp") == timestamp:
+                return seq
+
+        # It should be there (the journal lags the eventlog), but if not it's the newest
+        return len(entries)
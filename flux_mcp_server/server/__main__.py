@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
 import os
 import warnings
 from contextlib import asynccontextmanager
@@ -24,9 +25,15 @@ from mcpserver.cli.manager import get_manager
 from mcpserver.core.config import MCPConfig
 from mcpserver.routes import *
 
+from flux_mcp_server.clusters.registry import get_registry
+from flux_mcp_server.clusters.snapshots import ResourcePoller
 from flux_mcp_server.db import get_db
+from flux_mcp_server.db.archive import get_archive
+from flux_mcp_server.events.backfill import Backfill
 from flux_mcp_server.events.engine import EventsEngine
 from flux_mcp_server.events.receiver import LocalReceiver
+from flux_mcp_server.server.export import router as export_router
+from flux_mcp_server.utils.fileio import read_yaml
 
 
 def get_parser():
@@ -38,17 +45,27 @@ def get_parser():
     # Database
     parser.add_argument(
         "--db-type",
-        default=os.environ.get("FLUX_MCP_DATABASE") or "sqlite",
-        choices=["sqlite", "postgres"],
+        default=os.environ.get("FLUX_MCP_DATABASE_TYPE") or "sqlite",
+        choices=["sqlite", "postgres", "mysql", "mariadb", "memory"],
         help="Database backend",
     )
-    parser.add_argument("--db-path", default="server_state.db", help="Path for SQLite database")
+    parser.add_argument("--db-path", default=None, help="Path for SQLite database")
 
     # Events / Receivers
     parser.add_argument(
         "--no-listener", action="store_true", help="Disable the background event listener"
     )
     parser.add_argument("--flux-uri", default=None, help="FLUX_URI for the local event listener")
+    parser.add_argument(
+        "--cluster",
+        default=os.environ.get("FLUX_MCP_CLUSTER_NAME") or "local",
+        help="Cluster name for the local instance's jobs (listener, backfill, and handle)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Import jobs that finished before the server started (in the background)",
+    )
     return parser
 
 
@@ -69,7 +86,7 @@ async def server_startup(args, db):
     # 2. Start Event Engine
     if not args.no_listener:
         print(f"   🎧 Starting EventsEngine (URI: {args.flux_uri or 'local'})...")
-        sink = LocalReceiver("local", db)
+        sink = LocalReceiver(args.cluster, db)
         engine = EventsEngine(args.flux_uri, sink)
 
         await engine.start()
@@ -77,6 +94,40 @@ async def server_startup(args, db):
     else:
         print("   ⚠️  Background event receiver is disabled.")
 
+    # 3. Export finished jobs to the columnar archive for the analytics tools
+    archive = get_archive()
+    if archive is not None:
+        interval = float(os.environ.get("FLUX_MCP_ARCHIVE_INTERVAL", 3600))
+        print(f"   🗄️  Exporting job archive to {archive.directory} every {interval:.0f}s...")
+        archive.start(db, interval)
+
+    # 4. Import history from before we were listening (safe to overlap with the engine)
+    if args.backfill:
+        print("   📚 Backfilling past jobs from job-list...")
+        backfill = Backfill(db, args.cluster, args.flux_uri)
+        _HOOKS["backfill"] = asyncio.create_task(backfill.run())
+
+    # 5. Connect clusters (local, and any in FLUX_MCP_CLUSTERS) all at once, and keep probing them
+    registry = get_registry()
+    clusters = {}
+    if registry.get_handle(args.cluster) is None:
+        clusters[args.cluster] = {"type": "local", "uri": args.flux_uri}
+    if os.environ.get("FLUX_MCP_CLUSTERS"):
+        clusters.update(read_yaml(os.environ["FLUX_MCP_CLUSTERS"]) or {})
+    print(f"   🔌 Connecting {len(clusters)} cluster(s)...")
+    for name, connected in (await registry.register_many(clusters)).items():
+        if not connected:
+            print(f"   ⚠️  Cluster {name} is not answering, will keep trying in the background.")
+    registry.start_probes()
+
+    # 6. Poll resource status of the clusters
+    interval = float(os.environ.get("FLUX_MCP_RESOURCE_INTERVAL", 30))
+    if interval > 0:
+        print(f"   📊 Polling cluster resources every {interval:.0f}s...")
+        poller = ResourcePoller(db, registry, interval)
+        poller.start()
+        _HOOKS["poller"] = poller
+
 
 async def server_shutdown(db):
     """
@@ -85,10 +136,22 @@ async def server_shutdown(db):
     # TODO: vsoch: this doesn't exit cleanly
     # because event consumer is blocking
     print("🛑 Server shutting down...")
-    if _HOOKS["engine"]:
+    if _HOOKS.get("backfill") and not _HOOKS["backfill"].done():
+        print("   Stopping backfill...")
+        _HOOKS["backfill"].cancel()
+        await asyncio.gather(_HOOKS["backfill"], return_exceptions=True)
+
+    if _HOOKS.get("engine"):
         print("   Stopping EventsEngine...")
         await _HOOKS["engine"].stop()
 
+    if get_archive() is not None:
+        await get_archive().stop()
+
+    if _HOOKS.get("poller"):
+        await _HOOKS["poller"].stop()
+    await get_registry().stop_probes()
+
     await db.close()
 
 
@@ -98,9 +161,9 @@ def main():
 
     # We detect this in sqlalchemy (get_db below) so it can be set externally.
     # We can export other envars too.
-    os.environ["FLUX_MCP_DATABASE"] = args.db_type
-    if args.db_type == "sqlite":
-        os.environ["FLUX_MCP_DATABASE"] = args.db_path
+    os.environ["FLUX_MCP_DATABASE_TYPE"] = args.db_type
+    if args.db_type == "sqlite" and args.db_path:
+        os.environ["FLUX_MCP_DATABASE_PATH"] = args.db_path
 
     # Get the database instance, which can be any supported in sqlalchemy.
     # TODO try subbing in here my mcp-server library
@@ -137,6 +200,9 @@ def main():
 
     # create ASGI app and mount to /mcp (or other destination)
     app = FastAPI(title="Flux MCP", lifespan=lifespan)
+
+    # Bulk exports (NDJSON over HTTP) go before the MCP app, which takes everything else
+    app.include_router(export_router)
     app.mount("/", mcp_app)
 
     print(f"🌍 Flux MCP Server listening on http://{cfg.server.host}:{cfg.server.port}")
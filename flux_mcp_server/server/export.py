@@ -0,0 +1,73 @@
+import os
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from flux_mcp_server.db import get_db
+from flux_mcp_server.db.models import EXPORT_KEYS, parse_export_key
+from flux_mcp_server.utils.auth import bearer_token, token_matches
+from flux_mcp_server.utils.ndjson import ndjson
+
+router = APIRouter()
+
+
+def parse_after(table: str, header: Optional[str]) -> Optional[tuple]:
+    """
+    The key to resume after, from "X-Export-After: <cluster>,<job_id>" (jobs) or
+    "<cluster>,<job_id>,<seq>,<timestamp>,<event_type>" (events), the fields of the
+    last row received.
+    """
+    if not header:
+        return None
+    try:
+        return parse_export_key(table, header)
+    except ValueError as e:
+        raise HTTPException(400, f"Invalid X-Export-After: {e}")
+
+
+@router.get("/export/{table}")
+async def export(
+    table: Literal["jobs", "events"],
+    request: Request,
+    cluster: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    gzip: bool = True,
+):
+    """
+    Stream jobs or events as NDJSON (gzip'd unless gzip=false) for a cluster and time range.
+
+    Rows come from a server-side cursor a chunk at a time, so memory stays flat no
+    matter how big the export is. If until isn't given we pin it to now, and send it
+    back as X-Export-Until. Rows come in key order (X-Export-Key names the fields),
+    so to resume after a dropped connection, repeat the request with that until and
+    "X-Export-After: <the key fields of the last row received>".
+
+    This is the whole database, so it needs "Authorization: Bearer <token>" with the
+    token in FLUX_MCP_EXPORT_TOKEN, and without one set exports are off.
+    """
+    token = os.environ.get("FLUX_MCP_EXPORT_TOKEN")
+    if not token:
+        raise HTTPException(403, "Exports are disabled (set FLUX_MCP_EXPORT_TOKEN to enable).")
+    if not token_matches(token, bearer_token(request.headers.get("authorization"))):
+        raise HTTPException(
+            401, "Unauthorized: send the export token.", headers={"WWW-Authenticate": "Bearer"}
+        )
+    if until is None:
+        until = time.time()
+    after = parse_after(table, request.headers.get("x-export-after"))
+
+    chunks = get_db().export_rows(table, cluster=cluster, since=since, until=until, after=after)
+    headers = {
+        "X-Export-Until": repr(until),
+        "X-Export-Key": ",".join(name for name, _ in EXPORT_KEYS[table]),
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        ndjson(chunks, gzip),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
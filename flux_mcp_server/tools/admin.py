@@ -0,0 +1,50 @@
+import json
+import os
+from typing import Optional
+
+from fastmcp import Context
+
+from ..db import get_db
+from ..db.interface import DatabaseBackend
+
+# Admin tools are for operators, not agents. Like ingest_flux_event, we only
+# answer clients that identify with an allowed name (FLUX_MCP_ADMIN_CLIENTS,
+# comma separated). This is the same (weak) check, and should be replaced
+# when we have real auth.
+
+_DB_INSTANCE: DatabaseBackend = None
+
+
+def init_admin_tools(db_instance: DatabaseBackend):
+    global _DB_INSTANCE
+    _DB_INSTANCE = db_instance
+
+
+def _get_db() -> DatabaseBackend:
+    return _DB_INSTANCE or get_db()
+
+
+def is_admin_client(name: Optional[str]) -> bool:
+    allowed = os.environ.get("FLUX_MCP_ADMIN_CLIENTS", "FluxAdmin").split(",")
+    return name is not None and name in [allowed_name.strip() for allowed_name in allowed]
+
+
+def _is_admin(ctx: Context) -> bool:
+    if ctx is None:
+        return False
+    return is_admin_client(ctx.session.initialization_options.get("clientInfo", {}).get("name"))
+
+
+def slow_queries(limit: int = 10, order: str = "total", ctx: Context = None) -> str:
+    """
+    ADMIN TOOL: List the most expensive SQL query shapes the server has run.
+    Order by "total", "max", or "mean" time. Shapes that ran over the slow
+    query threshold include the plan the database chose for them.
+    """
+    if not _is_admin(ctx):
+        return json.dumps({"success": False, "error": "Unauthorized: Admin tool."})
+    try:
+        queries = _get_db().get_query_stats(limit=limit, order=order)
+        return json.dumps({"success": True, "queries": queries})
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
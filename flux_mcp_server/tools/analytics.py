@@ -0,0 +1,92 @@
+import json
+from typing import List, Optional
+
+from ..db.archive import JobArchive, get_archive
+
+# These answer from the columnar job archive (finished jobs only), not the live
+# database, so they stay fast over months of history. The archive is refreshed
+# on an interval, so very recent jobs might not be in it yet.
+
+_ARCHIVE: JobArchive = None
+
+
+def init_analytics_tools(archive: JobArchive):
+    global _ARCHIVE
+    _ARCHIVE = archive
+
+
+def _run(method: str, **kwargs) -> str:
+    archive = _ARCHIVE or get_archive()
+    if archive is None:
+        return json.dumps({"error": "No job archive configured (FLUX_MCP_ARCHIVE_PATH)"})
+    try:
+        if not archive.load():
+            return json.dumps({"error": "The job archive has not been exported yet"})
+        return json.dumps(getattr(archive, method)(**kwargs))
+    except Exception as e:
+        return json.dumps({"error": str(e)})
+
+
+def job_histogram(
+    field: str = "wait_seconds",
+    bins: int = 20,
+    cluster: Optional[str] = None,
+    user: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> str:
+    """
+    Histogram of a finished job field (e.g., wait_seconds, run_seconds, exit_code),
+    optionally for one cluster or user, and jobs that finished between since and until.
+    """
+    return _run(
+        "histogram", field=field, bins=bins, cluster=cluster, user=user, since=since, until=until
+    )
+
+
+def job_percentiles(
+    field: str = "wait_seconds",
+    percentiles: Optional[List[float]] = None,
+    cluster: Optional[str] = None,
+    user: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> str:
+    """
+    Percentiles (50, 90, and 99 by default) and the mean of a finished job field, e.g.
+    the p90 wait time for a user.
+    """
+    return _run(
+        "percentiles",
+        field=field,
+        q=percentiles,
+        cluster=cluster,
+        user=user,
+        since=since,
+        until=until,
+    )
+
+
+def job_group_by(
+    key: str = "user",
+    field: str = "run_seconds",
+    agg: str = "mean",
+    limit: int = 20,
+    cluster: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> str:
+    """
+    Aggregate finished jobs by user or cluster, largest first. agg is one of count,
+    sum, mean, min, max, or failure_rate (fraction of jobs with a nonzero exit code).
+    """
+    return _run(
+        "group_by",
+        key=key,
+        field=field,
+        agg=agg,
+        limit=limit,
+        cluster=cluster,
+        since=since,
+        until=until,
+    )
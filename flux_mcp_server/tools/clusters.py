@@ -0,0 +1,69 @@
+import json
+from dataclasses import asdict
+from typing import Optional
+
+from ..clusters.registry import get_registry
+from ..clusters.snapshots import get_poller
+from ..db import get_db
+from ..db.interface import DatabaseBackend
+
+# Cluster state tools. These answer from what the server has already collected
+# (the resource poller and the database), so they never make a Flux RPC.
+
+_DB_INSTANCE: DatabaseBackend = None
+
+
+def init_cluster_tools(db_instance: DatabaseBackend):
+    global _DB_INSTANCE
+    _DB_INSTANCE = db_instance
+
+
+def _get_db() -> DatabaseBackend:
+    return _DB_INSTANCE or get_db()
+
+
+async def cluster_resources(
+    cluster: Optional[str] = None,
+    partition: Optional[str] = None,
+    history: bool = False,
+    since: Optional[float] = None,
+    limit: int = 100,
+) -> str:
+    """
+    Free, allocated, and total nodes, cores, and gpus per partition ("all" is the
+    whole cluster), plus down nodes, as of the last poll. Use this to decide where
+    and how big to submit. With history=True, return past snapshots (newest first,
+    optionally since an epoch time) instead.
+    """
+    try:
+        poller = get_poller()
+        if history or poller is None:
+            records = await _get_db().get_resource_history(
+                cluster=cluster, partition=partition, since=since, limit=limit
+            )
+            # Without a poller, the latest we have is the newest snapshot per cluster
+            if not history:
+                newest = {}
+                for record in records:
+                    newest.setdefault(record.cluster, record.timestamp)
+                records = [r for r in records if r.timestamp == newest[r.cluster]]
+        else:
+            records = [
+                record
+                for name, snapshot in poller.latest.items()
+                if not cluster or name == cluster
+                for record in snapshot
+                if not partition or record.partition == partition
+            ]
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+    return json.dumps({"success": True, "resources": [asdict(record) for record in records]})
+
+
+def list_clusters() -> str:
+    """
+    List registered clusters, with their health from the last background probe
+    (healthy or degraded), probe latency in milliseconds, and the last error.
+    Degraded clusters are skipped when routing submissions.
+    """
+    return json.dumps({"success": True, "clusters": get_registry().list_clusters()})
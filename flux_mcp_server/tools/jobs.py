@@ -0,0 +1,228 @@
+import json
+import os
+import time
+from typing import Any, List, Optional, Union
+
+from fastmcp import Context
+
+from ..clusters.interface import AuthContext, ClusterHandle
+from ..clusters.jobspec import get_jobspec_cache
+from ..clusters.readthrough import ReadThroughJobInfo
+from ..clusters.registry import get_registry
+from ..clusters.routing import AUTO, ClusterRouter
+from ..db import get_db
+from ..db.interface import DatabaseBackend
+from ..utils.cache import TTLCache
+from .admin import is_admin_client
+from .selection import jobs_to_cancel
+
+# Job tools that talk to a cluster through its handle in the cluster registry.
+# The handle methods block, so we always go through handle.call (off the event loop).
+# If "local" isn't registered yet, we register it on first use (FLUX_URI, or the default).
+
+# Tools that select jobs by filter resolve them through the jobs database
+_DB_INSTANCE: DatabaseBackend = None
+_JOB_INFO: ReadThroughJobInfo = None
+_ROUTER: ClusterRouter = None
+
+# Job listings are shared by every caller for FLUX_MCP_LIST_TTL seconds, and identical
+# listings asked for at the same time are one job-list RPC.
+_LISTINGS = TTLCache(ttl=float(os.environ.get("FLUX_MCP_LIST_TTL", 2.0)))
+
+
+def init_job_tools(db_instance: DatabaseBackend):
+    global _DB_INSTANCE, _JOB_INFO, _ROUTER
+    _DB_INSTANCE = db_instance
+    _JOB_INFO = _ROUTER = None
+
+
+def _get_db() -> DatabaseBackend:
+    return _DB_INSTANCE or get_db()
+
+
+def _get_job_info() -> ReadThroughJobInfo:
+    global _JOB_INFO
+    if _JOB_INFO is None:
+        _JOB_INFO = ReadThroughJobInfo(_get_db())
+    return _JOB_INFO
+
+
+def _get_router() -> ClusterRouter:
+    global _ROUTER
+    if _ROUTER is None:
+        _ROUTER = ClusterRouter(_get_db())
+    return _ROUTER
+
+
+async def _get_handle(cluster: str) -> ClusterHandle:
+    registry = get_registry()
+    handle = registry.get_handle(cluster)
+    if handle is None and cluster == "local":
+        config = {"uri": os.environ.get("FLUX_URI")}
+        try:
+            await registry.register_async("local", "local", config)
+        except ValueError:
+            # Someone else registered it while we were connecting
+            pass
+        handle = registry.get_handle(cluster)
+    if handle is None:
+        raise ValueError(f"Cluster '{cluster}' is not registered.")
+    return handle
+
+
+def _client_name(ctx: Context) -> Optional[str]:
+    if ctx is None:
+        return None
+    return ctx.session.initialization_options.get("clientInfo", {}).get("name")
+
+
+def _get_auth(ctx: Context) -> AuthContext:
+    return AuthContext(user_id=_client_name(ctx) or "anonymous")
+
+
+async def submit_jobs(
+    jobspecs: List[Union[str, dict]],
+    cluster: str = "local",
+    policy: Optional[str] = None,
+    ctx: Context = None,
+) -> str:
+    """
+    Submit many jobs at once (e.g., a parameter sweep). Each jobspec is a JSON string
+    or object. Returns one result per jobspec, in order: {"id": <jobid>} if it was
+    submitted, or {"error": <message>} if it wasn't. Much faster than one submit per job.
+
+    With cluster="auto", the server picks the cluster by load, with policy one of
+    least-loaded (default), weighted, or sticky (the same cluster for a user), and the
+    response says which cluster it picked and why.
+    """
+    response = {"success": True}
+    auth = _get_auth(ctx)
+    try:
+        if cluster == AUTO:
+            decision = await _get_router().route(user=auth.user_id, policy=policy)
+            cluster = decision.cluster
+            response["routing"] = decision.to_dict()
+        handle = await _get_handle(cluster)
+        start = time.perf_counter()
+        results: List[Any] = await handle.call("submit_many", jobspecs, auth)
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+    if results:
+        _get_router().observe(cluster, (time.perf_counter() - start) / len(results))
+    failed = sum(1 for result in results if "error" in result)
+    response.update(
+        {
+            "cluster": cluster,
+            "submitted": len(results) - failed,
+            "failed": failed,
+            "jobs": results,
+        }
+    )
+    return json.dumps(response)
+
+
+async def submit_jobs_template(
+    template: Union[str, dict],
+    parameters: List[dict],
+    cluster: str = "local",
+    policy: Optional[str] = None,
+    ctx: Context = None,
+) -> str:
+    """
+    Submit one job per parameter set from a jobspec template. Strings in the template
+    can use "{{ name }}" placeholders, and a string that is only a placeholder takes
+    the value as is (e.g., "count": "{{ nodes }}" with {"nodes": 2}). Send the template
+    once with small parameter sets, instead of a full jobspec per job.
+    """
+    try:
+        jobspecs = get_jobspec_cache().render(template, parameters)
+    except Exception as e:
+        return json.dumps({"success": False, "error": f"Invalid template: {e}"})
+    return await submit_jobs(jobspecs, cluster, policy, ctx)
+
+
+async def cancel_jobs(
+    job_ids: Optional[List[int]] = None,
+    user: Optional[str] = None,
+    state: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    cluster: str = "local",
+    reason: Optional[str] = None,
+    ctx: Context = None,
+) -> str:
+    """
+    Cancel many jobs at once: either a list of job_ids, or every active job matching
+    a filter (user as a Flux userid, state, and/or submitted between since and until,
+    epoch seconds). A filter needs at least one of those, and is only for admin
+    clients. Returns one result per job.
+    """
+    try:
+        if job_ids is None:
+            admin = is_admin_client(_client_name(ctx))
+            job_ids = await jobs_to_cancel(
+                _get_db(), cluster, admin, user=user, state=state, since=since, until=until
+            )
+        if not job_ids:
+            return json.dumps({"success": True, "canceled": 0, "failed": 0, "jobs": []})
+        handle = await _get_handle(cluster)
+        results = await handle.call("cancel_many", job_ids, _get_auth(ctx), reason)
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+    failed = sum(1 for result in results if "error" in result)
+    return json.dumps(
+        {"success": True, "canceled": len(results) - failed, "failed": failed, "jobs": results}
+    )
+
+
+async def job_info(
+    job_id: int, cluster: str = "local", max_age: Optional[float] = None, ctx: Context = None
+) -> str:
+    """
+    Get a job's state, user, and working directory. Finished jobs and recently updated
+    jobs are answered from the events database, and Flux is only asked about jobs we
+    don't know or haven't heard about in max_age seconds (FLUX_MCP_JOB_INFO_MAX_AGE,
+    default 10). The result says where it came from (database, cache, or flux) and its age.
+    """
+    try:
+        handle = await _get_handle(cluster)
+        info = await _get_job_info().get(handle, job_id, _get_auth(ctx), max_age=max_age)
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+    return json.dumps(dict(info, success=True))
+
+
+async def list_jobs(
+    attrs: Optional[List[str]] = None,
+    states: Optional[List[str]] = None,
+    user: Optional[int] = None,
+    since: float = 0.0,
+    name: Optional[str] = None,
+    queue: Optional[str] = None,
+    limit: int = 1000,
+    cluster: str = "local",
+    ctx: Context = None,
+) -> str:
+    """
+    List jobs on a cluster, newest first, from Flux's job-list service. Ask for only the
+    attributes you need (e.g., ["id", "state", "t_submit"]), and filter by states
+    (pending, running, inactive, or e.g. sched), user id, jobs inactive since an epoch
+    time, job name, or queue. Listings are cached for a couple of seconds.
+    """
+    query = {
+        "attrs": attrs,
+        "states": states,
+        "user": user,
+        "since": since,
+        "name": name,
+        "queue": queue,
+        "max_entries": limit,
+    }
+    key = (cluster, json.dumps(query, sort_keys=True))
+    try:
+        handle = await _get_handle(cluster)
+        auth = _get_auth(ctx)
+        jobs = await _LISTINGS.get(key, lambda: handle.call("list_jobs", auth, **query))
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+    return json.dumps({"success": True, "count": len(jobs), "jobs": jobs})
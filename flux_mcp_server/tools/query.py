@@ -1,36 +1,73 @@
 import json
+from dataclasses import asdict
+from typing import Optional
 
-from ..db.sqlite import JobDatabase
+from ..db import get_db
+from ..db.interface import DatabaseBackend
 
-# This is initialized by the server's main.py
-_DB_INSTANCE: JobDatabase = None
+# This is initialized by the server's main.py (otherwise we use the server database)
+_DB_INSTANCE: DatabaseBackend = None
 
 
-def init_query_tools(db_instance: JobDatabase):
+def init_query_tools(db_instance: DatabaseBackend):
     global _DB_INSTANCE
     _DB_INSTANCE = db_instance
 
 
+def _get_db() -> DatabaseBackend:
+    return _DB_INSTANCE or get_db()
+
+
 # MCP Tools exposed to the Agent
 # TODO (vsoch) these aren't tested
 
 
-def query_job_history(job_id: int) -> str:
+async def query_job_history(
+    job_id: int, cluster: str = "local", since_seq: Optional[int] = None
+) -> str:
     """
     Retrieve the historical record of a job from the database.
     Useful for analyzing jobs that have already finished/purged.
-    """
-    if not _DB_INSTANCE:
-        return json.dumps({"error": "Database not initialized"})
 
-    record = _DB_INSTANCE.get_job(job_id)
+    To follow a running job, pass the last_seq from the previous call as
+    since_seq, and only the new events are returned.
+    """
+    db = _get_db()
+    record = await db.get_job(cluster, job_id)
     if not record:
         return json.dumps({"error": "Job not found in history"})
 
-    return json.dumps({"job_id": record.job_id, "state": record.state, "history": record.events})
+    events = await db.get_event_history(cluster, job_id, since_seq=since_seq)
+    last_seq = events[-1].seq if events else since_seq
+    return json.dumps(
+        {
+            "job_id": record.job_id,
+            "state": record.state,
+            "history": [asdict(e) for e in events],
+            "last_seq": last_seq,
+        }
+    )
 
 
 def find_failed_jobs(limit: int = 5) -> str:
     """Finds recent jobs that did not complete successfully."""
     # TODO (vsoch) Logic to query DB where exit_code != 0
     return json.dumps([])
+
+
+async def query_usage(cluster: Optional[str] = None, user: Optional[str] = None) -> str:
+    """
+    Resource usage of finished jobs per user: jobs, and run, node, core, and gpu
+    seconds (run time times what the job was allocated). Heaviest users first.
+    """
+    usage = await _get_db().get_usage(cluster=cluster, user=user)
+    return json.dumps([asdict(record) for record in usage])
+
+
+async def query_cluster_usage(cluster: Optional[str] = None) -> str:
+    """
+    Total resource usage of finished jobs per cluster: jobs, and run, node, core,
+    and gpu seconds. Busiest clusters first.
+    """
+    usage = await _get_db().get_cluster_usage(cluster=cluster)
+    return json.dumps([asdict(record) for record in usage])
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from ..db.interface import DatabaseBackend
+
+# Selecting jobs by filter for the bulk job tools. This is kept apart from the
+# tools themselves (no MCP or Flux imports) so it can be tested on its own.
+
+
+async def jobs_to_cancel(
+    db: DatabaseBackend,
+    cluster: str,
+    admin: bool,
+    user: Optional[str] = None,
+    state: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> List[int]:
+    """
+    The active jobs on a cluster matching a filter (user, state, and/or submitted
+    between since and until), from the jobs database.
+
+    The database knows a job's owner as the Flux userid from its submit event,
+    and we have no mapping from an MCP client to a Flux user, so we can't scope
+    a filter to the caller's own jobs. Filters are for admin clients only.
+    """
+    if user is None and state is None and since is None and until is None:
+        raise ValueError("Give job_ids or at least one filter (user, state, since, until).")
+    if not admin:
+        raise PermissionError("Only admin clients can cancel by filter, give job_ids instead.")
+    jobs = await db.search_jobs(cluster=cluster, state=state, user=user, active=True, limit=None)
+
+    # A job we never saw submitted has no submit time, so a time window skips it
+    return [
+        job.job_id
+        for job in jobs
+        if (since is None and until is None)
+        or (
+            job.submit_time is not None
+            and (since is None or job.submit_time >= since)
+            and (until is None or job.submit_time <= until)
+        )
+    ]
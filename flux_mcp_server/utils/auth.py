@@ -0,0 +1,22 @@
+import hmac
+from typing import Optional
+
+
+def token_matches(expected: Optional[str], given: Optional[str]) -> bool:
+    """
+    Compare a shared secret in constant time. We compare bytes, since
+    compare_digest refuses str with non-ASCII characters.
+    """
+    if not expected or given is None:
+        return False
+    return hmac.compare_digest(expected.encode(), str(given).encode())
+
+
+def bearer_token(header: Optional[str]) -> Optional[str]:
+    """
+    The token from an "Authorization: Bearer <token>" header, if that's what it is.
+    """
+    scheme, _, token = (header or "").strip().partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
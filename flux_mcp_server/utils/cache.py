@@ -0,0 +1,53 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class TTLCache:
+    """
+    A small async cache for expensive lookups, e.g.,
+
+    listing = await cache.get(key, lambda: fetch_listing())
+
+    Entries live for ttl seconds. Concurrent misses for the same key share one
+    fetch (request coalescing), so a burst of identical queries costs one call.
+    A failed fetch isn't cached, and its error goes to everyone waiting on it.
+    """
+
+    def __init__(self, ttl: float = 2.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = self.misses = self.coalesced = 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        future = self._inflight.get(key)
+        if future is None:
+            self.misses += 1
+            future = self._inflight[key] = asyncio.ensure_future(self._fetch(key, fetch))
+        else:
+            self.coalesced += 1
+
+        # A caller that gives up shouldn't cancel the fetch for everyone else
+        return await asyncio.shield(future)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -65,7 +65,7 @@ def load_jobspec(filename):
         return yaml.safe_load(filename)
     try:
         return read_yaml(filename)
-    except:
+    except yaml.YAMLError:
         return read_json(filename)
 
 
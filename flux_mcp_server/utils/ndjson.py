@@ -0,0 +1,18 @@
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List
+
+
+async def ndjson(chunks: AsyncIterator[List[Dict[str, Any]]], compress: bool = True):
+    """
+    Encode chunks of rows as NDJSON, optionally gzip'd as one continuous stream.
+    """
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    async for rows in chunks:
+        data = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode()
+        if gz:
+            data = gz.compress(data)
+        if data:
+            yield data
+    if gz:
+        yield gz.flush()
@@ -29,4 +29,7 @@ TESTS_REQUIRES = (
     ("pytest", {"min_version": "4.6.2"}),
     ("pytest-asyncio", {"min_version": None}),
 )
-INSTALL_REQUIRES_ALL = INSTALL_REQUIRES + TESTS_REQUIRES
+# The columnar job archive and analytics tools
+ANALYTICS_REQUIRES = (("numpy", {"min_version": None}),)
+
+INSTALL_REQUIRES_ALL = INSTALL_REQUIRES + TESTS_REQUIRES + ANALYTICS_REQUIRES
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import astuple
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(here))
+
+from flux_mcp_server.db.memory import MemoryBackend  # noqa
+from flux_mcp_server.db.models import JOB_COLUMNS, USAGE_COLUMNS, job_tuple  # noqa
+from flux_mcp_server.db.views import SQLAlchemyBackend  # noqa
+
+# Benchmark the ingest write paths against a fresh sqlite database each.
+# This reports events per CPU-second (process time of the whole interpreter,
+# so it includes aiosqlite's worker thread) and checks that every path
+# produces the same jobs, events, and usage tables as the ORM path. The memory
+# backend is a zero-I/O baseline, and we check its jobs and usage too.
+#
+# python3 scripts/benchmark_ingest.py --jobs 2000
+
+LIFECYCLE = ["submit", "validate", "depend", "priority", "alloc", "start", "finish", "release"]
+LIFECYCLE += ["free", "clean"]
+
+
+def generate_events(jobs, seed=42):
+    """
+    Generate interleaved eventlogs for a number of jobs, in timestamp order.
+    """
+    rng = random.Random(seed)
+    events = []
+    for job_id in range(1, jobs + 1):
+        t = 1_700_000_000.0 + job_id
+        for seq, name in enumerate(LIFECYCLE):
+            t += rng.random() * 5
+            context = {}
+            if name == "submit":
+                context = {"userid": rng.choice([1000, 1001, 1002]), "urgency": 16}
+            elif name == "alloc":
+                nodes = rng.choice([1, 2, 4])
+                context = {}
+                event_R = {
+                    "version": 1,
+                    "execution": {
+                        "R_lite": [{"rank": f"0-{nodes - 1}", "children": {"core": "0-7"}}]
+                    },
+                }
+            elif name == "finish":
+                context = {"status": rng.choice([0, 0, 0, 256])}
+            event = {"id": job_id, "type": name, "timestamp": t, "seq": seq, "context": context}
+            if name == "alloc":
+                event["R"] = event_R
+            events.append(event)
+    events.sort(key=lambda e: e["timestamp"])
+    return events
+
+
+async def run_orm(db, cluster, events, batch):
+    for event in events:
+        await db._record_event_orm(cluster, event)
+
+
+async def run_core(db, cluster, events, batch):
+    for event in events:
+        await db.record_event(cluster, event)
+
+
+async def run_core_batch(db, cluster, events, batch):
+    for i in range(0, len(events), batch):
+        await db.record_events(cluster, events[i : i + batch])
+
+
+# mode -> (how we feed events, backend options)
+MODES = {
+    "orm": (run_orm, {}),
+    "core": (run_core, {}),
+    "core-batch": (run_core_batch, {}),
+    "thread": (run_core, {"sqlite_writer": True}),
+    "thread-batch": (run_core_batch, {"sqlite_writer": True}),
+    "memory": (run_core, {"memory": True}),
+}
+
+
+async def dump(db):
+    """
+    Dump the tables so we can compare paths.
+    """
+    job_fields = ", ".join(f'"{column.name}"' for column in JOB_COLUMNS)
+    usage_fields = ", ".join(f'"{column.name}"' for column in USAGE_COLUMNS)
+    async with db.engine.connect() as conn:
+        jobs = (await conn.exec_driver_sql(f"SELECT {job_fields} FROM jobs ORDER BY job_id")).all()
+        events = (
+            await conn.exec_driver_sql(
+                "SELECT job_id, cluster, timestamp, event_type, payload FROM events ORDER BY id"
+            )
+        ).all()
+        usage = (
+            await conn.exec_driver_sql(f'SELECT {usage_fields} FROM usage ORDER BY "user"')
+        ).all()
+    return [tuple(j) for j in jobs], [tuple(e) for e in events], [tuple(u) for u in usage]
+
+
+async def bench_memory(run, events, batch):
+    db = MemoryBackend()
+    await db.initialize()
+    cpu, wall = time.process_time(), time.perf_counter()
+    await run(db, "bench", events, batch)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    jobs = sorted(job_tuple(job) for job in await db.search_jobs(limit=len(events)))
+    usage = sorted(astuple(record) for record in await db.get_usage())
+    return cpu, wall, (jobs, None, usage)
+
+
+async def bench(mode, events, batch, tmpdir):
+    path = os.path.join(tmpdir, f"{mode}.db")
+    run, options = MODES[mode]
+    if options.get("memory"):
+        return await bench_memory(run, events, batch)
+    db = SQLAlchemyBackend(f"sqlite+aiosqlite:///{path}", **options)
+    await db.initialize()
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    await run(db, "bench", events, batch)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    await db.close()
+    db = SQLAlchemyBackend(f"sqlite+aiosqlite:///{path}")
+    tables = await dump(db)
+    await db.close()
+    return cpu, wall, tables
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Flux MCP ingest paths")
+    parser.add_argument("--jobs", type=int, default=1000, help="Number of synthetic jobs")
+    parser.add_argument("--batch", type=int, default=500, help="Events per batch (core-batch)")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    events = generate_events(args.jobs)
+    print(f"📦 {len(events)} events for {args.jobs} jobs")
+
+    reference = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for mode in args.modes:
+            cpu, wall, tables = await bench(mode, events, args.batch, tmpdir)
+            if reference is None:
+                reference = tables
+
+            # The memory backend has no events table to compare
+            same = tables == reference
+            if tables[1] is None:
+                same = (tables[0], tables[2]) == (reference[0], reference[2])
+            same = "✅" if same else "❌ differs from " + args.modes[0]
+            print(
+                f"   {mode:<12} {len(events) / cpu:>12.0f} events/cpu-s "
+                f"{len(events) / wall:>12.0f} events/s  {same}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -62,6 +62,7 @@ if __name__ == "__main__":
     INSTALL_REQUIRES = get_reqs(lookup)
     TESTS_REQUIRES = get_reqs(lookup, "TESTS_REQUIRES")
     INSTALL_REQUIRES_ALL = get_reqs(lookup, "INSTALL_REQUIRES_ALL")
+    ANALYTICS_REQUIRES = get_reqs(lookup, "ANALYTICS_REQUIRES")
 
     setup(
         name=NAME,
@@ -83,6 +84,7 @@ if __name__ == "__main__":
         tests_require=TESTS_REQUIRES,
         extras_require={
             "all": [INSTALL_REQUIRES_ALL],
+            "analytics": ANALYTICS_REQUIRES,
         },
         classifiers=[
             "Intended Audience :: Science/Research",
@@ -95,5 +97,10 @@ if __name__ == "__main__":
             "Operating System :: Unix",
             "Programming Language :: Python :: 3.11",
         ],
-        entry_points={"console_scripts": ["flux-mcp-server=flux_mcp_server.server:__main__"]},
+        entry_points={
+            "console_scripts": [
+                "flux-mcp-server=flux_mcp_server.server:__main__",
+                "flux-mcp-agent=flux_mcp_server.clusters.agent:main",
+            ]
+        },
     )
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from flux_mcp_server.db.archive import JobArchive
+from flux_mcp_server.db.memory import MemoryBackend
+
+np = pytest.importorskip("numpy")
+
+# The columnar archive of finished jobs (python -m pytest tests/test_archive.py,
+# needs numpy but not Flux)
+
+
+async def finished(db, cluster, job_id, user, run, status=0, start=True):
+    """
+    A job that waited 10 seconds and ran for run seconds (or was canceled before it started).
+    """
+    t = 1000.0 + job_id * 100
+    events = [
+        {"id": job_id, "type": "submit", "timestamp": t, "context": {"userid": user}},
+        {"id": job_id, "type": "alloc", "timestamp": t + 10},
+    ]
+    if start:
+        events.append({"id": job_id, "type": "start", "timestamp": t + 10})
+    events += [
+        {"id": job_id, "type": "finish", "timestamp": t + 10 + run, "context": {"status": status}},
+        {"id": job_id, "type": "clean", "timestamp": t + 11 + run},
+    ]
+    await db.record_events(cluster, events)
+
+
+async def archive_of(tmp_path, db):
+    archive = JobArchive(str(tmp_path / "archive"))
+    count = await archive.export(db)
+    assert archive.load()
+    return archive, count
+
+
+def test_empty_archive(tmp_path):
+    async def run():
+        archive = JobArchive(str(tmp_path / "archive"))
+        assert not archive.load()
+
+        archive, count = await archive_of(tmp_path, MemoryBackend())
+        assert count == 0 and len(archive) == 0
+        assert archive.histogram("run_seconds", bins=4)["count"] == 0
+        assert archive.percentiles("run_seconds") == {
+            "field": "run_seconds",
+            "count": 0,
+            "percentiles": {},
+        }
+        assert archive.group_by("user", agg="count")["groups"] == []
+
+    asyncio.run(run())
+
+
+def test_export_and_query(tmp_path):
+    async def run():
+        db = MemoryBackend()
+        for job_id, run_seconds in enumerate([10, 20, 30, 40], start=1):
+            await finished(db, "dane", job_id, 1000, run_seconds)
+        await finished(db, "dane", 5, 1001, 100, status=256)
+        await finished(db, "corona", 6, 1001, 50)
+
+        # Still running, so not in the archive
+        await db.record_events("dane", [{"id": 7, "type": "submit", "timestamp": 1.0}])
+
+        archive, count = await archive_of(tmp_path, db)
+        assert count == 6
+
+        histogram = archive.histogram("run_seconds", bins=2, cluster="dane", user="1000")
+        assert histogram["counts"] == [2, 2] and histogram["edges"] == [10.0, 25.0, 40.0]
+
+        result = archive.percentiles("run_seconds", q=[50], user="1000")
+        assert result["count"] == 4 and result["percentiles"] == {"50": 25.0}
+        assert result["mean"] == 25.0
+        assert archive.percentiles("wait_seconds", cluster="corona")["mean"] == 10.0
+
+        mean = archive.group_by("user", "run_seconds", "mean")["groups"]
+        assert mean == [
+            {"user": "1001", "jobs": 2, "mean": 75.0},
+            {"user": "1000", "jobs": 4, "mean": 25.0},
+        ]
+        failures = archive.group_by("cluster", agg="failure_rate")["groups"]
+        assert failures == [
+            {"cluster": "dane", "jobs": 5, "failure_rate": 0.2},
+            {"cluster": "corona", "jobs": 1, "failure_rate": 0.0},
+        ]
+
+        # Someone we've never seen has no jobs, not an error
+        assert archive.percentiles("run_seconds", user="nobody")["count"] == 0
+        assert archive.group_by("cluster", agg="count", user="nobody")["groups"] == []
+
+        with pytest.raises(ValueError, match="Unknown field"):
+            archive.histogram("state")
+
+    asyncio.run(run())
+
+
+def test_groups_without_values(tmp_path):
+    async def run():
+        db = MemoryBackend()
+        await finished(db, "dane", 1, 1000, 30)
+
+        # Canceled before they started, so they have no run time at all
+        await finished(db, "dane", 2, 1001, 5, status=15, start=False)
+        await finished(db, "dane", 3, 1001, 5, status=15, start=False)
+        archive, _ = await archive_of(tmp_path, db)
+
+        for agg in ["mean", "max", "min", "sum"]:
+            groups = {g["user"]: g for g in archive.group_by("user", "run_seconds", agg)["groups"]}
+            assert groups["1001"]["jobs"] == 2
+            expected = 0.0 if agg == "sum" else None
+            assert groups["1001"][agg] == expected and groups["1000"][agg] == 30.0
+
+        # An all-NaN group sorts last, after real values
+        groups = archive.group_by("user", "run_seconds", "max")["groups"]
+        assert [g["user"] for g in groups] == ["1000", "1001"]
+        assert archive.values("run_seconds", user="1001").size == 0
+
+    asyncio.run(run())
@@ -0,0 +1,214 @@
+import asyncio
+from dataclasses import astuple
+
+import pytest
+
+from flux_mcp_server.db.active import CachedBackend
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.db.models import ResourceRecord, export_key
+from flux_mcp_server.db.sharded import ShardedSqliteBackend
+from flux_mcp_server.db.views import SQLAlchemyBackend
+
+# Every backend answers the same reads the same way as the SQLAlchemy backend
+# (the reference), given the same events. No Flux needed.
+
+CLUSTERS = ["dane", "corona"]
+LIFECYCLE = ["submit", "validate", "depend", "priority", "alloc", "start", "finish", "release"]
+LIFECYCLE += ["free", "clean"]
+
+
+def eventlog(job_id, t, user, steps):
+    """
+    The first steps events of a job's eventlog, a second apart.
+    """
+    events = []
+    for seq, name in enumerate(LIFECYCLE[:steps]):
+        event = {"id": job_id, "type": name, "timestamp": t + seq, "seq": seq, "context": {}}
+        if name == "submit":
+            event["context"] = {"userid": user}
+        elif name == "alloc":
+            cores = f"0-{job_id % 4}"
+            event["R"] = {"execution": {"R_lite": [{"rank": "0", "children": {"core": cores}}]}}
+        elif name == "finish":
+            event["context"] = {"status": 0 if job_id % 3 else 256}
+        events.append(event)
+    return events
+
+
+def stream(cluster, jobs=30):
+    """
+    Interleaved eventlogs: a mix of users, finished jobs, and jobs still going.
+    """
+    offset = CLUSTERS.index(cluster) * 0.5
+    events = []
+    for job_id in range(1, jobs + 1):
+        steps = len(LIFECYCLE) if job_id % 4 else 1 + job_id % 7
+        events += eventlog(job_id, 1000.0 + job_id * 2 + offset, 1000 + job_id % 3, steps)
+    return sorted(events, key=lambda e: e["timestamp"])
+
+
+def resources(cluster):
+    return [
+        ResourceRecord(cluster, partition, 2000.0 + i, nodes=4, cores=64, free_cores=64 - i)
+        for i in range(5)
+        for partition in ["all", "gpu"]
+    ]
+
+
+def backend(kind, tmp_path):
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sharded":
+        return ShardedSqliteBackend(str(tmp_path / "shards"))
+    if kind == "cached":
+        return CachedBackend(SQLAlchemyBackend(f"sqlite+aiosqlite:///{tmp_path}/cached.db"))
+    return SQLAlchemyBackend(f"sqlite+aiosqlite:///{tmp_path}/{kind}.db")
+
+
+async def fill(db):
+    await db.initialize()
+    for cluster in CLUSTERS:
+        events = stream(cluster)
+        for i in range(0, len(events), 11):
+            await db.record_events(cluster, events[i : i + 11])
+        await db.record_resources(resources(cluster))
+
+
+async def reads(db):
+    """
+    The answers to a spread of reads, as plain tuples.
+    """
+    answers = {}
+    searches = [
+        {},
+        {"limit": None},
+        {"cluster": "dane", "limit": 5},
+        {"state": "INACTIVE", "limit": None},
+        {"user": "1001", "active": True, "limit": None},
+        {"active": False, "limit": 3, "raw": True},
+    ]
+    for i, filters in enumerate(searches):
+        jobs = await db.search_jobs(**filters)
+        answers[f"search {i}"] = [job if filters.get("raw") else astuple(job) for job in jobs]
+
+    for cluster in CLUSTERS:
+        for job_id in [1, 4, 8, 30, 99]:
+            job = await db.get_job(cluster, job_id)
+            answers[f"job {cluster} {job_id}"] = job and astuple(job)
+            history = await db.get_event_history(cluster, job_id, since_seq=3)
+            answers[f"history {cluster} {job_id}"] = [astuple(event) for event in history]
+        answers[f"states {cluster}"] = await db.get_job_states(cluster, [1, 4, 8, 30, 99])
+        answers[f"counts {cluster}"] = await db.count_active_jobs(cluster)
+    answers["counts"] = await db.count_active_jobs()
+
+    answers["usage"] = [astuple(record) for record in await db.get_usage()]
+    answers["usage dane 1002"] = [astuple(r) for r in await db.get_usage("dane", "1002")]
+    answers["cluster usage"] = [astuple(record) for record in await db.get_cluster_usage()]
+    answers["resources"] = [astuple(r) for r in await db.get_resource_history(limit=None)]
+    answers["resources gpu"] = [
+        astuple(r) for r in await db.get_resource_history("corona", "gpu", since=2001.0, limit=2)
+    ]
+
+    for table in ["jobs", "events"]:
+        rows = [row async for chunk in db.export_rows(table, chunk_size=7) for row in chunk]
+        keys = [export_key(table, row) for row in rows]
+        answers[f"export {table}"] = keys
+        resumed = [row async for chunk in db.export_rows(table, after=keys[10]) for row in chunk]
+        answers[f"resume {table}"] = [export_key(table, row) for row in resumed]
+    finished = [row async for chunk in db.export_rows("jobs", state="INACTIVE") for row in chunk]
+    answers["export finished jobs"] = [export_key("jobs", row) for row in finished]
+    return answers
+
+
+@pytest.fixture
+def reference(tmp_path):
+    async def run():
+        db = backend("reference", tmp_path)
+        await fill(db)
+        try:
+            return await reads(db)
+        finally:
+            await db.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("kind", ["memory", "sharded", "cached"])
+def test_same_answers_as_sqlalchemy(kind, reference, tmp_path):
+    async def run():
+        db = backend(kind, tmp_path)
+        await fill(db)
+        try:
+            answers = await reads(db)
+        finally:
+            await db.close()
+        for name, expected in reference.items():
+            assert answers[name] == expected, name
+
+    asyncio.run(run())
+
+
+def test_sharded_reopens_its_shards(reference, tmp_path):
+    async def run():
+        db = backend("sharded", tmp_path)
+        await fill(db)
+        await db.close()
+
+        # A new backend finds the shards on disk, so searches across clusters see them
+        reopened = backend("sharded", tmp_path)
+        await reopened.initialize()
+        try:
+            answers = await reads(reopened)
+        finally:
+            await reopened.close()
+        assert answers == reference
+
+    asyncio.run(run())
+
+
+def test_memory_snapshot_round_trip(reference, tmp_path):
+    async def run():
+        path = str(tmp_path / "memory.pkl")
+        db = MemoryBackend(snapshot_path=path)
+        await fill(db)
+        await db.close()
+
+        restored = MemoryBackend(snapshot_path=path)
+        await restored.initialize()
+        try:
+            answers = await reads(restored)
+        finally:
+            await restored.close()
+        assert answers == reference
+
+    asyncio.run(run())
+
+
+def test_memory_snapshots_copy_only_what_changed(reference, tmp_path):
+    async def run():
+        path = str(tmp_path / "memory.pkl")
+        db = MemoryBackend(snapshot_path=path)
+        await fill(db)
+        await db.snapshot()
+        assert not db.dirty
+        saved = dict(db._saved["events"])
+
+        # One more event for one job: only its eventlog is copied again
+        await db.record_events("dane", [eventlog(99, 5000.0, 1000, 1)[0]])
+        assert db.dirty
+        await db.snapshot()
+        changed = [key for key, log in db._saved["events"].items() if saved.get(key) is not log]
+        assert changed == [("dane", 99)]
+        await db.close()
+
+        restored = MemoryBackend(snapshot_path=path)
+        await restored.initialize()
+        try:
+            answers = await reads(restored)
+            assert (await restored.get_job("dane", 99)).state == "NEW"
+        finally:
+            await restored.close()
+        assert answers["job dane 99"] is not None
+        assert answers["usage"] == reference["usage"]
+
+    asyncio.run(run())
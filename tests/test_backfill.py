@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.events.backfill import Backfill, eventlog_events
+
+# The historical backfill against a stand-in Flux (python -m pytest tests/test_backfill.py,
+# no Flux needed)
+
+R = json.dumps({"execution": {"R_lite": [{"rank": "0", "children": {"core": "0-3"}}]}})
+
+
+def eventlog(t, names):
+    return "\n".join(
+        json.dumps({"timestamp": t + i, "name": name, "context": {"userid": 1000}})
+        for i, name in enumerate(names)
+    )
+
+
+RAN = ["submit", "validate", "depend", "priority", "alloc", "start", "finish", "release"]
+RAN += ["free", "clean"]
+
+# Job 3 was canceled before it got resources, so it has no R
+JOBS = {
+    1: {"eventlog": eventlog(100.0, RAN), "R": R},
+    2: {"eventlog": eventlog(200.0, RAN), "R": R},
+    3: {"eventlog": eventlog(300.0, ["submit", "validate", "exception", "clean"])},
+}
+
+
+class Future:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+
+    def get(self):
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class StandInFlux:
+    """
+    Answers job-info.lookup from JOBS, like job-info: asking for R fails without one.
+    """
+
+    def __init__(self):
+        self.lookups = []
+
+    def rpc(self, topic, payload):
+        assert topic == "job-info.lookup"
+        self.lookups.append(payload["id"])
+        job = JOBS.get(payload["id"])
+        if job is None:
+            return Future(error=FileNotFoundError(2, "No such job"))
+        if "R" in payload["keys"] and "R" not in job:
+            return Future(error=FileNotFoundError(2, "No such file or directory"))
+        return Future({key: job[key] for key in payload["keys"]})
+
+
+class StandInBackfill(Backfill):
+    def __init__(self, db, jobids, **kwargs):
+        super().__init__(db, "test", **kwargs)
+        self.jobids = jobids
+        self.handle = StandInFlux()
+
+    def _connect(self):
+        return self.handle
+
+    def _list_jobs(self, handle):
+        return list(self.jobids)
+
+
+def test_eventlog_events():
+    events = eventlog_events(7, eventlog(100.0, ["submit", "alloc", "start"]) + "\n\n", R)
+    assert [(e["id"], e["type"], e["seq"], e["timestamp"]) for e in events] == [
+        (7, "submit", 0, 100.0),
+        (7, "alloc", 1, 101.0),
+        (7, "start", 2, 102.0),
+    ]
+    assert events[1]["R"] == R and "R" not in events[0]
+    assert events[0]["context"] == {"userid": 1000}
+
+
+def test_backfill_imports_each_job_once():
+    async def run():
+        db = MemoryBackend()
+
+        # Job 4 is listed but its lookup fails, so it is counted and skipped
+        backfill = StandInBackfill(db, [1, 2, 3, 4], concurrency=2, batch_size=5)
+        counts = await backfill.run()
+        assert (counts["jobs"], counts["failed"]) == (3, 1)
+        assert counts["events"] == 2 * len(RAN) + 4
+
+        job = await db.get_job("test", 1)
+        assert (job.state, job.ncores, job.run_seconds) == ("INACTIVE", 4, 1.0)
+        assert (await db.get_job("test", 3)).state == "INACTIVE"
+        history = await db.get_event_history("test", 2)
+        assert [e.seq for e in history] == list(range(len(RAN)))
+
+        # Again: finished jobs we have are skipped without a lookup, the rest are asked again
+        again = StandInBackfill(db, [1, 2, 3, 4])
+        counts = await again.run()
+        assert again.handle.lookups == [4, 4]
+        assert (counts["jobs"], counts["events"], counts["failed"]) == (0, 0, 1)
+        assert len(await db.get_event_history("test", 2)) == len(RAN)
+
+    asyncio.run(run())
+
+
+def test_unfinished_jobs_are_looked_up_again():
+    async def run():
+        db = MemoryBackend()
+        events = eventlog_events(1, eventlog(100.0, RAN[:6]), R)
+        await db.record_events("test", events)
+        assert (await db.get_job("test", 1)).state == "RUN"
+
+        backfill = StandInBackfill(db, [1], include_active=True)
+        counts = await backfill.run()
+        assert counts["jobs"] == 1 and counts["events"] == len(RAN)
+        assert (await db.get_job("test", 1)).state == "INACTIVE"
+        assert len(await db.get_event_history("test", 1)) == len(RAN)
+
+    asyncio.run(run())
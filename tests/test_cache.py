@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from flux_mcp_server.utils.cache import TTLCache
+
+# The TTL cache behind job listings (python -m pytest tests/test_cache.py, no Flux needed)
+
+
+class Fetcher:
+    """
+    A slow lookup that counts its calls, and fails while fail is set.
+    """
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("job-list is down")
+        return {"jobs": self.calls}
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def run():
+        cache, fetch = TTLCache(ttl=10), Fetcher()
+        values = await asyncio.gather(*(cache.get("jobs", fetch) for _ in range(20)))
+        assert fetch.calls == 1 and all(value == {"jobs": 1} for value in values)
+        assert (cache.misses, cache.coalesced, cache.hits) == (1, 19, 0)
+
+        # Then it's a hit until it expires, and other keys are fetched on their own
+        assert await cache.get("jobs", fetch) == {"jobs": 1}
+        assert cache.hits == 1
+        await cache.get("other", fetch)
+        assert fetch.calls == 2
+
+    asyncio.run(run())
+
+
+def test_entries_expire():
+    async def run():
+        cache, fetch = TTLCache(ttl=0.05), Fetcher(delay=0)
+        await cache.get("jobs", fetch)
+        await asyncio.sleep(0.1)
+        assert await cache.get("jobs", fetch) == {"jobs": 2}
+
+    asyncio.run(run())
+
+
+def test_errors_are_not_cached():
+    async def run():
+        cache, fetch = TTLCache(ttl=10), Fetcher()
+        fetch.fail = True
+
+        # Everyone waiting on the failed fetch gets its error
+        results = await asyncio.gather(
+            *(cache.get("jobs", fetch) for _ in range(5)), return_exceptions=True
+        )
+        assert fetch.calls == 1 and all(isinstance(r, RuntimeError) for r in results)
+
+        # And the next call tries again
+        fetch.fail = False
+        assert await cache.get("jobs", fetch) == {"jobs": 2}
+        assert await cache.get("jobs", fetch) == {"jobs": 2}
+
+    asyncio.run(run())
+
+
+def test_a_caller_giving_up_does_not_cancel_the_fetch():
+    async def run():
+        cache, fetch = TTLCache(ttl=10), Fetcher(delay=0.1)
+        waiter = asyncio.ensure_future(cache.get("jobs", fetch))
+        await asyncio.sleep(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(cache.get("jobs", fetch), 0.01)
+        waiter.cancel()
+
+        # The fetch finished anyway, and was cached
+        await asyncio.sleep(0.15)
+        assert await cache.get("jobs", fetch) == {"jobs": 1}
+        assert fetch.calls == 1
+
+    asyncio.run(run())
+
+
+def test_oldest_entries_are_evicted():
+    async def run():
+        cache, fetch = TTLCache(ttl=10, max_entries=2), Fetcher(delay=0)
+        for key in ["a", "b", "c"]:
+            await cache.get(key, fetch)
+        assert list(cache._entries) == ["b", "c"]
+        await cache.get("a", fetch)
+        assert fetch.calls == 4
+
+    asyncio.run(run())
@@ -0,0 +1,90 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.db.models import export_key, parse_export_key
+from flux_mcp_server.utils.auth import bearer_token, token_matches
+from flux_mcp_server.utils.ndjson import ndjson
+
+# Export keys, auth, and resuming a gzip'd NDJSON export
+# (python -m pytest tests/test_export.py, no Flux needed)
+
+
+def test_parse_export_key():
+    assert parse_export_key("jobs", "dane,1234") == ("dane", 1234)
+    assert parse_export_key("events", "dane,1234,3,100.5,start") == (
+        "dane",
+        1234,
+        3,
+        100.5,
+        "start",
+    )
+
+    # We split from the right, so a cluster name can have commas
+    assert parse_export_key("jobs", "lab,west,7") == ("lab,west", 7)
+    assert parse_export_key("events", "a,b,7,0,0.0,submit")[:2] == ("a,b", 7)
+
+
+@pytest.mark.parametrize(
+    "table,text",
+    [("jobs", ""), ("jobs", "dane"), ("jobs", "dane,one"), ("events", "dane,1,2,x,start")],
+)
+def test_parse_export_key_errors(table, text):
+    with pytest.raises(ValueError):
+        parse_export_key(table, text)
+
+
+def test_export_auth():
+    assert bearer_token("Bearer s3cret") == "s3cret"
+    assert bearer_token("bearer  s3cret ") == "s3cret"
+    assert bearer_token("Basic s3cret") is None and bearer_token(None) is None
+    assert bearer_token("Bearer ") is None
+
+    assert token_matches("s3cret", "s3cret")
+    assert not token_matches("s3cret", "s3cre")
+    assert not token_matches("s3cret", None)
+
+    # No token configured means nobody matches, and non-ASCII is just a mismatch
+    assert not token_matches(None, "anything") and not token_matches("", "")
+    assert not token_matches("s3cret", "sécret")
+    assert token_matches("sécret", "sécret")
+
+
+async def export(db, table, after=None, chunk_size=4):
+    chunks = db.export_rows(table, after=after, chunk_size=chunk_size)
+    return b"".join([data async for data in ndjson(chunks)])
+
+
+def test_gzip_ndjson_resumes_after_the_last_row():
+    async def run():
+        db = MemoryBackend()
+        for job_id in range(1, 11):
+            await db.record_events(
+                "dane",
+                [
+                    {"id": job_id, "type": "submit", "timestamp": job_id, "seq": 0},
+                    {"id": job_id, "type": "validate", "timestamp": job_id + 0.5, "seq": 1},
+                ],
+            )
+
+        for table, total in [("jobs", 10), ("events", 20)]:
+            rows = [
+                json.loads(line) for line in gzip.decompress(await export(db, table)).splitlines()
+            ]
+            assert len(rows) == total
+
+            # The connection dropped partway: resume after the last row we got
+            received = rows[:7]
+            last = ",".join(str(value) for value in export_key(table, received[-1]))
+            data = await export(db, table, after=parse_export_key(table, last))
+            resumed = [json.loads(line) for line in gzip.decompress(data).splitlines()]
+            assert received + resumed == rows
+
+        # Nothing left is still a valid (empty) gzip stream
+        data = await export(db, "jobs", after=parse_export_key("jobs", "dane,10"))
+        assert gzip.decompress(data) == b""
+
+    asyncio.run(run())
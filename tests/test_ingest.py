@@ -0,0 +1,156 @@
+import asyncio
+import random
+import sqlite3
+from dataclasses import astuple
+
+import pytest
+
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.db.views import SQLAlchemyBackend
+
+# Replaying events (a reconnect, a backfill, a retried batch) must not change
+# anything, on every write path. No Flux needed (python -m pytest tests/test_ingest.py).
+
+CLUSTER = "test"
+LIFECYCLE = ["submit", "validate", "depend", "priority", "alloc", "start", "finish", "release"]
+LIFECYCLE += ["free", "clean"]
+
+# The Core path, the sqlite writer thread, the ORM path (no native upsert), and memory
+PATHS = ["core", "writer", "orm", "memory"]
+
+
+def eventlog(job_id, t, user=1000, status=0):
+    """
+    One job's eventlog, from submit to clean, a second apart.
+    """
+    events = []
+    for seq, name in enumerate(LIFECYCLE):
+        event = {"id": job_id, "type": name, "timestamp": t + seq, "seq": seq, "context": {}}
+        if name == "submit":
+            event["context"] = {"userid": user}
+        elif name == "alloc":
+            event["R"] = {"execution": {"R_lite": [{"rank": "0", "children": {"core": "0-3"}}]}}
+        elif name == "finish":
+            event["context"] = {"status": status}
+        events.append(event)
+    return events
+
+
+def interleaved(jobs=20):
+    events = [e for job_id in range(1, jobs + 1) for e in eventlog(job_id, 1000.0 + job_id)]
+    return sorted(events, key=lambda e: e["timestamp"])
+
+
+def backend(path, tmp_path):
+    if path == "memory":
+        return MemoryBackend()
+    return SQLAlchemyBackend(
+        f"sqlite+aiosqlite:///{tmp_path}/{path}.db", sqlite_writer=path == "writer"
+    )
+
+
+async def ingest(db, path, events, batch=7):
+    if path == "orm":
+        for event in events:
+            await db._record_event_orm(CLUSTER, event)
+        return
+    for i in range(0, len(events), batch):
+        await db.record_events(CLUSTER, events[i : i + batch])
+
+
+async def dump(db):
+    """
+    Everything a reader can see: jobs, their events, and usage.
+    """
+    jobs = sorted(astuple(job) for job in await db.search_jobs(limit=None))
+    events = [
+        [astuple(event) for event in await db.get_event_history(CLUSTER, job[0])] for job in jobs
+    ]
+    usage = [astuple(record) for record in await db.get_usage()]
+    return jobs, events, usage
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_replay_is_a_noop(path, tmp_path):
+    async def run():
+        db = backend(path, tmp_path)
+        await db.initialize()
+        try:
+            events = interleaved()
+            await ingest(db, path, events)
+            once = await dump(db)
+            assert len(once[0]) == 20 and all(len(log) == len(LIFECYCLE) for log in once[1])
+            assert once[2][0][2] == 20
+
+            # Again, in another order and in other batches
+            replay = events[:]
+            random.Random(1).shuffle(replay)
+            await ingest(db, path, replay, batch=13)
+            await ingest(db, path, events[:40], batch=1)
+            assert await dump(db) == once
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_old_events_do_not_rewind_a_job(path, tmp_path):
+    async def run():
+        db = backend(path, tmp_path)
+        await db.initialize()
+        try:
+            events = eventlog(1, 1000.0)
+            await ingest(db, path, events)
+            done = await db.get_job(CLUSTER, 1)
+            assert done.state == "INACTIVE" and done.last_updated == events[-1]["timestamp"]
+
+            # A late submit (or start) is older than the snapshot, so it changes nothing
+            await ingest(db, path, [events[0]])
+            await ingest(db, path, [events[5]])
+            job = await db.get_job(CLUSTER, 1)
+            assert astuple(job) == astuple(done)
+
+            # A new event (e.g., a resubmit with a new seq) still applies
+            later = dict(events[0], timestamp=events[-1]["timestamp"] + 1, seq=len(LIFECYCLE))
+            await ingest(db, path, [later])
+            job = await db.get_job(CLUSTER, 1)
+            assert job.last_updated == later["timestamp"] and job.state != "INACTIVE"
+            assert len(await db.get_event_history(CLUSTER, 1)) == len(LIFECYCLE) + 1
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def table_rows(path):
+    """
+    Every row of the tables ingest writes, straight from the sqlite file.
+    """
+    with sqlite3.connect(path) as conn:
+        return {
+            "jobs": conn.execute("SELECT * FROM jobs ORDER BY cluster, job_id").fetchall(),
+            "events": conn.execute(
+                "SELECT cluster, job_id, seq, timestamp, event_type, payload FROM events "
+                "ORDER BY cluster, job_id, seq, timestamp, event_type"
+            ).fetchall(),
+            "usage": conn.execute("SELECT * FROM usage ORDER BY cluster, user").fetchall(),
+        }
+
+
+def test_sql_paths_write_the_same_rows(tmp_path):
+    async def run():
+        events = interleaved()
+        for path in ["core", "writer", "orm"]:
+            db = backend(path, tmp_path)
+            await db.initialize()
+            try:
+                await ingest(db, path, events)
+            finally:
+                await db.close()
+
+    asyncio.run(run())
+    rows = {path: table_rows(tmp_path / f"{path}.db") for path in ["core", "writer", "orm"]}
+    assert len(rows["core"]["jobs"]) == 20 and len(rows["core"]["events"]) == 20 * len(LIFECYCLE)
+    assert rows["writer"] == rows["core"]
+    assert rows["orm"] == rows["core"]
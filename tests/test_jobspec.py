@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from flux_mcp_server.clusters.jobspec import JobspecCache, JobspecTemplate
+
+# The jobspec cache and templates (python -m pytest tests/test_jobspec.py, no Flux needed)
+
+JOBSPEC = {
+    "version": 1,
+    "resources": [{"type": "slot", "count": 1, "label": "task", "with": [{"type": "core"}]}],
+    "tasks": [{"command": ["hostname"], "slot": "task", "count": {"per_slot": 1}}],
+    "attributes": {"system": {"duration": 0}},
+}
+
+YAML = """
+version: 1
+resources:
+  - type: slot
+    count: 1
+    label: task
+    with:
+      - type: core
+tasks:
+  - command: [hostname]
+    slot: task
+    count:
+      per_slot: 1
+attributes:
+  system:
+    duration: 0
+"""
+
+TEMPLATE = {
+    "version": 1,
+    "resources": [{"type": "slot", "count": "{{ nodes }}", "label": "task", "with": []}],
+    "tasks": [{"command": ["app", "--size={{ size }}"], "slot": "task", "count": {"per_slot": 1}}],
+    "attributes": {"system": {"duration": 0, "cwd": "/tmp"}},
+}
+
+
+def test_load_parses_once():
+    cache = JobspecCache()
+    text = json.dumps(JOBSPEC)
+    first = cache.load(text)
+    assert cache.load(text) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert json.loads(first.encoded) == JOBSPEC
+
+    # YAML and mappings parse to the same jobspec, and key order doesn't matter
+    assert cache.load(YAML).spec == JOBSPEC
+    reordered = dict(reversed(list(JOBSPEC.items())))
+    assert cache.load(JOBSPEC) is cache.load(reordered)
+
+    # A parsed jobspec goes through as is
+    assert cache.load(first) is first
+
+
+def test_invalid_jobspecs_are_not_cached():
+    cache = JobspecCache()
+    for bad in ["{not: [valid", {"version": 1}, dict(JOBSPEC, tasks=[{"command": []}])]:
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                cache.load(bad)
+    assert cache.hits == 0 and len(cache._entries) == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = JobspecCache(max_size=2)
+    specs = [dict(JOBSPEC, tasks=[dict(JOBSPEC["tasks"][0], command=[str(i)])]) for i in range(3)]
+    first = cache.load(specs[0])
+    cache.load(specs[1])
+    cache.load(specs[0])
+    cache.load(specs[2])
+    assert len(cache._entries) == 2
+    assert cache.load(specs[0]) is first
+    misses = cache.misses
+    cache.load(specs[1])
+    assert cache.misses == misses + 1
+
+
+def test_template_render():
+    template = JobspecTemplate(TEMPLATE)
+    assert template.parameters == ["nodes", "size"]
+
+    spec = template.render({"nodes": 4, "size": 128}).spec
+    assert spec["resources"][0]["count"] == 4
+    assert spec["tasks"][0]["command"] == ["app", "--size=128"]
+
+    # The template is untouched, and parts without placeholders are shared
+    assert TEMPLATE["resources"][0]["count"] == "{{ nodes }}"
+    assert spec["attributes"] is TEMPLATE["attributes"]
+
+    with pytest.raises(ValueError, match="size"):
+        template.render({"nodes": 1})
+
+
+def test_cache_render():
+    cache = JobspecCache()
+    assert cache.template(json.dumps(TEMPLATE)) is cache.template(json.dumps(TEMPLATE))
+
+    rendered = cache.render(
+        TEMPLATE, [{"nodes": 1, "size": 1}, {"nodes": 2}, {"nodes": 3, "size": 3}]
+    )
+    assert rendered[0].spec["resources"][0]["count"] == 1
+    assert isinstance(rendered[1], ValueError) and "size" in str(rendered[1])
+    assert rendered[2].spec["tasks"][0]["command"][1] == "--size=3"
+
+    # A rendered jobspec that isn't valid is an error too
+    bad = dict(TEMPLATE, tasks=[{"command": "{{ command }}"}])
+    assert isinstance(cache.render(bad, [{"command": []}])[0], ValueError)
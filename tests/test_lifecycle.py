@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from flux_mcp_server.db.lifecycle import apply_event
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.db.resources import decode_resources, idset_count
+from flux_mcp_server.db.views import SQLAlchemyBackend
+
+# Job snapshots derived from eventlogs at ingest, the same on every write path
+# (python -m pytest tests/test_lifecycle.py, no Flux needed).
+
+CLUSTER = "test"
+
+# The Core path, the sqlite writer thread, the ORM path (no native upsert), and memory
+PATHS = ["core", "writer", "orm", "memory"]
+
+R = {
+    "version": 1,
+    "execution": {"R_lite": [{"rank": "0-1", "children": {"core": "0-3", "gpu": "0"}}]},
+}
+
+
+def backend(path, tmp_path):
+    if path == "memory":
+        return MemoryBackend()
+    return SQLAlchemyBackend(
+        f"sqlite+aiosqlite:///{tmp_path}/{path}.db", sqlite_writer=path == "writer"
+    )
+
+
+async def ingest(db, path, events):
+    for event in events:
+        if path == "orm":
+            await db._record_event_orm(CLUSTER, event)
+        else:
+            await db.record_events(CLUSTER, [event])
+
+
+def event(job_id, name, t, seq, **extra):
+    return {"id": job_id, "type": name, "timestamp": t, "seq": seq, **extra}
+
+
+def test_idset_count():
+    assert idset_count("0-3,7") == 5
+    assert idset_count("5") == 1
+    assert idset_count("") == 0
+    assert idset_count(None) == 0
+
+
+def test_decode_resources():
+    assert decode_resources(R) == (2, 8, 2)
+    text = '{"execution": {"R_lite": [{"rank": "3", "children": {}}]}}'
+    assert decode_resources(text) == (1, 0, 0)
+    assert decode_resources(None) is None
+    assert decode_resources({"execution": {}}) is None
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_timings(path, tmp_path):
+    async def run():
+        db = backend(path, tmp_path)
+        await db.initialize()
+        try:
+            await ingest(
+                db,
+                path,
+                [
+                    event(1, "submit", 100.0, 0, context={"userid": 1000}),
+                    event(1, "alloc", 110.0, 1, R=R),
+                    event(1, "start", 112.0, 2),
+                    event(1, "finish", 142.0, 3, context={"status": 256}),
+                    # Canceled while it was waiting, so it never ran
+                    event(2, "submit", 100.0, 0, context={"userid": 1000}),
+                    event(2, "finish", 150.0, 1, context={"status": 15}),
+                ],
+            )
+            job = await db.get_job(CLUSTER, 1)
+            assert (job.submit_time, job.alloc_time, job.start_time) == (100.0, 110.0, 112.0)
+            assert (job.finish_time, job.wait_seconds, job.run_seconds) == (142.0, 10.0, 30.0)
+            assert (job.nnodes, job.ncores, job.ngpus, job.exit_code) == (2, 8, 2, 256)
+
+            job = await db.get_job(CLUSTER, 2)
+            assert job.wait_seconds is None and job.run_seconds is None
+            assert job.finish_time == 150.0 and job.exit_code == 15
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_events_before_submit_are_dropped(path, tmp_path):
+    async def run():
+        db = backend(path, tmp_path)
+        await db.initialize()
+        try:
+            # We joined mid-stream, so there is no job row to stamp
+            await ingest(db, path, [event(3, "start", 100.0, 2)])
+            assert await db.get_job(CLUSTER, 3) is None
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+# A full eventlog, with the state Flux has the job in after each event
+EVENTLOG = [
+    ("submit", {"userid": 1000}, "NEW"),
+    ("validate", {}, "DEPEND"),
+    ("depend", {}, "PRIORITY"),
+    ("priority", {"priority": 16}, "SCHED"),
+    ("alloc", {}, "RUN"),
+    ("start", {}, "RUN"),
+    # A non-fatal exception doesn't move the job, a fatal one sends it to cleanup
+    ("exception", {"type": "test", "severity": 1}, "RUN"),
+    ("exception", {"type": "cancel", "severity": 0}, "CLEANUP"),
+    ("finish", {"status": 15}, "CLEANUP"),
+    ("release", {"ranks": "all", "final": True}, "CLEANUP"),
+    ("free", {}, "CLEANUP"),
+    ("clean", {}, "INACTIVE"),
+]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_states_follow_the_eventlog(path, tmp_path):
+    async def run():
+        db = backend(path, tmp_path)
+        await db.initialize()
+        job = None
+        try:
+            for seq, (name, context, state) in enumerate(EVENTLOG):
+                timestamp = 100.0 + seq
+                await ingest(db, path, [event(5, name, timestamp, seq, context=context)])
+
+                # The write path agrees with apply_event (and Flux) after every event
+                job = apply_event(job, CLUSTER, 5, name, context, timestamp)
+                assert job.state == state, name
+                assert (await db.get_job(CLUSTER, 5)).state == state, name
+        finally:
+            await db.close()
+
+    asyncio.run(run())
@@ -0,0 +1,170 @@
+import asyncio
+import errno
+import threading
+
+import pytest
+
+from flux_mcp_server.clusters.pool import HandlePool, pipeline
+
+# Per-thread Flux handles and pipelined requests, with stand-in handles and futures
+# (python -m pytest tests/test_pool.py, no Flux needed)
+
+
+class StandInHandle:
+    """
+    A handle that answers pings, unless it has lost its connection.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self.thread = threading.get_ident()
+        self.connected = True
+        self.pings = 0
+
+    def rpc(self, topic, payload):
+        assert topic == "broker.ping"
+        self.pings += 1
+        if not self.connected:
+            raise OSError(errno.ECONNRESET, "Connection reset by peer")
+        return self
+
+    def get(self):
+        return {}
+
+
+class StandInPool(HandlePool):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.opened = []
+
+    def _connect(self):
+        handle = StandInHandle(len(self.opened))
+        self.opened.append(handle)
+        return handle
+
+
+def which(handle):
+    return handle
+
+
+def test_threads_keep_their_own_handle():
+    async def run():
+        pool = StandInPool(workers=4)
+        barrier = threading.Barrier(4)
+
+        def hold(handle):
+            # Every worker is busy at once, so each opens its own handle
+            barrier.wait(timeout=5)
+            return handle
+
+        try:
+            first = await asyncio.gather(*(pool.run(pool.call, hold) for _ in range(4)))
+            assert len({handle.number for handle in first}) == 4
+            assert all(handle.thread != threading.get_ident() for handle in first)
+
+            # And later calls reuse them (on the thread that opened each)
+            later = await asyncio.gather(*(pool.run(pool.call, which) for _ in range(20)))
+            assert len(pool.opened) == 4
+            assert all(handle.thread == pool.opened[handle.number].thread for handle in later)
+            assert len(pool._handles) == 4
+        finally:
+            pool.close()
+        assert pool._handles == {}
+
+    asyncio.run(run())
+
+
+def test_a_disconnected_handle_is_dropped():
+    pool = StandInPool(workers=1)
+    handle = pool.call(which)
+
+    def disconnected(handle):
+        raise OSError(errno.ECONNRESET, "Connection reset by peer")
+
+    def failed(handle):
+        raise OSError(errno.ENOENT, "No such job")
+
+    # A request that fails keeps the handle, a lost connection doesn't (and isn't retried)
+    with pytest.raises(OSError):
+        pool.call(failed)
+    assert pool.call(which) is handle
+    with pytest.raises(OSError):
+        pool.call(disconnected)
+    assert len(pool.opened) == 1
+
+    replacement = pool.call(which)
+    assert replacement is not handle and len(pool.opened) == 2
+    pool.close()
+
+
+def test_idle_handles_are_checked():
+    pool = StandInPool(workers=1, health_interval=0)
+    handle = pool.call(which)
+    assert pool.call(which) is handle and handle.pings == 1
+
+    # The broker went away while we were idle, so we reconnect before the call
+    handle.connected = False
+    replacement = pool.call(which)
+    assert replacement is not handle and replacement.pings == 0
+
+    # With a long interval, we don't ping at all
+    pool = StandInPool(workers=1, health_interval=3600)
+    handle = pool.call(which)
+    pool.call(which)
+    assert handle.pings == 0
+
+
+def test_check():
+    pool = StandInPool(workers=1)
+    assert pool.check()
+    pool.opened[0].connected = False
+    assert not pool.check()
+
+    # A failed check drops the handle, so the next call reconnects
+    assert pool.call(which) is pool.opened[1]
+
+
+class Requests:
+    """
+    Stands in for a handle's async requests, counting how many are outstanding.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.most = 0
+
+    def send(self, item):
+        if item == "unsendable":
+            raise ValueError("invalid jobspec")
+        self.in_flight += 1
+        self.most = max(self.most, self.in_flight)
+        return item
+
+    def receive(self, item, future):
+        self.in_flight -= 1
+        if item == "rejected":
+            raise OSError(errno.EPERM, "Operation not permitted")
+        return {"id": future}
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 3, 256])
+def test_pipeline_bounds_requests_in_flight(max_in_flight):
+    requests = Requests()
+    items = list(range(10))
+    results = pipeline(items, requests.send, requests.receive, max_in_flight)
+    assert results == [{"id": i} for i in items]
+    assert requests.most == min(max_in_flight, len(items)) and requests.in_flight == 0
+
+
+def test_pipeline_errors_are_per_item():
+    requests = Requests()
+    items = [1, "unsendable", 3, "rejected", 5]
+    results = pipeline(items, requests.send, requests.receive, max_in_flight=2)
+    assert results == [
+        {"id": 1},
+        {"error": "invalid jobspec"},
+        {"id": 3},
+        {"error": "[Errno 1] Operation not permitted"},
+        {"id": 5},
+    ]
+    assert pipeline([], requests.send, requests.receive) == []
@@ -0,0 +1,88 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from flux_mcp_server.db.profiler import QueryProfiler, query_shape
+
+# The slow query log (python -m pytest tests/test_profiler.py, no Flux needed)
+
+SELECT = "SELECT * FROM jobs WHERE job_id IN (?, ?, ?)"
+
+
+class Explain:
+    """
+    Stands in for EXPLAIN, counting how often a plan was asked for.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"plan {self.calls}"
+
+
+def test_shapes_ignore_parameters():
+    assert query_shape(SELECT) == "SELECT * FROM jobs WHERE job_id IN (...)"
+    assert query_shape("SELECT *\n  FROM jobs WHERE job_id IN (?, ?)") == query_shape(SELECT)
+    assert query_shape("SELECT * FROM jobs WHERE job_id = ?") == (
+        "SELECT * FROM jobs WHERE job_id = ?"
+    )
+
+
+def test_plans_are_captured_for_slow_statements_on_a_new_max():
+    profiler, explain = QueryProfiler(threshold_ms=10), Explain()
+
+    # Fast statements are counted, but not explained
+    profiler.record(SELECT, 0.001, explain=explain)
+    assert explain.calls == 0
+
+    profiler.record(SELECT, 0.050, explain=explain)
+    assert explain.calls == 1
+
+    # Slow again, but not the slowest, so the plan we have stands
+    profiler.record(SELECT.replace("?, ?, ?", "?, ?"), 0.020, explain=explain)
+    assert explain.calls == 1
+
+    profiler.record(SELECT, 0.100, explain=explain)
+    assert explain.calls == 2
+
+    [stats] = profiler.top()
+    assert (stats["count"], stats["slow"], stats["plan"]) == (4, 3, "plan 2")
+    assert stats["max_ms"] == 100.0
+
+
+def test_a_failed_explain_still_records():
+    def explain():
+        raise RuntimeError("no plans here")
+
+    profiler = QueryProfiler(threshold_ms=10)
+    profiler.record(SELECT, 0.050, explain=explain)
+    [stats] = profiler.top()
+    assert stats["slow"] == 1 and stats["plan"] is None
+
+
+def test_shapes_are_bounded():
+    profiler = QueryProfiler(max_shapes=2)
+    for table in ["a", "b", "c"]:
+        profiler.record(f"SELECT * FROM {table}", 0.001)
+    assert sorted(profiler.stats) == ["SELECT * FROM a", "SELECT * FROM b"]
+
+
+def test_engine_statements_are_explained(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/profile.db")
+        profiler = QueryProfiler(threshold_ms=0)
+        profiler.attach(engine)
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE jobs (job_id INTEGER)"))
+                await conn.execute(text("SELECT * FROM jobs WHERE job_id = :id"), {"id": 1})
+        finally:
+            await engine.dispose()
+
+        select = profiler.stats["SELECT * FROM jobs WHERE job_id = ?"]
+        assert select.count == 1 and "SCAN" in select.plan
+
+    asyncio.run(run())
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
+from flux_mcp_server.clusters.readthrough import ReadThroughJobInfo
+from flux_mcp_server.db.memory import MemoryBackend
+
+# Job info from the events database before Flux (python -m pytest tests/test_readthrough.py,
+# no Flux needed)
+
+AUTH = AuthContext(user_id="test")
+
+
+class StandInHandle(ClusterHandle):
+    """
+    A cluster that counts get_job_info calls, and says every job is running.
+    """
+
+    def __init__(self, name="local", config=None):
+        super().__init__(name, config or {})
+        self.lookups = 0
+
+    def connect(self):
+        return True
+
+    def submit(self, jobspec, auth):
+        raise NotImplementedError
+
+    def cancel(self, job_id, auth):
+        return False
+
+    def get_job_info(self, job_id, auth):
+        self.lookups += 1
+        return {"id": job_id, "state": "RUN", "user": 1000, "cwd": "/tmp"}
+
+    def list_jobs(self, auth, **filters):
+        return []
+
+    def resource_status(self):
+        return []
+
+    def close(self):
+        pass
+
+
+async def submitted(db, job_id, age, *more):
+    """
+    A job whose last event was age seconds ago.
+    """
+    t = time.time() - age
+    events = [{"id": job_id, "type": "submit", "timestamp": t, "context": {"userid": 1000}}]
+    events += [{"id": job_id, "type": name, "timestamp": t} for name in more]
+    await db.record_events("local", events)
+
+
+def test_fresh_and_finished_jobs_come_from_the_database():
+    async def run():
+        db, handle = MemoryBackend(), StandInHandle()
+        info = ReadThroughJobInfo(db, max_age=10)
+        await submitted(db, 1, 1.0)
+        await submitted(db, 2, 3600.0, "clean")
+
+        fresh = await info.get(handle, 1, AUTH)
+        assert (fresh["source"], fresh["state"], fresh["user"]) == ("database", "NEW", 1000)
+        assert 0.5 < fresh["age"] < 10
+
+        # A finished job never changes, however old it is
+        finished = await info.get(handle, 2, AUTH)
+        assert (finished["source"], finished["state"]) == ("database", "INACTIVE")
+        assert handle.lookups == 0
+
+    asyncio.run(run())
+
+
+def test_stale_and_unknown_jobs_ask_flux_once_per_max_age():
+    async def run():
+        db, handle = MemoryBackend(), StandInHandle()
+        info = ReadThroughJobInfo(db, max_age=10)
+        await submitted(db, 1, 60.0)
+
+        for job_id in [1, 99]:
+            first = await info.get(handle, job_id, AUTH)
+            assert (first["source"], first["state"], first["age"]) == ("flux", "RUN", 0.0)
+            again = await info.get(handle, job_id, AUTH)
+            assert again["source"] == "cache"
+        assert handle.lookups == 2
+
+        # The caller can ask for fresher answers than the default
+        assert (await info.get(handle, 1, AUTH, max_age=0))["source"] == "flux"
+        assert (await info.get(handle, 1, AUTH, max_age=120))["source"] == "database"
+        assert handle.lookups == 3
+
+    asyncio.run(run())
+
+
+def test_the_cache_is_bounded():
+    async def run():
+        handle = StandInHandle()
+        info = ReadThroughJobInfo(MemoryBackend(), max_age=10, max_entries=2)
+        for job_id in [1, 2, 3]:
+            await info.get(handle, job_id, AUTH)
+        assert list(info._cache) == [("local", 2), ("local", 3)]
+        assert (await info.get(handle, 1, AUTH))["source"] == "flux"
+
+    asyncio.run(run())
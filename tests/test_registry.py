@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+from flux_mcp_server.clusters.interface import ClusterHandle
+from flux_mcp_server.clusters.registry import ClusterRegistry
+
+# Cluster registration and health probes, against stand-in clusters that fail,
+# hang and recover (python -m pytest tests/test_registry.py, no Flux needed).
+
+
+class StandInHandle(ClusterHandle):
+    """
+    A cluster whose connect does what its config says: "ok", "fail" or "hang"
+    (until released). Set config["mode"] to change it between probes.
+    """
+
+    def __init__(self, cluster_id, config):
+        super().__init__(cluster_id, config)
+        self.connects = 0
+        self.released = threading.Event()
+
+    def connect(self):
+        self.connects += 1
+        if self.config["mode"] == "hang":
+            self.released.wait(5)
+        if self.config["mode"] == "fail":
+            raise ConnectionError("connection refused")
+        return True
+
+    def submit(self, jobspec, auth):
+        raise NotImplementedError
+
+    def cancel(self, job_id, auth):
+        return False
+
+    def get_job_info(self, job_id, auth):
+        return {}
+
+    def list_jobs(self, auth, **filters):
+        return []
+
+    def resource_status(self):
+        return []
+
+    def close(self):
+        self.released.set()
+
+
+def registry(**kwargs):
+    registry = ClusterRegistry(timeout=0.1, probe_interval=30.0, **kwargs)
+    registry._handle_types["standin"] = StandInHandle
+    return registry
+
+
+def test_register_many_degrades_instead_of_failing():
+    async def run():
+        clusters = {
+            "dane": {"type": "standin", "mode": "ok"},
+            "down": {"type": "standin", "mode": "fail"},
+            "bad": {"type": "ssh"},
+        }
+        reg = registry()
+        assert await reg.register_many(clusters) == {"dane": True, "down": False}
+
+        # The dead cluster stays registered, but isn't offered for work
+        assert sorted(reg.handles()) == ["dane", "down"]
+        assert list(reg.handles(healthy=True)) == ["dane"]
+        health = reg.list_clusters()["down"]["health"]
+        assert health["state"] == "degraded" and health["error"] == "connection refused"
+        assert reg.list_clusters()["dane"]["health"]["latency_ms"] is not None
+
+    asyncio.run(run())
+
+
+def test_failures_back_off_with_jitter():
+    async def run():
+        reg = registry(max_backoff=4.0)
+        await reg.register_async("down", "standin", {"mode": "fail"})
+        for failures, delay in [(2, 2.0), (3, 4.0), (4, 4.0), (5, 4.0)]:
+            await reg.probe("down")
+            health = reg._health["down"]
+            wait = health.next_probe - time.monotonic()
+            assert health.failures == failures
+            assert 0.8 * delay - 0.1 < wait <= 1.2 * delay
+
+        # Recovering resets the failures, and goes back to the regular interval
+        reg.get_handle("down").config["mode"] = "ok"
+        assert await reg.probe("down")
+        health = reg._health["down"]
+        assert (health.state, health.failures, health.error) == ("healthy", 0, None)
+        assert health.next_probe - time.monotonic() > 29
+
+    asyncio.run(run())
+
+
+def test_a_hung_cluster_holds_one_thread():
+    async def run():
+        reg = registry()
+        assert not await reg.register_async("stuck", "standin", {"mode": "hang"})
+        assert not await reg.probe("stuck")
+        assert not await reg.probe("stuck")
+
+        # Every probe waited on the same connect
+        handle = reg.get_handle("stuck")
+        assert handle.connects == 1
+        assert reg._health["stuck"].error == "No answer in 0.1s"
+
+        # When it answers, the next probe asks again and finds it healthy
+        handle.config["mode"] = "ok"
+        handle.released.set()
+        await asyncio.sleep(0.05)
+        assert await reg.probe("stuck")
+        assert handle.connects == 2 and reg.is_healthy("stuck")
+
+    asyncio.run(run())
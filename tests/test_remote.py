@@ -0,0 +1,300 @@
+import asyncio
+import itertools
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from flux_mcp_server.clusters.agent import Agent, server_context
+from flux_mcp_server.clusters.interface import AuthContext, ClusterHandle
+from flux_mcp_server.clusters.remote import RemoteFluxHandle
+
+# A remote handle against a stand-in agent: the real agent code, serving a fake
+# cluster, so this runs without Flux (python -m pytest tests/test_remote.py).
+
+AUTH = AuthContext(user_id="1000")
+
+# Pretend each Flux RPC takes this long (the agent's side of a round trip)
+DELAY = 0.05
+
+
+def jobspec(command):
+    return {
+        "version": 1,
+        "resources": [{"type": "slot", "count": 1, "label": "task", "with": []}],
+        "tasks": [{"command": command, "slot": "task", "count": {"per_slot": 1}}],
+        "attributes": {"system": {}},
+    }
+
+
+class StandInHandle(ClusterHandle):
+    """
+    A cluster that keeps jobs in a dict, and answers after DELAY.
+    """
+
+    def __init__(self, cluster_id="stand-in", config=None):
+        super().__init__(cluster_id, config or {})
+        self.ids = itertools.count(1)
+        self.jobs = {}
+        self.concurrent = self.max_concurrent = 0
+        self.delay = DELAY
+
+    async def call(self, method, *args, **kwargs):
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            await asyncio.sleep(self.delay)
+            return getattr(self, method)(*args, **kwargs)
+        finally:
+            self.concurrent -= 1
+
+    def connect(self):
+        return True
+
+    def submit(self, jobspec, auth):
+        job_id = next(self.ids)
+        self.jobs[job_id] = {"id": job_id, "state": "SCHED", "user": int(auth.user_id)}
+        return job_id
+
+    def cancel(self, job_id, auth):
+        if job_id not in self.jobs:
+            return False
+        self.jobs[job_id]["state"] = "INACTIVE"
+        return True
+
+    def cancel_many(self, job_ids, auth, reason=None):
+        return [
+            (
+                {"id": job_id, "canceled": True}
+                if self.cancel(job_id, auth)
+                else {"id": job_id, "error": "unknown job"}
+            )
+            for job_id in job_ids
+        ]
+
+    def get_job_info(self, job_id, auth):
+        if job_id not in self.jobs:
+            raise ValueError(f"unknown job {job_id}")
+        return self.jobs[job_id]
+
+    def list_jobs(self, auth, attrs=None, states=None, user=None, max_entries=1000, **filters):
+        jobs = sorted(self.jobs.values(), key=lambda job: -job["id"])
+        if user is not None:
+            jobs = [job for job in jobs if job["user"] == user]
+        jobs = jobs[:max_entries]
+        return [{k: v for k, v in job.items() if not attrs or k in attrs} for job in jobs]
+
+    def resource_status(self):
+        busy = sum(1 for job in self.jobs.values() if job["state"] != "INACTIVE")
+        return [{"partition": "all", "nodes": 1, "cores": 64, "free_cores": 64 - busy}]
+
+    def close(self):
+        pass
+
+
+async def start_agent(token=None, ssl_context=None):
+    agent = Agent(StandInHandle(), port=0, token=token, ssl_context=ssl_context)
+    await agent.start()
+    return agent
+
+
+def test_concurrent_calls_share_one_connection():
+    async def run():
+        agent = await start_agent()
+        handle = RemoteFluxHandle("remote", {"port": agent.port})
+        try:
+            count = 200
+            start = time.perf_counter()
+            ids = await asyncio.gather(
+                *(handle.call("submit", jobspec(["sleep", str(i)]), AUTH) for i in range(count))
+            )
+            elapsed = time.perf_counter() - start
+            assert sorted(ids) == list(range(1, count + 1))
+
+            # One connection, the requests in flight together, and written in a few batches
+            assert handle.connections == 1 and agent.connections == 1
+            assert agent.handle.max_concurrent == count
+            assert handle._batcher.writes < count // 4
+            assert elapsed < count * DELAY / 10
+
+            infos = await asyncio.gather(*(handle.call("get_job_info", i, AUTH) for i in ids))
+            assert [info["id"] for info in infos] == ids
+            assert all(info["user"] == 1000 for info in infos)
+            assert handle.connections == 1
+        finally:
+            handle.close()
+            await agent.stop()
+
+    asyncio.run(run())
+
+
+def test_batch_results_and_errors():
+    async def run():
+        agent = await start_agent()
+        handle = RemoteFluxHandle("remote", {"uri": f"tcp://127.0.0.1:{agent.port}"})
+        try:
+            # A jobspec that doesn't parse fails here, without a request
+            results = await handle.call("submit_many", [jobspec(["true"]), {"version": 1}], AUTH)
+            assert "id" in results[0] and "error" in results[1]
+            assert agent.requests == 1
+
+            results = await handle.call("cancel_many", [results[0]["id"], 42], AUTH)
+            assert results[0]["canceled"] and "error" in results[1]
+
+            # Errors from the agent come back for just that request
+            try:
+                await handle.call("get_job_info", 42, AUTH)
+                assert False, "expected an error"
+            except RuntimeError as e:
+                assert "unknown job 42" in str(e)
+
+            # Listings come back with just the attributes asked for
+            listed = await handle.call("list_jobs", AUTH, attrs=["id"], max_entries=1)
+            assert listed == [{"id": results[0]["id"]}]
+
+            status = await handle.call("resource_status")
+            assert status[0]["partition"] == "all" and status[0]["free_cores"] == 64
+
+            # The blocking methods work from other threads
+            assert await asyncio.to_thread(handle.connect)
+            assert await asyncio.to_thread(handle.cancel, 42, AUTH) is False
+        finally:
+            handle.close()
+            await agent.stop()
+
+    asyncio.run(run())
+
+
+def test_token():
+    async def run():
+        agent = await start_agent(token="secret")
+        wrong = RemoteFluxHandle("wrong", {"port": agent.port, "token": "guess"})
+        right = RemoteFluxHandle("right", {"port": agent.port, "token": "secret"})
+        try:
+            try:
+                await wrong.call("connect")
+                assert False, "expected the agent to refuse"
+            except ConnectionError:
+                pass
+            assert await right.call("connect")
+
+            # Tokens are compared as bytes, so any text works (and a wrong one is just wrong)
+            agent.token = "sécret"
+            accented = RemoteFluxHandle("accented", {"port": agent.port, "token": "sécret"})
+            try:
+                assert await accented.call("connect")
+            finally:
+                accented.close()
+        finally:
+            wrong.close()
+            right.close()
+            await agent.stop()
+
+    asyncio.run(run())
+
+
+def test_agents_beyond_localhost_need_a_token():
+    with pytest.raises(ValueError, match="needs a token"):
+        Agent(StandInHandle(), host="0.0.0.0")
+    assert Agent(StandInHandle(), host="0.0.0.0", token="secret").token == "secret"
+    assert Agent(StandInHandle(), host="localhost").token is None
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl for a certificate")
+def test_tls(tmp_path):
+    cert, key = tmp_path / "agent.pem", tmp_path / "agent.key"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-keyout", str(key), "-out", str(cert), "-subj", "/CN=localhost"]
+        + ["-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"],
+        check=True,
+        capture_output=True,
+    )
+
+    async def run():
+        agent = await start_agent(token="secret", ssl_context=server_context(cert, key))
+        uri = f"tls://127.0.0.1:{agent.port}"
+        trusted = RemoteFluxHandle("trusted", {"uri": uri, "token": "secret", "cafile": cert})
+        untrusted = RemoteFluxHandle("untrusted", {"uri": uri, "token": "secret"})
+        plain = RemoteFluxHandle("plain", {"port": agent.port, "token": "secret", "timeout": 1})
+        try:
+            assert await trusted.call("connect")
+            assert await trusted.call("submit", jobspec(["true"]), AUTH) == 1
+
+            # A certificate we don't trust, or no TLS at all, doesn't get a connection
+            for handle in [untrusted, plain]:
+                with pytest.raises((ConnectionError, OSError, asyncio.TimeoutError)):
+                    await handle.call("connect")
+        finally:
+            for handle in [trusted, untrusted, plain]:
+                handle.close()
+            await agent.stop()
+
+    asyncio.run(run())
+
+
+def test_timeouts():
+    async def run():
+        agent = await start_agent()
+        handle = RemoteFluxHandle("remote", {"port": agent.port, "timeout": 0.2})
+        try:
+            assert await handle.call("connect")
+            agent.handle.delay = 0.5
+
+            # A slow read times out, but a slow submit is still waited for (it may go through)
+            try:
+                await handle.call("get_job_info", 1, AUTH)
+                assert False, "expected a timeout"
+            except TimeoutError:
+                pass
+            results = await handle.call("submit_many", [jobspec(["true"])] * 3, AUTH)
+            assert [result["id"] for result in results] == [1, 2, 3]
+        finally:
+            handle.close()
+            await agent.stop()
+
+    asyncio.run(run())
+
+
+def test_lost_connection():
+    async def run():
+        agent = await start_agent()
+        handle = RemoteFluxHandle("remote", {"port": agent.port, "timeout": 5})
+        try:
+            assert await handle.call("connect")
+            await agent.stop()
+            try:
+                await handle.call("submit", jobspec(["true"]), AUTH)
+                assert False, "expected the call to fail"
+            except (ConnectionError, OSError):
+                pass
+        finally:
+            handle.close()
+
+    asyncio.run(run())
+
+
+def test_request_without_a_connection():
+    async def run():
+        handle = RemoteFluxHandle("remote", {"port": 1})
+        try:
+            # e.g., the connection dropped between connecting and sending
+            future = asyncio.run_coroutine_threadsafe(handle._request("connect", {}), handle._loop)
+            with pytest.raises(ConnectionError, match="Not connected"):
+                await asyncio.wrap_future(future)
+        finally:
+            handle.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_connection()
+    test_batch_results_and_errors()
+    test_token()
+    test_timeouts()
+    test_lost_connection()
+    test_agents_beyond_localhost_need_a_token()
+    test_request_without_a_connection()
+    print("✅ Remote handle tests passed")
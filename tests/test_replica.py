@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sqlite3
+
+from flux_mcp_server.db.replica import SqliteReplica
+from flux_mcp_server.db.views import SQLAlchemyBackend
+
+# The read-only sqlite replica (python -m pytest tests/test_replica.py, no Flux needed)
+
+
+def primary(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE numbers (n INTEGER)")
+    conn.execute("INSERT INTO numbers VALUES (1)")
+    conn.commit()
+    return conn
+
+
+def replica_rows(replica):
+    conn = sqlite3.connect(f"file:{replica.replica_path}?mode=ro&immutable=1", uri=True)
+    try:
+        return [row[0] for row in conn.execute("SELECT n FROM numbers ORDER BY n")]
+    finally:
+        conn.close()
+
+
+def test_refreshes_only_when_the_primary_changes(tmp_path):
+    path = str(tmp_path / "primary.db")
+    writer = primary(path)
+    replica = SqliteReplica(path)
+    try:
+        assert replica.refresh()
+        copied = os.stat(replica.replica_path).st_ino
+
+        # Nobody wrote, so the copy is left alone
+        assert not replica.refresh()
+        assert os.stat(replica.replica_path).st_ino == copied
+
+        writer.execute("INSERT INTO numbers VALUES (2)")
+        writer.commit()
+        assert replica.refresh()
+        assert replica_rows(replica) == [1, 2]
+        assert not replica.refresh()
+    finally:
+        writer.close()
+        asyncio.run(replica.stop())
+
+
+def test_readable_while_the_writer_holds_a_transaction(tmp_path):
+    path = str(tmp_path / "primary.db")
+    writer = primary(path)
+    replica = SqliteReplica(path)
+    try:
+        replica.refresh()
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO numbers VALUES (2)")
+
+        # Refreshing and reading both work, and only see what was committed
+        replica.refresh()
+        assert replica_rows(replica) == [1]
+        writer.commit()
+        assert replica.refresh()
+        assert replica_rows(replica) == [1, 2]
+    finally:
+        writer.close()
+        asyncio.run(replica.stop())
+
+
+def test_backend_reads_from_the_replica(tmp_path):
+    async def run():
+        path = tmp_path / "server.db"
+        db = SQLAlchemyBackend(f"sqlite+aiosqlite:///{path}", read_replica=60)
+        await db.initialize()
+        try:
+            submit = {"id": 1, "type": "submit", "timestamp": 100.0, "context": {"userid": 1}}
+            await db.record_events("local", [submit])
+
+            # The replica is a refresh behind, until we refresh it
+            assert await db.get_job("local", 1) is None
+            await asyncio.to_thread(db.replica.refresh)
+
+            # And a writer holding the primary's write lock doesn't block reads
+            writer = sqlite3.connect(path)
+            writer.execute("BEGIN IMMEDIATE")
+            try:
+                assert (await db.get_job("local", 1)).state == "NEW"
+            finally:
+                writer.rollback()
+                writer.close()
+        finally:
+            await db.close()
+
+    asyncio.run(run())
@@ -0,0 +1,155 @@
+import asyncio
+from dataclasses import astuple
+
+from flux_mcp_server.clusters.snapshots import ResourcePoller, resource_partitions
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.db.models import ResourceRecord
+
+# Resource status summaries per partition (python -m pytest tests/test_resources.py,
+# no Flux needed)
+
+# Four nodes with 8 cores: two with a gpu (and the "gpu" property), and the first two in "debug"
+R = {
+    "version": 1,
+    "execution": {
+        "R_lite": [
+            {"rank": "0-1", "children": {"core": "0-7"}},
+            {"rank": "2-3", "children": {"core": "0-7", "gpu": "0"}},
+        ],
+        "properties": {"debug": "0-1", "gpu": "2-3"},
+    },
+}
+
+
+def ranks(idset):
+    """
+    The ranks in an idset, e.g. "0-1,3" is [0, 1, 3].
+    """
+    found = []
+    for part in idset.split(","):
+        start, _, end = part.partition("-")
+        found += range(int(start), int(end or start) + 1)
+    return found
+
+
+class ResourceSet:
+    """
+    Stands in for flux.resource.ResourceSet: nodes by rank, with cores, gpus, and properties.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    @classmethod
+    def from_R(cls, R, only=None):
+        execution = R["execution"]
+        nodes = {}
+        for entry in execution["R_lite"]:
+            children = entry["children"]
+            for rank in ranks(entry["rank"]):
+                nodes[rank] = {
+                    "cores": len(ranks(children["core"])),
+                    "gpus": len(ranks(children["gpu"])) if "gpu" in children else 0,
+                    "properties": set(),
+                }
+        for name, idset in execution.get("properties", {}).items():
+            for rank in ranks(idset):
+                nodes[rank]["properties"].add(name)
+        if only is not None:
+            nodes = {rank: node for rank, node in nodes.items() if rank in only}
+        return cls(nodes)
+
+    @property
+    def nnodes(self):
+        return len(self.nodes)
+
+    @property
+    def ncores(self):
+        return sum(node["cores"] for node in self.nodes.values())
+
+    @property
+    def ngpus(self):
+        return sum(node["gpus"] for node in self.nodes.values())
+
+    @property
+    def properties(self):
+        # Like Flux, a comma separated string
+        return ",".join(sorted(set().union(*(n["properties"] for n in self.nodes.values()))))
+
+    def copy_constraint(self, constraint):
+        wanted = set(constraint["properties"])
+        return ResourceSet(
+            {rank: node for rank, node in self.nodes.items() if wanted <= node["properties"]}
+        )
+
+
+class ResourceList:
+    """
+    Stands in for the resource.status answer: rank 3 is down, and ranks 0 and 2 run jobs.
+    """
+
+    def __init__(self, R):
+        self.all = ResourceSet.from_R(R)
+        self.down = ResourceSet.from_R(R, only=[3])
+        self.allocated = ResourceSet.from_R(R, only=[0, 2])
+        self.free = ResourceSet.from_R(R, only=[1])
+
+
+def test_partitions_from_R():
+    summaries = {summary["partition"]: summary for summary in resource_partitions(ResourceList(R))}
+    assert list(summaries) == ["all", "debug", "gpu"]
+    assert summaries["all"] == {
+        "partition": "all",
+        "nodes": 4,
+        "cores": 32,
+        "gpus": 2,
+        "free_nodes": 1,
+        "free_cores": 8,
+        "free_gpus": 0,
+        "allocated_nodes": 2,
+        "allocated_cores": 16,
+        "allocated_gpus": 1,
+        "down_nodes": 1,
+    }
+    debug, gpu = summaries["debug"], summaries["gpu"]
+    assert (debug["nodes"], debug["free_nodes"], debug["allocated_cores"]) == (2, 1, 8)
+    assert (gpu["gpus"], gpu["free_gpus"], gpu["allocated_gpus"], gpu["down_nodes"]) == (2, 0, 1, 1)
+
+    # Every summary becomes a resource record as it is
+    assert ResourceRecord(cluster="a", timestamp=1.0, **summaries["gpu"]).free_cores == 0
+
+
+def test_excluded_and_missing_properties():
+    R_plain = {"version": 1, "execution": {"R_lite": R["execution"]["R_lite"]}}
+    assert [s["partition"] for s in resource_partitions(ResourceList(R_plain))] == ["all"]
+
+    # A negated property is a constraint, not a partition
+    rlist = ResourceList(R)
+    rlist.all.nodes[0]["properties"].add("^login")
+    assert [s["partition"] for s in resource_partitions(rlist)] == ["all", "debug", "gpu"]
+
+
+class StandInHandle:
+    def __init__(self, R):
+        self.R = R
+
+    async def call(self, method):
+        assert method == "resource_status"
+        return resource_partitions(ResourceList(self.R))
+
+
+class StandInRegistry:
+    def handles(self, healthy=False):
+        return {"dane": StandInHandle(R)}
+
+
+def test_polls_are_kept_and_recorded():
+    async def run():
+        db = MemoryBackend()
+        poller = ResourcePoller(db, StandInRegistry(), interval=60)
+        await poller.poll()
+        assert [record.partition for record in poller.latest["dane"]] == ["all", "debug", "gpu"]
+        history = await db.get_resource_history("dane", "all")
+        assert [astuple(record) for record in history] == [astuple(poller.latest["dane"][0])]
+
+    asyncio.run(run())
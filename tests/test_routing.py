@@ -0,0 +1,186 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from flux_mcp_server.clusters import snapshots
+from flux_mcp_server.clusters.interface import ClusterHandle
+from flux_mcp_server.clusters.routing import (
+    ClusterLoad,
+    ClusterRouter,
+    StickyPolicy,
+    WeightedPolicy,
+)
+from flux_mcp_server.clusters.snapshots import ResourcePoller
+from flux_mcp_server.db.memory import MemoryBackend
+
+# Routing policies over stand-in clusters, with queues in a memory database
+# (python -m pytest tests/test_routing.py, no Flux needed).
+
+
+class StandInHandle(ClusterHandle):
+    """
+    A cluster that only reports its resources (free_cores from its config).
+    """
+
+    def connect(self):
+        return True
+
+    def submit(self, jobspec, auth):
+        raise NotImplementedError
+
+    def cancel(self, job_id, auth):
+        return False
+
+    def get_job_info(self, job_id, auth):
+        return {}
+
+    def list_jobs(self, auth, **filters):
+        return []
+
+    def resource_status(self):
+        return [{"partition": "all", "nodes": 1, "cores": 64, "free_cores": self.config["free"]}]
+
+    def close(self):
+        pass
+
+
+class StandInRegistry:
+    def __init__(self, clusters, degraded=()):
+        self.clusters = {name: StandInHandle(name, config) for name, config in clusters.items()}
+        self.degraded = set(degraded)
+
+    def handles(self, healthy=False):
+        return {
+            name: handle
+            for name, handle in self.clusters.items()
+            if not healthy or name not in self.degraded
+        }
+
+
+async def queue(db, cluster, queued, running=0):
+    """
+    Submit jobs to a cluster's history, and start the first few of them.
+    """
+    for job_id in range(1, queued + running + 1):
+        events = [{"id": job_id, "type": "submit", "timestamp": job_id, "context": {"userid": 1}}]
+        if job_id <= running:
+            events += [
+                {"id": job_id, "type": "alloc", "timestamp": job_id + 0.1},
+                {"id": job_id, "type": "start", "timestamp": job_id + 0.2},
+            ]
+        await db.record_events(cluster, events)
+
+
+async def router_for(clusters, queues, monkeypatch, degraded=(), poll=True):
+    db = MemoryBackend()
+    for cluster, (queued, running) in queues.items():
+        await queue(db, cluster, queued, running)
+    registry = StandInRegistry(clusters, degraded)
+    poller = ResourcePoller(db, registry, interval=60)
+    monkeypatch.setattr(snapshots, "POLLER", poller)
+    if poll:
+        await poller.poll()
+    return ClusterRouter(db, registry, ttl=0)
+
+
+def test_load_is_queued_per_free_core():
+    assert ClusterLoad("a", queued=3, free_cores=7).load == 0.5
+    assert ClusterLoad("a", queued=0, free_cores=63).load == 1 / 64
+
+    # An unpolled cluster is as loaded as one with no free cores, not idle
+    assert ClusterLoad("a", queued=3).load == ClusterLoad("a", queued=3, free_cores=0).load
+    assert ClusterLoad("a").load > ClusterLoad("b", queued=1, free_cores=63).load
+
+
+def test_loads_from_jobs_and_resources(monkeypatch):
+    async def run():
+        clusters = {"dane": {"free": 4, "weight": 2}, "corona": {"free": 32}, "down": {"free": 64}}
+        queues = {"dane": (3, 2), "corona": (1, 5), "down": (0, 0)}
+        router = await router_for(clusters, queues, monkeypatch, degraded=["down"])
+        loads = {load.cluster: load for load in await router.loads()}
+
+        # Degraded clusters aren't candidates
+        assert sorted(loads) == ["corona", "dane"]
+        assert (loads["dane"].queued, loads["dane"].running) == (3, 2)
+        assert (loads["dane"].free_cores, loads["dane"].cores) == (4, 64)
+        assert loads["dane"].weight == 2.0 and loads["corona"].weight == 1.0
+
+        decision = await router.route(policy="least-loaded")
+        assert decision.cluster == "corona" and len(decision.candidates) == 2
+
+    asyncio.run(run())
+
+
+def test_ties_go_to_the_fastest_cluster(monkeypatch):
+    async def run():
+        clusters = {"a": {"free": 8}, "b": {"free": 8}}
+        router = await router_for(clusters, {}, monkeypatch)
+        router.observe("a", 2.0)
+        router.observe("b", 1.0)
+        assert (await router.route(policy="least-loaded")).cluster == "b"
+
+        # Latency is a moving average, so one slow submission doesn't flip it
+        router.observe("b", 4.0)
+        assert router.latency["b"] == pytest.approx(1.6)
+        assert (await router.route(policy="least-loaded")).cluster == "b"
+
+    asyncio.run(run())
+
+
+def test_unpolled_clusters_lose_to_polled_ones(monkeypatch):
+    async def run():
+        router = await router_for({"a": {"free": 64}}, {"a": (2, 0)}, monkeypatch, poll=False)
+        assert (await router.loads())[0].load == 3.0
+        await snapshots.POLLER.poll()
+        assert (await router.loads())[0].load == 3 / 65
+
+    asyncio.run(run())
+
+
+def test_weighted_spreads_by_weight_over_load():
+    loads = [ClusterLoad("a", free_cores=63), ClusterLoad("b", free_cores=63, weight=3.0)]
+    policy = WeightedPolicy(seed=1)
+    picks = Counter(policy.choose(loads)[0].cluster for _ in range(4000))
+    assert 0.7 < picks["b"] / 4000 < 0.8
+
+    # A busy cluster gets less of the weight
+    loads[1].queued = 640
+    picks = Counter(policy.choose(loads)[0].cluster for _ in range(4000))
+    assert picks["a"] > picks["b"]
+
+
+def test_sticky_keeps_users_where_they_were():
+    policy = StickyPolicy()
+    loads = [ClusterLoad("a", queued=5, free_cores=0), ClusterLoad("b", free_cores=8)]
+    assert policy.choose(loads, user="ada")[0].cluster == "b"
+
+    # b gets busy, but ada stays, and a new user goes to the less loaded cluster
+    loads[1].queued, loads[1].free_cores = 100, 0
+    assert policy.choose(loads, user="ada")[0].cluster == "b"
+    assert policy.choose(loads, user="grace")[0].cluster == "a"
+
+    # Unless their cluster isn't a candidate anymore
+    assert policy.choose(loads[:1], user="ada")[0].cluster == "a"
+    assert policy.assigned["ada"] == "a"
+
+
+def test_sticky_forgets_the_least_recent_users():
+    policy = StickyPolicy(max_users=2)
+    loads = [ClusterLoad("a", free_cores=8)]
+    for user in ["ada", "grace", "ada", "linus"]:
+        policy.choose(loads, user=user)
+
+    # ada was routed again after grace, so grace is the one we forget
+    assert list(policy.assigned) == ["ada", "linus"]
+
+
+def test_route_errors(monkeypatch):
+    async def run():
+        router = await router_for({"a": {"free": 1}}, {}, monkeypatch, degraded=["a"])
+        with pytest.raises(ValueError, match="Unknown routing policy"):
+            await router.route(policy="fastest")
+        with pytest.raises(ValueError, match="no healthy clusters"):
+            await router.route()
+
+    asyncio.run(run())
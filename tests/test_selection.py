@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.tools.selection import jobs_to_cancel
+
+# Which jobs a filtered cancel_jobs selects, from jobs ingested the way the
+# EventsEngine sends them (python -m pytest tests/test_selection.py, no Flux needed)
+
+
+async def ingested():
+    """
+    Jobs 1-3 from Flux user 1000 (3 has finished), and 4 from user 1001.
+    """
+    db = MemoryBackend()
+    for job_id, userid in [(1, 1000), (2, 1000), (3, 1000), (4, 1001)]:
+        submit = {"id": job_id, "type": "submit", "timestamp": 100.0 * job_id, "seq": 0}
+        submit["context"] = {"userid": userid, "urgency": 16, "flags": 0}
+        await db.record_events("local", [submit])
+    await db.record_events(
+        "local",
+        [
+            {"id": 2, "type": "validate", "timestamp": 201.0, "seq": 1},
+            {
+                "id": 3,
+                "type": "exception",
+                "timestamp": 301.0,
+                "seq": 1,
+                "context": {"severity": 0},
+            },
+            {"id": 3, "type": "clean", "timestamp": 302.0, "seq": 2},
+        ],
+    )
+    return db
+
+
+def test_filters_are_for_admins():
+    async def run():
+        db = await ingested()
+
+        # We can't tell which Flux user a client is, so no filter is scoped to one
+        for filters in [{"user": "1000"}, {"state": "NEW"}, {"since": 0.0}]:
+            with pytest.raises(PermissionError, match="admin"):
+                await jobs_to_cancel(db, "local", admin=False, **filters)
+        with pytest.raises(ValueError, match="at least one filter"):
+            await jobs_to_cancel(db, "local", admin=True)
+
+    asyncio.run(run())
+
+
+def test_admin_filters():
+    async def run():
+        db = await ingested()
+
+        async def select(**filters):
+            return sorted(await jobs_to_cancel(db, "local", admin=True, **filters))
+
+        # Owners are the Flux userid from the submit event, and finished jobs are left alone
+        assert await select(user="1000") == [1, 2]
+        assert await select(user="1001") == [4]
+        assert await select(user="ada") == []
+        assert await select(state="NEW") == [1, 4]
+        assert await select(user="1000", state="DEPEND") == [2]
+        assert await select(since=150.0, until=400.0) == [2, 4]
+        assert await jobs_to_cancel(db, "other", admin=True, user="1000") == []
+
+    asyncio.run(run())
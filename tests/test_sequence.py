@@ -0,0 +1,106 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from flux_mcp_server.db.memory import MemoryBackend
+from flux_mcp_server.events.sequence import EventSequencer
+from flux_mcp_server.tools import query
+
+# Numbering journal events by eventlog position, and following a job with
+# history deltas (python -m pytest tests/test_sequence.py, no Flux needed).
+
+EVENTLOG = ["submit", "validate", "depend", "priority", "alloc", "start", "finish", "clean"]
+
+
+def journal(job_id, names, **extra):
+    return [
+        SimpleNamespace(jobid=job_id, name=name, timestamp=100.0 + EVENTLOG.index(name), **extra)
+        for name in names
+    ]
+
+
+class Lookup:
+    """
+    Stands in for job-info.lookup, answering with the whole eventlog (or failing).
+    """
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def __call__(self, job_id, timeout):
+        self.calls.append((job_id, timeout))
+        if self.error:
+            raise self.error
+        return "\n".join(
+            json.dumps({"timestamp": 100.0 + i, "name": name, "context": {}})
+            for i, name in enumerate(EVENTLOG)
+        )
+
+
+def test_jobs_followed_from_submit_are_counted():
+    lookup = Lookup()
+    sequencer = EventSequencer(lookup, timeout=0.5)
+    assert [sequencer.next(event) for event in journal(1, EVENTLOG)] == list(range(8))
+    assert lookup.calls == [] and sequencer._seqs == {}
+
+
+def test_journal_seq_wins():
+    sequencer = EventSequencer(Lookup(), timeout=0.5)
+    events = journal(1, ["start", "finish"], eventlog_seq=12)
+    assert [sequencer.next(event) for event in events] == [12, 12]
+
+
+def test_jobs_joined_mid_stream_are_numbered_from_their_eventlog():
+    lookup = Lookup()
+    sequencer = EventSequencer(lookup, timeout=0.5)
+    seqs = [sequencer.next(event) for event in journal(7, ["start", "finish", "clean"])]
+    assert seqs == [5, 6, 7]
+
+    # One bounded lookup, then we count on from there
+    assert lookup.calls == [(7, 0.5)]
+
+
+def test_a_failed_lookup_numbers_from_zero():
+    lookup = Lookup(error=TimeoutError("job-info.lookup timed out"))
+    sequencer = EventSequencer(lookup, timeout=0.01)
+    assert [sequencer.next(event) for event in journal(7, ["start", "finish"])] == [0, 1]
+    assert len(lookup.calls) == 1
+
+
+def test_history_deltas():
+    async def run():
+        db = MemoryBackend()
+        query.init_query_tools(db)
+        try:
+            events = [
+                {"id": 1, "type": name, "timestamp": 100.0 + seq, "seq": seq, "context": {}}
+                for seq, name in enumerate(EVENTLOG[:4])
+            ]
+            await db.record_events("local", events)
+            first = json.loads(await query.query_job_history(1))
+            assert [e["event_type"] for e in first["history"]] == EVENTLOG[:4]
+            assert first["last_seq"] == 3
+
+            # Nothing new, so the cursor stays put
+            again = json.loads(await query.query_job_history(1, since_seq=first["last_seq"]))
+            assert again["history"] == [] and again["last_seq"] == 3
+
+            # A job joined mid-stream picks up at the numbers from its eventlog
+            sequencer = EventSequencer(Lookup(), timeout=0.5)
+            for event in journal(1, ["alloc", "start"]):
+                seq = sequencer.next(event)
+                await db.record_events(
+                    "local",
+                    [{"id": 1, "type": event.name, "timestamp": event.timestamp, "seq": seq}],
+                )
+            delta = json.loads(await query.query_job_history(1, since_seq=again["last_seq"]))
+            assert [(e["event_type"], e["seq"]) for e in delta["history"]] == [
+                ("alloc", 4),
+                ("start", 5),
+            ]
+            assert delta["last_seq"] == 5 and delta["state"] == "RUN"
+        finally:
+            query.init_query_tools(None)
+
+    asyncio.run(run())
@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from flux_mcp_server.db.views import SQLAlchemyBackend
+
+# Databases written by an older server are upgraded in place on initialize
+# (python -m pytest tests/test_upgrade.py, no Flux needed).
+
+# The tables as the first release of the server made them
+OLD_SCHEMA = """
+CREATE TABLE jobs (
+    job_id INTEGER NOT NULL, cluster VARCHAR(255) NOT NULL, state VARCHAR(50) NOT NULL,
+    user VARCHAR(255), workdir VARCHAR, exit_code INTEGER, submit_time FLOAT NOT NULL,
+    last_updated FLOAT NOT NULL, PRIMARY KEY (job_id, cluster)
+);
+CREATE TABLE events (
+    id INTEGER NOT NULL, job_id INTEGER NOT NULL, cluster VARCHAR(255) NOT NULL,
+    timestamp FLOAT NOT NULL, event_type VARCHAR(50) NOT NULL, payload JSON NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_events_job_id ON events (job_id);
+CREATE INDEX ix_events_cluster ON events (cluster);
+"""
+
+
+def old_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    conn.execute("INSERT INTO jobs VALUES (1, 'local', 'RUN', '1000', NULL, NULL, 100.0, 110.0)")
+    conn.execute(
+        "INSERT INTO jobs VALUES (2, 'local', 'submitted', '1000', NULL, NULL, 120.0, 120.0)"
+    )
+    rows = [(1, "local", 100.0, "submit", '{"userid": 1000}'), (1, "local", 110.0, "start", "{}")]
+    # The old server stored replays twice
+    conn.executemany(
+        "INSERT INTO events (job_id, cluster, timestamp, event_type, payload) VALUES (?, ?, ?, ?, ?)",
+        rows + rows[1:],
+    )
+    conn.commit()
+    conn.close()
+
+
+def columns(path, table):
+    with sqlite3.connect(path) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+@pytest.mark.parametrize("sqlite_writer", [False, True])
+def test_old_databases_are_upgraded(sqlite_writer, tmp_path):
+    async def run():
+        path = tmp_path / "old.db"
+        old_database(path)
+        for _ in range(2):
+            # Twice, since the upgrade runs on every start and must find nothing to do
+            db = SQLAlchemyBackend(f"sqlite+aiosqlite:///{path}", sqlite_writer=sqlite_writer)
+            await db.initialize()
+            try:
+                history = await db.get_event_history("local", 1)
+                assert [(e.event_type, e.seq) for e in history] == [("submit", 0), ("start", 0)]
+                job = await db.get_job("local", 1)
+                assert job.state == "RUN" and job.run_seconds is None
+
+                # Old servers said "submitted" for Flux's NEW
+                found = await db.search_jobs(state="NEW")
+                assert [job.job_id for job in found] == [2]
+                assert await db.search_jobs(state="submitted") == []
+            finally:
+                await db.close()
+
+        assert {"seq", "alloc_time", "run_seconds", "ncores"} <= columns(path, "events") | columns(
+            path, "jobs"
+        )
+        with sqlite3.connect(path) as conn:
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(events)")}
+            assert conn.execute("SELECT count(*) FROM jobs WHERE accounted = 0").fetchone() == (2,)
+        assert {"ix_events_natural_key", "ix_events_job_seq"} <= indexes
+
+        # New events go in on top, and replays of the old ones are ignored
+        db = SQLAlchemyBackend(f"sqlite+aiosqlite:///{path}", sqlite_writer=sqlite_writer)
+        await db.initialize()
+        try:
+            await db.record_events(
+                "local",
+                [
+                    {"id": 1, "type": "start", "timestamp": 110.0, "context": {}},
+                    {"id": 1, "type": "finish", "timestamp": 140.0, "context": {"status": 0}},
+                ],
+            )
+            history = await db.get_event_history("local", 1)
+            assert [e.event_type for e in history] == ["submit", "start", "finish"]
+            assert (await db.get_job("local", 1)).state == "CLEANUP"
+        finally:
+            await db.close()
+
+    asyncio.run(run())